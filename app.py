@@ -1,22 +1,53 @@
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config.settings import Config
 from config.database import init_db
 from routes.quiz_routes import quiz_bp
 from routes.auth_routes import auth_bp
 from routes.analytics import analytics_bp  # Updated import name
+from routes.metrics_routes import metrics_bp
+from routes.asset_routes import assets_bp
+from services.pool_service import start_pool_worker
+from services.analytics_buffer import init_analytics_buffer
+from services.metrics_service import init_metrics
+from services.http_cache import init_compression
+from services.asset_service import init_assets
 
 app = Flask(__name__)
 
 # Configure app
 app.config.from_object(Config)
 
+# Take the client address from X-Forwarded-For when behind a known number of proxies
+if Config.PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.PROXY_COUNT, x_proto=Config.PROXY_COUNT)
+
 # Initialize database
 init_db(app)
 
+# Time requests and count their SQL statements
+init_metrics(app)
+
+# Compress large text responses; registered after metrics so request timing includes it
+init_compression(app)
+
 # Register blueprints
 app.register_blueprint(quiz_bp)
 app.register_blueprint(auth_bp, url_prefix='/auth')
 app.register_blueprint(analytics_bp, url_prefix='/analytics')  # Updated blueprint name
+app.register_blueprint(metrics_bp)
+app.register_blueprint(assets_bp, url_prefix='/assets')
+
+# Resolve bundled, fingerprinted asset URLs in templates
+init_assets(app)
+
+# Buffer answer analytics and write them in batches when enabled
+init_analytics_buffer(app)
+
+# Keep the question pool stocked in long-running deployments; serverless
+# deployments should run refill_pool.py from a scheduled job instead
+if Config.QUESTION_POOL_BACKGROUND:
+    start_pool_worker(app)
 
 # Error handlers
 @app.errorhandler(404)
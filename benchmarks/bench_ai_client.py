@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark AIService's retry, hedging and rate-limit policy against the local
+fake Gemini server, with concurrent synchronous callers like Flask workers.
+
+Usage: python benchmarks/bench_ai_client.py [--calls 40] [--threads 8]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fake_gemini_server import start_fake_server
+
+SCENARIOS = [
+    # name, server faults, client policy
+    ('healthy', {}, {}),
+    ('20% 503, no retries', {'error_rate': 0.2}, {'max_attempts': 1}),
+    ('20% 503, 3 attempts', {'error_rate': 0.2}, {'max_attempts': 3}),
+    ('10% slow tail', {'slow_rate': 0.1}, {}),
+    ('10% slow tail, hedged', {'slow_rate': 0.1}, {'hedge_delay': 0.4}),
+    ('rate limited 300/min', {}, {'rate_per_minute': 300}),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="AI client policy benchmark")
+    parser.add_argument('--calls', type=int, default=40, help="Calls per scenario")
+    parser.add_argument('--threads', type=int, default=8, help="Concurrent callers")
+    args = parser.parse_args()
+
+    server = start_fake_server()
+    os.environ['GEMINI_BASE_URL'] = server.base_url
+    os.environ['AI_CACHE_BACKEND'] = 'none'
+    os.environ.setdefault('FLASK_PORT', '5000')
+    os.environ.setdefault('POSTGRES_URL_NON_POOLING', 'postgresql://localhost/unused')
+
+    from bench_utils import summarize
+    from services.ai_client import TokenBucket, AIServiceError
+    from services.ai_service import AIService
+
+    header = f"{'scenario':<24} {'ok':>4} {'failed':>6} {'p50 ms':>8} {'p99 ms':>8} {'requests':>8} {'retries':>7} {'hedges':>6} {'wall s':>7}"
+    print(header)
+    print('-' * len(header))
+
+    # One service for the whole run, as in the app; only the policy changes
+    service = AIService()
+    client = service.ai_client
+
+    for name, faults, policy in SCENARIOS:
+        server.faults.update({'error_rate': 0.0, 'slow_rate': 0.0, **faults})
+        server.requests = 0
+
+        client.stats = dict.fromkeys(client.stats, 0)
+        client.max_attempts = policy.get('max_attempts', 3)
+        client.hedge_delay = policy.get('hedge_delay', 0)
+        client.limiter = TokenBucket(policy['rate_per_minute'], burst=1) if policy.get('rate_per_minute') else None
+        client.max_concurrency = args.threads * 2  # Headroom for hedged duplicates
+        client.backoff_base = 0.1
+
+        samples = []
+        failed = 0
+
+        def one_call(i):
+            start = time.perf_counter()
+            try:
+                service.generate_content(f"{name} prompt {i}")
+                return time.perf_counter() - start
+            except AIServiceError:
+                return None
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            for result in executor.map(one_call, range(args.calls)):
+                if result is None:
+                    failed += 1
+                else:
+                    samples.append(result)
+        wall = time.perf_counter() - start
+
+        stats = summarize(samples) if samples else {'p50_ms': 0, 'p99_ms': 0}
+        print(f"{name:<24} {len(samples):>4} {failed:>6} {stats['p50_ms']:>8.0f} {stats['p99_ms']:>8.0f} "
+              f"{server.requests:>8} {client.stats['retries']:>7} {client.stats['hedges']:>6} {wall:>7.2f}")
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
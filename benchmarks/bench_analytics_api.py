@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark the analytics dashboard queries as the number of analytics rows
+grows: the old load-everything listing against keyset pages (first page and
+a page deep into the ordering) and the SQL totals query.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_analytics_api.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+from bench_utils import create_bench_app, seed_analytics, seed_questions, summarize, time_call
+from models.analytics import QuestionAnalytics
+
+def load_everything():
+    """The previous implementation: every row, derived metrics in Python, two passes"""
+    analytics = QuestionAnalytics.query.all()
+    total = sum(a.correct_count + a.wrong_count for a in analytics)
+    return [{
+        'question': item.question_text,
+        'accuracy': round(item.correct_count / (item.correct_count + item.wrong_count) * 100, 1)
+        if (item.correct_count + item.wrong_count) > 0 else 0,
+        'avg_time_taken': round(item.avg_time_taken, 2),
+        'engagement_rate': round((item.correct_count + item.wrong_count) / total * 100, 1) if total else 0,
+    } for item in analytics]
+
+def deep_page_cursor(sort, pages):
+    cursor = None
+    for _ in range(pages):
+        cursor = QuestionAnalytics.get_analytics_page(sort=sort, cursor=cursor)['next_cursor']
+    return cursor
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics dashboard query benchmark")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Comma-separated analytics row counts")
+    parser.add_argument('--iterations', type=int, default=20, help="Calls timed per size and method")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    app = create_bench_app()
+
+    print(f"{'rows':>8} {'method':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    with app.app_context():
+        seeded = 0
+        for size in sizes:
+            seed_questions(size, start=seeded)
+            seeded = size
+            seed_analytics(size)
+            cursor = deep_page_cursor('difficulty', 20)
+
+            for name, call in (
+                ('load_everything', load_everything),
+                ('first_page', lambda: QuestionAnalytics.get_analytics_page(sort='difficulty')),
+                ('page_21', lambda: QuestionAnalytics.get_analytics_page(sort='difficulty', cursor=cursor)),
+                ('filtered_page', lambda: QuestionAnalytics.get_analytics_page(
+                    sort='engagement', filters={'max_accuracy': 20, 'min_engagement': 30})),
+                ('totals', QuestionAnalytics.get_totals),
+            ):
+                call()  # Warm up caches and plans
+                stats = summarize(time_call(call, args.iterations))
+                print(f"{size:>8} {name:<22} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+if __name__ == '__main__':
+    main()
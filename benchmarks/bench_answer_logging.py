@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent answer logging and check that no updates are lost.
+
+Compares the direct per-answer upsert (QuestionAnalytics.log_answer) with the
+write-behind AnswerAggregator at increasing thread counts. The 'drift'
+column counts summary counters that disagreed with a full recomputation.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_answer_logging.py [--threads 1,4,16]
+"""
+
+import argparse
+import threading
+import time
+from sqlalchemy import func
+from bench_utils import create_bench_app, seed_questions
+from config.database import db
+from models.analytics import QuestionAnalytics, AnalyticsSummary
+from services.analytics_buffer import AnswerAggregator
+
+def run_direct(app, threads, answers_per_thread, num_questions):
+    def worker(offset):
+        with app.app_context():
+            for i in range(answers_per_thread):
+                question_id = (offset + i) % num_questions + 1
+                QuestionAnalytics.log_answer(question_id, f"Benchmark question {question_id}", i % 2 == 0, 3.0, 10)
+            db.session.remove()
+    return run_threads(worker, threads)
+
+def run_write_behind(app, threads, answers_per_thread, num_questions):
+    # Room for every answer, so the timing never includes dropped events
+    aggregator = AnswerAggregator(app, flush_size=500, flush_interval=0.5,
+                                  max_pending=threads * answers_per_thread)
+    aggregator.start()
+
+    def worker(offset):
+        for i in range(answers_per_thread):
+            question_id = (offset + i) % num_questions + 1
+            aggregator.add(question_id, f"Benchmark question {question_id}", i % 2 == 0, 3.0, 10)
+
+    elapsed = run_threads(worker, threads)
+    start = time.perf_counter()
+    aggregator.close()
+    return elapsed + (time.perf_counter() - start)
+
+def run_threads(worker, threads):
+    pool = [threading.Thread(target=worker, args=(n * 7,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent answer logging benchmark")
+    parser.add_argument('--threads', default='1,4,16', help="Comma-separated thread counts")
+    parser.add_argument('--answers', type=int, default=200, help="Answers logged per thread")
+    parser.add_argument('--questions', type=int, default=20, help="Distinct questions answered")
+    args = parser.parse_args()
+
+    app = create_bench_app(pool_size=20, max_overflow=20)
+    with app.app_context():
+        seed_questions(args.questions)
+
+    print(f"{'mode':<14} {'threads':>7} {'answers':>8} {'answers/s':>10} {'lost':>6} {'drift':>6}")
+    for mode, run in (('upsert', run_direct), ('write_behind', run_write_behind)):
+        for threads in (int(t) for t in args.threads.split(',')):
+            with app.app_context():
+                QuestionAnalytics.query.delete()
+                AnalyticsSummary.query.delete()
+                db.session.commit()
+
+            elapsed = run(app, threads, args.answers, args.questions)
+
+            with app.app_context():
+                recorded = db.session.query(
+                    func.sum(QuestionAnalytics.correct_count + QuestionAnalytics.wrong_count)
+                ).scalar() or 0
+                drift = AnalyticsSummary.reconcile()
+            expected = threads * args.answers
+            print(f"{mode:<14} {threads:>7} {expected:>8} {expected / elapsed:>10.0f} {expected - recorded:>6} {len(drift):>6}")
+
+if __name__ == '__main__':
+    main()
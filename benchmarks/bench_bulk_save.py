@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark saving generated questions one commit at a time against the bulk
+DatabaseService.store_questions path, with and without a bad row in the batch.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_bulk_save.py [--sizes 10,100,1000]
+"""
+
+import argparse
+import time
+from bench_utils import create_bench_app
+from config.database import db
+from models.quiz import Question
+from services.database_service import DatabaseService
+
+def make_questions(count, bad_every=None):
+    questions = []
+    for i in range(count):
+        question = {
+            'question': f"Bulk benchmark question {i}",
+            'options': [f"Option {c} {i}" for c in 'ABCD'],
+            'correct_answer': f"Option A {i}",
+            'difficulty': ['easy', 'medium', 'hard'][i % 3],
+        }
+        if bad_every and i % bad_every == bad_every - 1:
+            # NUL passes validation but is rejected when the statement executes
+            question['question'] += '\x00'
+        questions.append(question)
+    return questions
+
+def save_one_by_one(questions):
+    saved = 0
+    for q in questions:
+        try:
+            DatabaseService.store_single_question(
+                question=q['question'],
+                options=q['options'],
+                correct_answer=q['correct_answer'],
+                difficulty=q.get('difficulty', 'medium'),
+                topic=q.get('topic'),
+            )
+            saved += 1
+        except Exception:
+            db.session.rollback()
+    return saved
+
+def save_bulk(questions):
+    saved_ids, _ = DatabaseService.store_questions(questions)
+    return len(saved_ids)
+
+def measure(func, questions, repeat):
+    best = float('inf')
+    saved = 0
+    for _ in range(repeat):
+        db.session.query(Question).delete()
+        db.session.commit()
+        start = time.perf_counter()
+        saved = func(questions)
+        best = min(best, time.perf_counter() - start)
+    return best, saved
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk question save benchmark")
+    parser.add_argument('--sizes', default='10,100,1000', help="Comma-separated batch sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument('--bad-every', type=int, default=25, help="Put one failing row in every N for the mixed run")
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    with app.app_context():
+        header = f"{'size':>6} {'batch':<6} {'saved':>6} {'loop ms':>10} {'bulk ms':>10} {'speedup':>8}"
+        print(header)
+        print('-' * len(header))
+        for size in [int(s) for s in args.sizes.split(',')]:
+            for label, bad_every in (('clean', None), ('mixed', args.bad_every)):
+                questions = make_questions(size, bad_every)
+                loop_time, loop_saved = measure(save_one_by_one, questions, args.repeat)
+                bulk_time, bulk_saved = measure(save_bulk, questions, args.repeat)
+                if loop_saved != bulk_saved:
+                    print(f"Saved count mismatch: loop={loop_saved} bulk={bulk_saved}")
+                print(f"{size:>6} {label:<6} {bulk_saved:>6} {loop_time * 1000:>10.2f} {bulk_time * 1000:>10.2f} "
+                      f"{loop_time / bulk_time:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start database cost for each engine configuration.
+
+Every mode runs in a fresh interpreter to mimic a serverless cold start and
+reports app initialization time (init_db, including the schema probe unless
+skipped), the first query, and the per-request latency of follow-up
+requests that each open and close a session.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_db_startup.py [--requests 50]
+       Set BENCH_POOLED_DATABASE_URL to a pgbouncer URL to include the pooled modes.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = {
+    'queue': {'DB_POOL_MODE': 'queue', 'DB_POOL_PRE_PING': False},
+    'queue+pre_ping': {'DB_POOL_MODE': 'queue', 'DB_POOL_PRE_PING': True},
+    'queue+skip_probe': {'DB_POOL_MODE': 'queue', 'DB_POOL_PRE_PING': True, 'DB_SKIP_SCHEMA_CHECK': True},
+    'null': {'DB_POOL_MODE': 'null'},
+    'null+skip_probe': {'DB_POOL_MODE': 'null', 'DB_SKIP_SCHEMA_CHECK': True},
+}
+
+POOLED_MODES = {
+    'pooler+queue+skip_probe': {'DB_POOL_MODE': 'queue', 'DB_USE_POOLER': True, 'DB_SKIP_SCHEMA_CHECK': True},
+    'pooler+null+skip_probe': {'DB_POOL_MODE': 'null', 'DB_USE_POOLER': True, 'DB_SKIP_SCHEMA_CHECK': True},
+}
+
+def run_child(mode_config, requests):
+    """Measure one configuration in this process and print the results as JSON."""
+    from flask import Flask
+    from sqlalchemy import text
+    from bench_utils import bench_database_url, summarize
+    from config.database import db, init_db
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = bench_database_url()
+    app.config['POSTGRES_POOLED_URL'] = os.getenv('BENCH_POOLED_DATABASE_URL')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(mode_config)
+
+    start = time.perf_counter()
+    init_db(app)
+    init_time = time.perf_counter() - start
+
+    def one_request():
+        with app.app_context():
+            db.session.execute(text('SELECT 1')).scalar()
+            db.session.remove()
+
+    start = time.perf_counter()
+    one_request()
+    first_time = time.perf_counter() - start
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        one_request()
+        samples.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        'init_ms': round(init_time * 1000, 3),
+        'first_query_ms': round(first_time * 1000, 3),
+        'request': summarize(samples),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="Database cold-start benchmark")
+    parser.add_argument('--requests', type=int, default=50, help="Follow-up requests per mode")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child), args.requests)
+        return
+
+    modes = dict(MODES)
+    if os.getenv('BENCH_POOLED_DATABASE_URL'):
+        modes.update(POOLED_MODES)
+
+    header = f"{'mode':<26} {'init ms':>9} {'first ms':>9} {'req p50':>9} {'req p95':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, mode_config in modes.items():
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', json.dumps(mode_config), '--requests', str(args.requests)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<26} {result['init_ms']:>9.2f} {result['first_query_ms']:>9.2f} "
+              f"{result['request']['p50_ms']:>9.3f} {result['request']['p95_ms']:>9.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the question duplicate index: build time, memory, per-candidate
+lookup latency and detection rates against a synthetic bank.
+
+Paraphrases reword a stored question (question word, articles, punctuation,
+case); novel questions are freshly generated and should not match.
+
+Usage: python benchmarks/bench_dedupe.py [--bank 100000] [--candidates 2000]
+"""
+
+import argparse
+import random
+import resource
+import time
+from bench_utils import summarize
+from services.dedupe_service import DuplicateIndex
+
+TEMPLATES = [
+    "What is the {a} of the {b} {c}?",
+    "Which {a} {b} the {c} in {year}?",
+    "Who {a} the first {b} {c}?",
+    "In which year did the {a} {b} {c}?",
+    "What {a} is known for its {b} {c}?",
+]
+
+REWORDINGS = [
+    ("What is", "Which is"),
+    ("Which", "What"),
+    ("Who", "Which person"),
+    ("In which year", "In what year"),
+    ("the ", "a "),
+    ("?", ""),
+]
+
+def make_vocabulary(rng, size):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+def make_question(rng, vocabulary):
+    template = rng.choice(TEMPLATES)
+    return template.format(
+        a=rng.choice(vocabulary), b=rng.choice(vocabulary), c=rng.choice(vocabulary),
+        year=rng.randint(1800, 2024)
+    )
+
+def paraphrase(rng, text):
+    for old, new in rng.sample(REWORDINGS, len(REWORDINGS)):
+        if old in text:
+            text = text.replace(old, new, 1)
+            break
+    return text.upper() if rng.random() < 0.2 else text
+
+def main():
+    parser = argparse.ArgumentParser(description="Question duplicate index benchmark")
+    parser.add_argument('--bank', type=int, default=100000, help="Questions in the index")
+    parser.add_argument('--candidates', type=int, default=2000, help="Lookups per candidate kind")
+    parser.add_argument('--threshold', type=float, default=0.7, help="Similarity treated as a duplicate")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng, 20000)
+    bank = [make_question(rng, vocabulary) for _ in range(args.bank)]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    index = DuplicateIndex(threshold=args.threshold)
+    for question_id, text in enumerate(bank, start=1):
+        index.add(question_id, text)
+    build_time = time.perf_counter() - start
+    # Peak RSS growth in KiB on Linux; a rough but overhead-free memory figure
+    memory_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    print(f"Indexed {len(index)} questions in {build_time:.2f}s using {memory_mb:.1f} MiB")
+
+    paraphrases = [paraphrase(rng, rng.choice(bank)) for _ in range(args.candidates)]
+    novel = [make_question(rng, vocabulary) for _ in range(args.candidates)]
+
+    for label, candidates in (('paraphrase', paraphrases), ('novel', novel)):
+        samples = []
+        matched = 0
+        for text in candidates:
+            start = time.perf_counter()
+            found = index.find_duplicate(text)
+            samples.append(time.perf_counter() - start)
+            matched += found is not None
+        stats = summarize(samples)
+        print(f"{label:<10} matched {matched / len(candidates):>6.1%}  "
+              f"p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the generate -> parse -> validate pipeline.
+
+Drives QuizService.generate_quiz with the synthetic and replay AI backends,
+so it needs no network or API key, and reports questions per second along
+with the time spent in the stream parser and in validation.
+
+Usage: python benchmarks/bench_generation.py [--repeat 5] [--json results.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+
+os.environ.setdefault('FLASK_PORT', '5000')
+os.environ.setdefault('POSTGRES_URL_NON_POOLING', 'postgresql://localhost/unused')
+os.environ['AI_CACHE_BACKEND'] = 'none'
+
+from bench_utils import summarize
+from services.ai_backends import SyntheticBackend, ReplayBackend
+from services.ai_service import AIService
+from services.json_stream import QuestionStreamParser
+from services.quiz_service import QuizService
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'malformed_responses.json')
+
+timings = defaultdict(float)
+
+def timed(name, func):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[name] += time.perf_counter() - start
+    return wrapper
+
+# Attribute pipeline time to its stages (summed across generation threads)
+QuestionStreamParser.feed = timed('parse', QuestionStreamParser.feed)
+QuestionStreamParser.finish = timed('parse', QuestionStreamParser.finish)
+QuizService._validate_and_sanitize_questions = timed('validate', QuizService._validate_and_sanitize_questions)
+
+def scenarios():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        corpus = [case['text'] for case in json.load(f)]
+
+    return [
+        ('synthetic clean', SyntheticBackend(seed=1), [5, 20, 50]),
+        ('synthetic 10% cut 20% bad', SyntheticBackend(truncate_rate=0.1, malformed_rate=0.2, seed=1), [5, 20, 50]),
+        ('synthetic 300ms latency', SyntheticBackend(latency=0.3, seed=1), [5, 20, 50]),
+        ('replay malformed corpus', ReplayBackend(responses=corpus), [5, 20]),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline generation pipeline benchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="generate_quiz calls per size")
+    parser.add_argument('--json', help="Also write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    header = f"{'backend':<28} {'size':>4} {'got':>5} {'p50 ms':>8} {'q/s':>8} {'parse ms':>9} {'validate ms':>12}"
+    print(header)
+    print('-' * len(header))
+
+    results = []
+    for name, backend, sizes in scenarios():
+        service = QuizService(ai_service=AIService(backend=backend))
+        for size in sizes:
+            timings.clear()
+            samples = []
+            returned = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    questions = service.generate_quiz('Benchmarks', size, ['multiple_choice'], 'medium', use_cache=False)
+                samples.append(time.perf_counter() - start)
+                returned += len(questions)
+
+            stats = summarize(samples)
+            result = {
+                'backend': name,
+                'size': size,
+                'questions_per_call': returned / args.repeat,
+                'p50_ms': stats['p50_ms'],
+                'questions_per_sec': round(returned / sum(samples), 1),
+                'parse_ms_per_call': round(timings['parse'] * 1000 / args.repeat, 3),
+                'validate_ms_per_call': round(timings['validate'] * 1000 / args.repeat, 3),
+            }
+            results.append(result)
+            print(f"{name:<28} {size:>4} {result['questions_per_call']:>5.1f} {result['p50_ms']:>8.1f} "
+                  f"{result['questions_per_sec']:>8.1f} {result['parse_ms_per_call']:>9.3f} {result['validate_ms_per_call']:>12.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark repeat dashboard requests to /analytics/api/questions: a plain
+request, the same request with gzip, and a revalidation that sends back the
+ETag of the previous response. Prints latency and bytes on the wire for each.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_http_cache.py [--rows 10000] [--limits 50,500]
+"""
+
+import argparse
+import os
+
+# Config reads the database URL when first imported, which bench_utils does
+if os.getenv('BENCH_DATABASE_URL'):
+    os.environ['POSTGRES_URL_NON_POOLING'] = os.environ['BENCH_DATABASE_URL']
+os.environ['DB_SKIP_SCHEMA_CHECK'] = 'true'
+
+from bench_utils import create_bench_app, seed_analytics, seed_questions, summarize, time_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics API ETag and compression benchmark")
+    parser.add_argument('--rows', type=int, default=10000, help="Analytics rows to seed")
+    parser.add_argument('--limits', default='50,500', help="Comma-separated page sizes")
+    parser.add_argument('--iterations', type=int, default=50, help="Requests timed per case")
+    args = parser.parse_args()
+
+    bench_app = create_bench_app()
+    with bench_app.app_context():
+        seed_questions(args.rows)
+        seed_analytics(args.rows)
+
+    from app import app
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+
+    print(f"{args.rows} analytics rows\n")
+    print(f"{'limit':>6} {'request':<12} {'status':>6} {'bytes':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for limit in (int(value) for value in args.limits.split(',')):
+        url = f'/analytics/api/questions?sort=difficulty&limit={limit}'
+        etag = client.get(url).headers['ETag']
+        cases = {
+            'identity': {'Accept-Encoding': 'identity'},
+            'gzip': {'Accept-Encoding': 'gzip'},
+            'revalidate': {'Accept-Encoding': 'gzip', 'If-None-Match': etag},
+        }
+        for name, headers in cases.items():
+            response = client.get(url, headers=headers)
+            stats = summarize(time_call(lambda: client.get(url, headers=headers), args.iterations))
+            print(f"{limit:>6} {name:<12} {response.status_code:>6} {len(response.data):>9} "
+                  f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark comparing the single-pass question extractor against the
+legacy multi-strategy JSON repair cascade on a corpus of malformed responses.
+
+Usage: python benchmarks/bench_json_extract.py [--repeat N]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.json_stream import extract_questions
+from legacy_json_repair import LegacyJSONRepair
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'malformed_responses.json')
+
+def count_usable(questions):
+    """Count objects carrying the fields QuizService requires"""
+    if not isinstance(questions, list):
+        return 0
+    return sum(
+        1 for q in questions
+        if isinstance(q, dict) and 'question' in q and 'options' in q and 'correct_answer' in q
+    )
+
+def time_parser(parse, text, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help='Timing repetitions per case (best is reported)')
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    legacy = LegacyJSONRepair()
+
+    def legacy_parse(text):
+        # The cascade reports progress with print(); keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            return legacy.parse(text)
+
+    header = f"{'case':<34} {'size':>7} {'expect':>6} {'legacy':>6} {'single':>6} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}"
+    print(header)
+    print('-' * len(header))
+
+    totals = {'legacy': 0.0, 'single': 0.0, 'legacy_found': 0, 'single_found': 0, 'expected': 0}
+    for case in corpus:
+        text = case['text']
+        legacy_time, legacy_result = time_parser(legacy_parse, text, args.repeat)
+        single_time, single_result = time_parser(extract_questions, text, args.repeat)
+        legacy_found = count_usable(legacy_result)
+        single_found = count_usable(single_result)
+
+        totals['legacy'] += legacy_time
+        totals['single'] += single_time
+        totals['legacy_found'] += legacy_found
+        totals['single_found'] += single_found
+        totals['expected'] += case['expected_questions']
+
+        speedup = legacy_time / single_time if single_time else float('inf')
+        print(f"{case['name']:<34} {len(text):>7} {case['expected_questions']:>6} {legacy_found:>6} {single_found:>6} "
+              f"{legacy_time * 1000:>10.3f} {single_time * 1000:>10.3f} {speedup:>7.1f}x")
+
+    print('-' * len(header))
+    print(f"{'total':<34} {'':>7} {totals['expected']:>6} {totals['legacy_found']:>6} {totals['single_found']:>6} "
+          f"{totals['legacy'] * 1000:>10.3f} {totals['single'] * 1000:>10.3f} {totals['legacy'] / totals['single']:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
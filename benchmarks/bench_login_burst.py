@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark a burst of concurrent logins with and without hashing admission
+control.
+
+Each mode runs in a fresh process so peak RSS is comparable. 'unbounded'
+gives the hashing pool a slot per login, as when every request thread hashed
+for itself; 'bounded' uses the configured memory budget and queue. While the
+burst runs, a probe thread times /play to show the effect on other routes.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_login_burst.py [--logins 32] [--memory-cost-mb 32]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from bench_utils import bench_database_url, project_root
+
+CHILD_CODE = """
+import json, resource, sys, threading, time
+from collections import Counter
+from app import app
+from config.database import db
+from models.user import User
+sys.path.insert(0, 'benchmarks')
+from bench_utils import summarize
+
+logins = int(sys.argv[1])
+with app.app_context():
+    db.create_all()
+    if not User.query.filter_by(username='bench-user').first():
+        user = User(username='bench-user')
+        user.set_password('bench-password')
+        db.session.add(user)
+        db.session.commit()
+
+statuses, login_times, probe_times = Counter(), [], []
+done = threading.Event()
+
+def login(index):
+    client = app.test_client()
+    start = time.perf_counter()
+    # Distinct client addresses, so only hashing limits apply
+    response = client.post('/auth/login', data={'username': 'bench-user', 'password': 'bench-password'},
+                           environ_base={'REMOTE_ADDR': f'10.0.{index // 250}.{index % 250}'})
+    login_times.append(time.perf_counter() - start)
+    statuses[response.status_code] += 1
+
+def probe():
+    client = app.test_client()
+    while not done.is_set():
+        start = time.perf_counter()
+        client.get('/play')
+        probe_times.append(time.perf_counter() - start)
+        time.sleep(0.02)
+
+baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+prober = threading.Thread(target=probe)
+prober.start()
+threads = [threading.Thread(target=login, args=(i,)) for i in range(logins)]
+start = time.perf_counter()
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+elapsed = time.perf_counter() - start
+done.set()
+prober.join()
+
+print(json.dumps({
+    'elapsed_s': round(elapsed, 2),
+    'statuses': dict(statuses),
+    'login': summarize(login_times),
+    'probe': summarize(probe_times),
+    'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+    'baseline_rss_mb': round(baseline_rss / 1024),
+}))
+"""
+
+def run_mode(logins, env):
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_CODE, str(logins)],
+        cwd=project_root, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(2)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent login burst benchmark")
+    parser.add_argument('--logins', type=int, default=32, help="Simultaneous login attempts")
+    parser.add_argument('--memory-cost-mb', type=int, default=32, help="Argon2 memory per hash")
+    parser.add_argument('--budget-mb', type=int, default=128, help="HASH_MEMORY_BUDGET_MB for the bounded mode")
+    parser.add_argument('--queue', type=int, default=8, help="HASH_MAX_QUEUE for the bounded mode")
+    args = parser.parse_args()
+
+    base_env = dict(os.environ)
+    base_env.update({
+        'POSTGRES_URL_NON_POOLING': bench_database_url(),
+        'DB_SKIP_SCHEMA_CHECK': 'true',
+        'PASSWORD_HASH_MEMORY_COST': str(args.memory_cost_mb * 1024),
+        'LOGIN_IP_LIMIT': '0',
+        'LOGIN_USER_FAILURE_LIMIT': '0',
+    })
+    modes = {
+        'unbounded': {'HASH_MEMORY_BUDGET_MB': str(args.memory_cost_mb * args.logins), 'HASH_MAX_QUEUE': str(args.logins)},
+        'bounded': {'HASH_MEMORY_BUDGET_MB': str(args.budget_mb), 'HASH_MAX_QUEUE': str(args.queue)},
+    }
+
+    print(f"{args.logins} logins at {args.memory_cost_mb} MiB per hash\n")
+    print(f"{'mode':<10} {'ok':>4} {'503':>4} {'peak MiB':>9} {'login p50':>10} {'login p99':>10} {'/play p99':>10}")
+    for mode, overrides in modes.items():
+        result = run_mode(args.logins, {**base_env, **overrides})
+        ok = result['statuses'].get('302', 0)
+        rejected = result['statuses'].get('503', 0)
+        print(f"{mode:<10} {ok:>4} {rejected:>4} {result['peak_rss_mb']:>9} "
+              f"{result['login']['p50_ms']:>9.0f}ms {result['login']['p99_ms']:>9.0f}ms {result['probe']['p99_ms']:>9.1f}ms")
+
+if __name__ == '__main__':
+    main()
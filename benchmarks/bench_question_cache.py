@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark /random-questions with the in-process question cache against
+sampling from PostgreSQL on every request: latency, SQL statements per
+request, the cost of the first (loading) request per difficulty and the
+memory the cache holds.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_question_cache.py [--questions 100000] [--requests 500]
+"""
+
+import argparse
+import os
+import random
+import resource
+
+# Config reads the database URL when first imported, which bench_utils does
+if os.getenv('BENCH_DATABASE_URL'):
+    os.environ['POSTGRES_URL_NON_POOLING'] = os.environ['BENCH_DATABASE_URL']
+os.environ['DB_SKIP_SCHEMA_CHECK'] = 'true'
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from bench_utils import create_bench_app, seed_questions, summarize, time_call
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(Engine, 'after_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Question cache benchmark")
+    parser.add_argument('--questions', type=int, default=100000, help="Questions to seed")
+    parser.add_argument('--requests', type=int, default=500, help="Requests timed per mode")
+    args = parser.parse_args()
+
+    bench_app = create_bench_app()
+    with bench_app.app_context():
+        seed_questions(args.questions)
+
+    from app import app
+    from config.settings import Config
+    import services.question_cache as question_cache
+
+    client = app.test_client()
+    queries = QueryCounter()
+
+    def play():
+        response = client.get(f'/random-questions?difficulty={random.choice(DIFFICULTIES)}')
+        assert response.status_code == 200, response.status_code
+
+    print(f"{args.questions} questions, {args.requests} requests per mode\n")
+    print(f"{'mode':<8} {'queries/req':>11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    Config.QUESTION_CACHE_ENABLED = False
+    play()
+    queries.count = 0
+    stats = summarize(time_call(play, args.requests))
+    print(f"{'sql':<8} {queries.count / args.requests:>11.2f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+    Config.QUESTION_CACHE_ENABLED = True
+    rss_before = rss_mb()
+    load_times = {}
+    for difficulty in DIFFICULTIES:
+        load_times[difficulty] = time_call(lambda: client.get(f'/random-questions?difficulty={difficulty}'), 1)[0]
+    queries.count = 0
+    stats = summarize(time_call(play, args.requests))
+    print(f"{'cache':<8} {queries.count / args.requests:>11.2f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+    cache = question_cache.get_question_cache()
+    print(f"\n{'difficulty':<10} {'questions':>9} {'cache KiB':>10} {'bytes/q':>8} {'first request ms':>17}")
+    total = 0
+    for difficulty, info in sorted(cache.stats().items()):
+        total += info['bytes']
+        print(f"{difficulty:<10} {info['questions']:>9} {info['bytes'] // 1024:>10} "
+              f"{info['bytes'] / max(info['questions'], 1):>8.0f} {load_times[difficulty] * 1000:>17.0f}")
+    print(f"\nCache holds {total / 1024 / 1024:.1f} MiB (limit {Config.QUESTION_CACHE_MAX_MB} MiB); "
+          f"peak RSS grew {rss_mb() - rss_before:.1f} MiB while loading")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark random question sampling as the question bank grows, comparing
+ORDER BY random() with the indexed random_key sampler.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_random_sampling.py [--sizes 1000,10000,100000,1000000]
+"""
+
+import argparse
+from sqlalchemy import func
+from bench_utils import create_bench_app, seed_questions, summarize, time_call
+from models.quiz import Question
+from services.sampling_service import SamplingService
+
+def order_by_random(difficulty):
+    return Question.query.filter_by(difficulty=difficulty).order_by(func.random()).limit(5).all()
+
+def main():
+    parser = argparse.ArgumentParser(description="Random question sampling benchmark")
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000', help="Comma-separated bank sizes")
+    parser.add_argument('--iterations', type=int, default=100, help="Samples timed per size and method")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    app = create_bench_app()
+
+    print(f"{'bank size':>10} {'method':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    with app.app_context():
+        seeded = 0
+        for size in sizes:
+            seed_questions(size, start=seeded)
+            seeded = size
+
+            for name, sample in (
+                ('order_by_random', lambda: order_by_random('medium')),
+                ('random_key', lambda: SamplingService.sample_questions('medium', 5)),
+            ):
+                sample()  # Warm up caches and plans
+                stats = summarize(time_call(sample, args.iterations))
+                print(f"{size:>10} {name:<16} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+if __name__ == '__main__':
+    main()
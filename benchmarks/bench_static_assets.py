@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare what a browser downloads for /play with the unbundled source files
+against the build_assets.py output: requests and bytes on a first visit,
+and requests a repeat visit still has to make (revalidations for files
+served no-cache, none for immutable ones).
+
+Load time is estimated for a simple network model: requests go out six at
+a time, each round costs one round trip, and bytes share the bandwidth.
+
+Usage: python benchmarks/bench_static_assets.py [--rtt-ms 150] [--bandwidth-kbps 1600]
+"""
+
+import argparse
+import math
+import os
+import re
+import time
+
+os.environ.setdefault('DB_SKIP_SCHEMA_CHECK', 'true')
+
+from bench_utils import project_root  # noqa: F401  (puts the project on sys.path)
+from app import app
+from build_assets import build
+import services.asset_service as asset_service
+
+ASSET_PATTERN = re.compile(r'(?:src|href)="(/(?:static|assets)/[^"]+)"')
+PARALLEL_REQUESTS = 6
+
+def estimate_ms(requests, total_bytes, rtt_ms, bandwidth_kbps):
+    rounds = math.ceil(requests / PARALLEL_REQUESTS)
+    return rounds * rtt_ms + total_bytes * 8 / bandwidth_kbps
+
+def visit(client, page):
+    """Fetch page and its local scripts and stylesheets as a gzip-capable browser would"""
+    headers = {'Accept-Encoding': 'gzip, br'}
+    html = client.get(page).get_data(as_text=True)
+    first, repeat, served_ms = [], [], 0.0
+    for url in ASSET_PATTERN.findall(html):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        served_ms += (time.perf_counter() - start) * 1000
+        first.append(len(response.data))
+        if not response.cache_control.immutable:
+            # Served no-cache: the next visit revalidates and gets a 304
+            repeat.append(response.headers.get('ETag'))
+        response.close()
+    return first, repeat, served_ms
+
+def main():
+    parser = argparse.ArgumentParser(description="Static asset download benchmark")
+    parser.add_argument('--page', default='/play', help="Page to load")
+    parser.add_argument('--rtt-ms', type=float, default=150, help="Round trip time for the load estimate")
+    parser.add_argument('--bandwidth-kbps', type=float, default=1600, help="Bandwidth for the load estimate")
+    args = parser.parse_args()
+
+    build()
+    client = app.test_client()
+    modes = {
+        'source': asset_service.AssetManifest(enabled=False),
+        'built': asset_service.AssetManifest(),
+    }
+
+    print(f"{args.page} at {args.rtt_ms:.0f} ms RTT, {args.bandwidth_kbps:.0f} kbit/s\n")
+    print(f"{'mode':<8} {'requests':>8} {'bytes':>9} {'est. first ms':>14} {'repeat reqs':>12} {'est. repeat ms':>15} {'server ms':>10}")
+    for mode, manifest in modes.items():
+        asset_service._manifest = manifest
+        first, repeat, served_ms = visit(client, args.page)
+        first_ms = estimate_ms(len(first), sum(first), args.rtt_ms, args.bandwidth_kbps)
+        repeat_ms = estimate_ms(len(repeat), 0, args.rtt_ms, args.bandwidth_kbps)
+        print(f"{mode:<8} {len(first):>8} {sum(first):>9} {first_ms:>14.0f} {len(repeat):>12} {repeat_ms:>15.0f} {served_ms:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Shared helpers for the database benchmarks.
+
+Benchmarks run against a scratch database given by BENCH_DATABASE_URL. Its
+tables are dropped and recreated, so never point it at real data.
+"""
+
+import os
+import sys
+import statistics
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from flask import Flask
+from sqlalchemy import text
+from config.database import db
+import models  # Registers every model on db.metadata
+
+def bench_database_url():
+    url = os.getenv('BENCH_DATABASE_URL')
+    if not url:
+        print("Set BENCH_DATABASE_URL to a scratch PostgreSQL database (its tables will be dropped).")
+        sys.exit(1)
+    return url.replace('postgres://', 'postgresql://')
+
+def create_bench_app(reset=True, **engine_options):
+    """Create a minimal app bound to the scratch database."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = bench_database_url()
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if engine_options:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    db.init_app(app)
+
+    if reset:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+    return app
+
+def seed_questions(total, start=0):
+    """Insert synthetic questions numbered start..total-1 spread over the three difficulties."""
+    if total <= start:
+        return
+    db.session.execute(text("""
+        INSERT INTO questions (question, options, correct_answer, difficulty, random_key, created_at)
+        SELECT 'Benchmark question ' || g,
+               ARRAY['Option A ' || g, 'Option B ' || g, 'Option C ' || g, 'Option D ' || g],
+               'Option A ' || g,
+               (ARRAY['easy', 'medium', 'hard'])[1 + g % 3],
+               random(),
+               now()
+        FROM generate_series(:start, :stop) AS g
+    """), {'start': start, 'stop': total - 1})
+    db.session.commit()
+    db.session.execute(text("ANALYZE questions"))
+    db.session.commit()
+
+def seed_analytics(total):
+    """Insert analytics rows for questions 1..total with random answer counts, then rebuild the summary."""
+    if total <= 0:
+        return
+    db.session.execute(text("""
+        INSERT INTO question_analytics (question_id, question_text, correct_count, wrong_count,
+                                        total_time_taken, total_score, created_at)
+        SELECT q.id, q.question, c.correct, c.wrong, (c.correct + c.wrong) * 6.5, c.correct * 10, now()
+        FROM (SELECT id, question FROM questions ORDER BY id LIMIT :total) AS q
+        CROSS JOIN LATERAL (
+            SELECT (random() * 50 + q.id * 0)::int AS correct, (random() * 50 + q.id * 0)::int AS wrong
+        ) AS c
+        ON CONFLICT (question_id) DO NOTHING
+    """), {'total': total})
+    db.session.commit()
+    db.session.execute(text("ANALYZE question_analytics"))
+    db.session.commit()
+    models.AnalyticsSummary.reconcile()
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples):
+    """Return latency stats in milliseconds for a list of durations in seconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        'count': len(ms),
+        'mean_ms': round(statistics.mean(ms), 3),
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+    }
+
+def time_call(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cold-start import report and budget check.
+
+Imports the app in a fresh interpreter under `python -X importtime`, prints
+the slowest modules, then replays read-only player requests (/play,
+/random-questions, a rejected analytics batch) and checks that none of them
+loaded the AI stack. Exits non-zero when the import budget is exceeded or a
+player request pulled in a deferred module.
+
+Usage: python benchmarks/check_cold_start.py [--budget-ms 1000] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules player endpoints must never import
+DEFERRED_MODULES = ['google.genai']
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+PLAYER_REQUESTS = """
+import json, sys
+from app import app
+client = app.test_client()
+client.get('/play')
+client.get('/random-questions?difficulty=easy')
+client.post('/api/analytics/log-batch', data='{"answers": []}', content_type='application/json')
+print(json.dumps({name: name in sys.modules for name in %r}))
+""" % (DEFERRED_MODULES,)
+
+def child_env():
+    env = dict(os.environ)
+    # Measure imports, not the startup schema probe
+    env.setdefault('DB_SKIP_SCHEMA_CHECK', 'true')
+    if os.getenv('BENCH_DATABASE_URL'):
+        env['POSTGRES_URL_NON_POOLING'] = os.getenv('BENCH_DATABASE_URL')
+    return env
+
+def import_report():
+    """Return [(cumulative_us, self_us, depth, module)] for `import app`."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=project_root, env=child_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(2)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+    return rows
+
+def player_modules():
+    result = subprocess.run(
+        [sys.executable, '-c', PLAYER_REQUESTS],
+        cwd=project_root, env=child_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(2)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import budget check")
+    parser.add_argument('--budget-ms', type=float, default=1000, help="Maximum cumulative import time for app")
+    parser.add_argument('--top', type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    rows = import_report()
+    total_ms = next(cumulative for cumulative, _, _, module in rows if module == 'app') / 1000
+    imported = {module for _, _, _, module in rows}
+
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for cumulative, self_time, depth, module in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:>13.1f} {self_time / 1000:>8.1f}  {'  ' * depth}{module}")
+    print()
+
+    failures = []
+    print(f"import app: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        failures.append(f"import app took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for module in DEFERRED_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported at startup")
+
+    for module, loaded in player_modules().items():
+        print(f"{module} loaded by player requests: {'yes' if loaded else 'no'}")
+        if loaded:
+            failures.append(f"{module} is imported by a player request")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("PASS")
+
+if __name__ == '__main__':
+    main()
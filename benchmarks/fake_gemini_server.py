@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini REST API, for exercising AIService offline.
+
+Serves generateContent and streamGenerateContent (SSE) for any model with
+a canned quiz response, and can inject latency, a slow tail, 429s and 503s.
+Point the app at it with GEMINI_BASE_URL=http://127.0.0.1:<port>.
+
+Usage: python benchmarks/fake_gemini_server.py [--port 8765] [--latency 0.2] [--error-rate 0.1]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def quiz_text(num_questions=5):
+    questions = [
+        {
+            "type": "multiple_choice",
+            "question": f"Fake question {i} number {random.randint(0, 10 ** 9)}?",
+            "options": [f"Answer {i}{c}" for c in 'ABCD'],
+            "correct_answer": f"Answer {i}A",
+            "difficulty": "medium",
+        }
+        for i in range(num_questions)
+    ]
+    return json.dumps({"questions": questions}, indent=2)
+
+def response_body(text):
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+        }]
+    }
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. the losing side of a hedged request
+            self.close_connection = True
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        faults = self.server.faults
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            self.server.requests += 1
+
+        roll = random.random()
+        if roll < faults['rate_limit_rate']:
+            return self._send_json(429, {"error": {"code": 429, "message": "Resource exhausted", "status": "RESOURCE_EXHAUSTED"}})
+        if roll < faults['rate_limit_rate'] + faults['error_rate']:
+            return self._send_json(503, {"error": {"code": 503, "message": "Model overloaded", "status": "UNAVAILABLE"}})
+
+        delay = faults['latency'] + random.uniform(0, faults['jitter'])
+        if random.random() < faults['slow_rate']:
+            delay += faults['slow_latency']
+        time.sleep(delay)
+
+        text = quiz_text(faults['questions'])
+        if ':streamGenerateContent' not in self.path:
+            return self._send_json(200, response_body(text))
+
+        # Server-sent events, one chunk of the text per event
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        step = max(1, len(text) // faults['stream_chunks'])
+        for start in range(0, len(text), step):
+            event = json.dumps(response_body(text[start:start + step]))
+            self.wfile.write(f"data: {event}\r\n\r\n".encode())
+            self.wfile.flush()
+            time.sleep(faults['chunk_delay'])
+        self.close_connection = True
+
+DEFAULT_FAULTS = {
+    'latency': 0.2,         # Seconds before answering
+    'jitter': 0.05,         # Extra random latency
+    'slow_rate': 0.0,       # Fraction of requests that take slow_latency longer
+    'slow_latency': 2.0,
+    'error_rate': 0.0,      # Fraction answered with 503
+    'rate_limit_rate': 0.0, # Fraction answered with 429
+    'questions': 5,
+    'stream_chunks': 8,
+    'chunk_delay': 0.01,
+}
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many callers start at once
+    request_queue_size = 128
+
+def start_fake_server(port=0, **faults):
+    """Start the server on a daemon thread; returns it (base URL in server.base_url)."""
+    server = FakeGeminiServer(('127.0.0.1', port), FakeGeminiHandler)
+    server.faults = dict(DEFAULT_FAULTS, **faults)
+    server.requests = 0
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name='fake-gemini', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini API server")
+    parser.add_argument('--port', type=int, default=8765)
+    for name, default in DEFAULT_FAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+
+    faults = {name: getattr(args, name) for name in DEFAULT_FAULTS}
+    server = start_fake_server(args.port, **faults)
+    print(f"Fake Gemini API listening on {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Load test for the player hot path: /random-questions, then one
+/api/analytics/log per answered question (or one /api/analytics/log-batch
+per game with --batch).
+
+Seeds the scratch database with N questions and M analytics rows, starts
+the real app in a separate process behind a threaded WSGI server, and runs
+concurrent simulated players against it over HTTP. Prints p50/p95/p99
+latency and requests/sec per endpoint and writes them, with the run
+parameters and git commit, to a JSON file so runs can be compared.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python benchmarks/loadtest_player.py \\
+           [--questions 10000] [--analytics 5000] [--players 16] [--duration 20] [--output loadtest.json]
+       Pass --url to drive an already running server instead (nothing is seeded).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from bench_utils import bench_database_url, create_bench_app, project_root, seed_analytics, seed_questions, summarize
+
+SERVER_CODE = """
+import sys
+from werkzeug.serving import make_server
+from app import app
+server = make_server('127.0.0.1', int(sys.argv[1]), app, threaded=True)
+print('ready', flush=True)
+server.serve_forever()
+"""
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, elapsed, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(elapsed)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+def start_server(port):
+    env = dict(os.environ)
+    env['POSTGRES_URL_NON_POOLING'] = bench_database_url()
+    env['DB_SKIP_SCHEMA_CHECK'] = 'true'
+    env.setdefault('SECRET_KEY', 'loadtest')
+    env.setdefault('FLASK_PORT', str(port))
+    server = subprocess.Popen(
+        [sys.executable, '-c', SERVER_CODE, str(port)],
+        cwd=project_root, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    if server.stdout.readline().strip() != 'ready':
+        server.kill()
+        raise RuntimeError("App server failed to start")
+    return server
+
+class Player(threading.Thread):
+    """Plays games back to back until the deadline, timing every request."""
+
+    def __init__(self, base_url, recorder, deadline, batch, think_time):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.recorder = recorder
+        self.deadline = deadline
+        self.batch = batch
+        self.think_time = think_time
+        self.games = 0
+
+    def request(self, connection, method, path, endpoint, body=None):
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            payload, ok = b'', False
+        self.recorder.add(endpoint, time.perf_counter() - start, ok)
+        return payload if ok else None
+
+    def run(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        while time.monotonic() < self.deadline:
+            difficulty = random.choice(DIFFICULTIES)
+            payload = self.request(connection, 'GET', f'/random-questions?difficulty={difficulty}', '/random-questions')
+            questions = json.loads(payload).get('questions', []) if payload else []
+
+            answers = []
+            for question in questions:
+                if self.think_time:
+                    time.sleep(random.uniform(0, 2 * self.think_time))
+                is_correct = random.random() < 0.6
+                answer = {
+                    'question_id': question['id'],
+                    'question_text': question['question'],
+                    'is_correct': is_correct,
+                    'time_taken': round(random.uniform(1, 15), 2),
+                    'score': 10 if is_correct else 0,
+                }
+                if self.batch:
+                    answers.append(answer)
+                else:
+                    self.request(connection, 'POST', '/api/analytics/log', '/api/analytics/log', answer)
+            if self.batch and answers:
+                self.request(connection, 'POST', '/api/analytics/log-batch', '/api/analytics/log-batch', {'answers': answers})
+            self.games += 1
+        connection.close()
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Player hot path load test")
+    parser.add_argument('--questions', type=int, default=10000, help="Questions to seed")
+    parser.add_argument('--analytics', type=int, default=5000, help="Analytics rows to seed")
+    parser.add_argument('--players', type=int, default=16, help="Concurrent simulated players")
+    parser.add_argument('--duration', type=float, default=20, help="Seconds of load")
+    parser.add_argument('--think-ms', type=float, default=0, help="Mean pause before each answer")
+    parser.add_argument('--batch', action='store_true', help="Log each game with one log-batch request")
+    parser.add_argument('--port', type=int, default=5077, help="Port for the app server")
+    parser.add_argument('--url', help="Load an already running server instead of starting one")
+    parser.add_argument('--output', default='loadtest_results.json', help="Machine-readable results file")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        app = create_bench_app()
+        with app.app_context():
+            seed_questions(args.questions)
+            seed_analytics(args.analytics)
+        print(f"Seeded {args.questions} questions and {args.analytics} analytics rows")
+        server = start_server(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        recorder = Recorder()
+        deadline = time.monotonic() + args.duration
+        players = [Player(base_url, recorder, deadline, args.batch, args.think_ms / 1000) for _ in range(args.players)]
+        start = time.perf_counter()
+        for player in players:
+            player.start()
+        for player in players:
+            player.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    endpoints = {}
+    header = f"{'endpoint':<26} {'requests':>8} {'errors':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print('-' * len(header))
+    for endpoint, samples in recorder.samples.items():
+        stats = summarize(samples)
+        stats['errors'] = recorder.errors.get(endpoint, 0)
+        stats['rps'] = round(len(samples) / elapsed, 1)
+        endpoints[endpoint] = stats
+        print(f"{endpoint:<26} {stats['count']:>8} {stats['errors']:>6} {stats['rps']:>8.1f} "
+              f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    print(f"\n{sum(p.games for p in players)} games by {args.players} players in {elapsed:.1f}s")
+
+    result = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'parameters': {key: value for key, value in vars(args).items() if key != 'output'},
+        'elapsed_s': round(elapsed, 3),
+        'games': sum(p.games for p in players),
+        'endpoints': endpoints,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import logging
+from services.asset_service import BUILD_DIR, BUNDLES, MANIFEST_NAME, STATIC_DIR, in_place_files, source_digest
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 12
+# Text outputs are precompressed
+PRECOMPRESSED_SUFFIXES = ('.js', '.css', '.svg')
+
+_WORD_CHAR = re.compile(r'[\w$]')
+# After these a '/' starts a regular expression rather than a division
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                   'void', 'throw', 'instanceof', 'yield', 'await'}
+
+class _JsMinifier:
+    """Drops comments, indentation and blank lines from JavaScript.
+
+    Line breaks between statements are kept, so automatic semicolon
+    insertion behaves exactly as in the source; strings, template literals
+    and regular expressions are copied verbatim.
+    """
+
+    def __init__(self, source):
+        self.src = source
+        self.pos = 0
+        self.out = []
+        self.pending_space = False
+        self.pending_newline = False
+
+    def _last(self):
+        return self.out[-1][-1] if self.out else ''
+
+    def _last_word(self):
+        text = ''.join(self.out[-20:])
+        match = re.search(r'([\w$]+)$', text)
+        return match.group(1) if match else ''
+
+    def _emit(self, text):
+        if self.pending_newline and self.out and self._last() not in '{;,([' and text[0] not in '}]),.':
+            # Anywhere else a line break may end a statement
+            self.out.append('\n')
+        elif self.pending_space:
+            last, first = self._last(), text[0]
+            # Keep a space only where removing it would join two tokens
+            if (_WORD_CHAR.match(last) and _WORD_CHAR.match(first)) or (last == first and last in '+-'):
+                self.out.append(' ')
+        self.pending_space = self.pending_newline = False
+        self.out.append(text)
+
+    def _quoted(self, start):
+        """Index just past the string starting at start"""
+        quote, i = self.src[start], start + 1
+        while self.src[i] != quote:
+            i += 2 if self.src[i] == '\\' else 1
+        return i + 1
+
+    def _template(self, start):
+        """Index just past the template literal starting at start, including nested ones"""
+        i = start + 1
+        while self.src[i] != '`':
+            if self.src[i] == '\\':
+                i += 2
+            elif self.src.startswith('${', i):
+                i = self._template_expression(i + 2)
+            else:
+                i += 1
+        return i + 1
+
+    def _template_expression(self, i):
+        depth = 1
+        while depth:
+            char = self.src[i]
+            if char in '\'"':
+                i = self._quoted(i)
+                continue
+            if char == '`':
+                i = self._template(i)
+                continue
+            depth += {'{': 1, '}': -1}.get(char, 0)
+            i += 1
+        return i
+
+    def _regex(self, start):
+        i, in_class = start + 1, False
+        while in_class or self.src[i] != '/':
+            char = self.src[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '\n':
+                raise ValueError(f"Unterminated regular expression at offset {start}")
+            in_class = (in_class and char != ']') or char == '['
+            i += 1
+        i += 1
+        while i < len(self.src) and _WORD_CHAR.match(self.src[i]):
+            i += 1  # Flags
+        return i
+
+    def _regex_allowed(self):
+        last = self._last()
+        if not last:
+            return True
+        if _WORD_CHAR.match(last):
+            return self._last_word() in _REGEX_KEYWORDS
+        return last not in ')]'
+
+    def minify(self):
+        src, length = self.src, len(self.src)
+        while self.pos < length:
+            char = src[self.pos]
+            if char in ' \t\r\n':
+                end = self.pos
+                while end < length and src[end] in ' \t\r\n':
+                    end += 1
+                if '\n' in src[self.pos:end]:
+                    self.pending_newline = True
+                else:
+                    self.pending_space = True
+                self.pos = end
+            elif src.startswith('//', self.pos):
+                end = src.find('\n', self.pos)
+                self.pos = length if end == -1 else end
+            elif src.startswith('/*', self.pos):
+                end = src.index('*/', self.pos + 2) + 2
+                if '\n' in src[self.pos:end]:
+                    self.pending_newline = True
+                else:
+                    self.pending_space = True
+                self.pos = end
+            elif char in '\'"':
+                end = self._quoted(self.pos)
+                self._emit(src[self.pos:end])
+                self.pos = end
+            elif char == '`':
+                end = self._template(self.pos)
+                self._emit(src[self.pos:end])
+                self.pos = end
+            elif char == '/' and self._regex_allowed():
+                end = self._regex(self.pos)
+                self._emit(src[self.pos:end])
+                self.pos = end
+            else:
+                end = self.pos + 1
+                if _WORD_CHAR.match(char):
+                    while end < length and _WORD_CHAR.match(src[end]):
+                        end += 1
+                self._emit(src[self.pos:end])
+                self.pos = end
+        return ''.join(self.out) + '\n'
+
+def minify_js(source):
+    return _JsMinifier(source).minify()
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)|(\s+)', re.S)
+
+def minify_css(source):
+    """Drop comments and collapse whitespace in CSS, leaving strings alone"""
+    def replace(match):
+        string, comment, space = match.groups()
+        if string:
+            return string
+        return '' if comment else ' '
+    css = _CSS_TOKENS.sub(replace, source)
+    # Spaces next to these never matter; ':' is left alone since 'a :hover' differs from 'a:hover'
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)
+    for index in range(0, len(parts), 2):
+        parts[index] = re.sub(r'\s*([{};,>])\s*', r'\1', parts[index]).replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+def fingerprint(name, data):
+    """'js/app.js' -> 'js/app.<content hash>.js'"""
+    base, ext = os.path.splitext(name)
+    return f"{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+def write_output(build_dir, name, data, manifest):
+    """Write data under its fingerprinted name plus precompressed copies, recording them in the manifest"""
+    output = fingerprint(name, data)
+    path = os.path.join(build_dir, output)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    manifest['assets'][name] = output
+
+    if not output.endswith(PRECOMPRESSED_SUFFIXES):
+        return
+    variants = []
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+        variants.append('br')
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    variants.append('gzip')
+    manifest['encodings'][output] = variants
+
+def build(static_dir=STATIC_DIR, build_dir=BUILD_DIR, minify=True):
+    """Bundle, minify, fingerprint and precompress the static assets into build_dir.
+
+    Files in IN_PLACE_DIRS are only given a fingerprinted name in the
+    manifest; they are served from static/ rather than copied.
+    Returns the manifest that was written.
+    """
+    if os.path.isdir(build_dir):
+        shutil.rmtree(build_dir)
+    os.makedirs(build_dir)
+    manifest = {'assets': {}, 'encodings': {}, 'in_place': {}, 'source_digest': source_digest(static_dir)}
+
+    for name, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(static_dir, source), encoding='utf-8') as f:
+                parts.append(f.read())
+        # The semicolon keeps one file's last statement from running into the next
+        text = '\n;\n'.join(parts) if name.endswith('.js') else '\n'.join(parts)
+        minifier = MINIFIERS.get(os.path.splitext(name)[1])
+        if minify and minifier:
+            text = minifier(text)
+        data = text.encode('utf-8')
+        write_output(build_dir, name, data, manifest)
+        logger.info(f"{name}: {len(sources)} files, {sum(len(p.encode('utf-8')) for p in parts)} -> {len(data)} bytes")
+
+    for name in in_place_files(static_dir):
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            output = fingerprint(name, f.read())
+        manifest['assets'][name] = output
+        manifest['in_place'][output] = name
+
+    with open(os.path.join(build_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def is_current(static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """True when build_dir holds a build of the current static/ sources"""
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return manifest.get('source_digest') == source_digest(static_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted, minified and precompressed static assets")
+    parser.add_argument('--no-minify', action='store_true', help="Bundle and fingerprint without minifying")
+    parser.add_argument('--check', action='store_true', help="Only exit non-zero if the committed build is out of date")
+    args = parser.parse_args()
+
+    if args.check:
+        if not is_current():
+            logger.error(f"{os.path.relpath(BUILD_DIR)} is out of date; run python build_assets.py and commit it")
+            sys.exit(1)
+        print(f"{os.path.relpath(BUILD_DIR)} is up to date")
+        return
+
+    try:
+        manifest = build(minify=not args.no_minify)
+    except (OSError, ValueError) as e:
+        logger.error(f"Asset build failed: {e}")
+        sys.exit(1)
+
+    if brotli is None:
+        logger.info("brotli is not installed; wrote gzip copies only")
+    print(f"\nWrote {len(manifest['assets'])} assets and {MANIFEST_NAME} to {os.path.relpath(BUILD_DIR)}")
+
+if __name__ == "__main__":
+    main()
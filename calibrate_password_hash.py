@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import logging
+from services.password_service import PasswordService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# OWASP's floor for Argon2id is 19 MiB with two iterations
+MIN_MEMORY_KIB = 19 * 1024
+MAX_TIME_COST = 10
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Median time of one PasswordService.verify_password call with these costs."""
+    service = PasswordService(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    password_hash, salt = service.hash_password('calibration-password')
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        service.verify_password('calibration-password', password_hash, salt)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def calibrate(target_ms: float, memory_kib: int, parallelism: int, samples: int) -> dict:
+    """Find the costs that use the most memory, then the most iterations, within target_ms.
+
+    Memory is halved until a single iteration fits the latency target, then
+    iterations are added while they still fit.
+    """
+    time_cost = 1
+    elapsed = measure_verify_ms(time_cost, memory_kib, parallelism, samples)
+    logger.info(f"t={time_cost} m={memory_kib // 1024} MiB p={parallelism}: {elapsed:.0f} ms")
+    while elapsed > target_ms and memory_kib > MIN_MEMORY_KIB:
+        memory_kib = max(memory_kib // 2, MIN_MEMORY_KIB)
+        elapsed = measure_verify_ms(time_cost, memory_kib, parallelism, samples)
+        logger.info(f"t={time_cost} m={memory_kib // 1024} MiB p={parallelism}: {elapsed:.0f} ms")
+
+    while time_cost < MAX_TIME_COST:
+        candidate = measure_verify_ms(time_cost + 1, memory_kib, parallelism, samples)
+        logger.info(f"t={time_cost + 1} m={memory_kib // 1024} MiB p={parallelism}: {candidate:.0f} ms")
+        if candidate > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+
+    if elapsed > target_ms:
+        logger.warning(f"Even the minimum cost takes {elapsed:.0f} ms, above the {target_ms:.0f} ms target")
+
+    return {
+        'PASSWORD_HASH_TIME_COST': time_cost,
+        'PASSWORD_HASH_MEMORY_COST': memory_kib,
+        'PASSWORD_HASH_PARALLELISM': parallelism,
+        'verify_ms': elapsed,
+    }
+
+def write_env_file(path: str, values: dict) -> None:
+    """Set KEY=value lines in a dotenv file, replacing existing keys and keeping everything else."""
+    lines = []
+    if os.path.exists(path):
+        with open(path) as f:
+            lines = f.read().splitlines()
+
+    remaining = dict(values)
+    for index, line in enumerate(lines):
+        key = line.split('=', 1)[0].strip()
+        if key in remaining:
+            lines[index] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit Argon2 password hashing costs to this host")
+    parser.add_argument('--target-ms', type=float, default=250, help="Median verify time to stay under")
+    parser.add_argument('--memory-budget-mb', type=int, default=256, help="Memory all concurrent hashes may use together")
+    parser.add_argument('--concurrency', type=int, default=4, help="Hashes expected to run at the same time")
+    parser.add_argument('--parallelism', type=int, default=min(os.cpu_count() or 1, 4), help="Argon2 lanes (defaults to the CPU count, at most 4)")
+    parser.add_argument('--samples', type=int, default=5, help="Verifications timed per candidate")
+    parser.add_argument('--write', nargs='?', const='.env', metavar='ENV_FILE', help="Write the result to a dotenv file (default .env)")
+    args = parser.parse_args()
+
+    memory_kib = args.memory_budget_mb * 1024 // max(args.concurrency, 1)
+    if memory_kib < MIN_MEMORY_KIB:
+        print(f"A {args.memory_budget_mb} MB budget allows under 19 MiB per hash at concurrency {args.concurrency}; "
+              f"raise the budget or lower the concurrency.")
+        sys.exit(1)
+
+    try:
+        result = calibrate(args.target_ms, memory_kib, max(args.parallelism, 1), args.samples)
+    except KeyboardInterrupt:
+        logger.info("\nOperation cancelled by user")
+        sys.exit(0)
+
+    verify_ms = result.pop('verify_ms')
+    memory_mib = result['PASSWORD_HASH_MEMORY_COST'] / 1024
+    print(f"\nVerify takes {verify_ms:.0f} ms and {memory_mib:.0f} MiB; "
+          f"{args.concurrency} at once use {memory_mib * args.concurrency:.0f} MiB")
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+    if args.write:
+        write_env_file(args.write, result)
+        print(f"\nWrote settings to {args.write}. Existing hashes are upgraded as users log in.")
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,75 @@
 import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from flask_sqlalchemy import SQLAlchemy
 import logging
 from sqlalchemy import inspect
+from sqlalchemy.pool import NullPool
 
 logger = logging.getLogger(__name__)
 db = SQLAlchemy()
 
+POOL_MODES = ('queue', 'null')
+
+def database_url(config):
+    """Return the connection URL, preferring the pooled (pgbouncer) URL when enabled."""
+    url = config.get('SQLALCHEMY_DATABASE_URI')
+    if config.get('DB_USE_POOLER') and config.get('POSTGRES_POOLED_URL'):
+        url = config['POSTGRES_POOLED_URL']
+    url = url.replace('postgres://', 'postgresql://', 1)
+
+    # Pooled URLs often carry pgbouncer=true for other clients; libpq rejects it
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'pgbouncer']
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def engine_options(config):
+    """Build SQLAlchemy engine options for the configured pool mode.
+
+    queue keeps a bounded pool of connections for long-running servers; null
+    opens a connection per checkout and closes it after, which suits
+    serverless functions, ideally pointed at a pgbouncer URL.
+    """
+    mode = config.get('DB_POOL_MODE', 'queue')
+    connect_args = {'connect_timeout': config.get('DB_CONNECT_TIMEOUT', 10)}
+
+    if mode == 'null':
+        return {'poolclass': NullPool, 'connect_args': connect_args}
+    if mode != 'queue':
+        raise ValueError(f"Unknown DB_POOL_MODE '{mode}', expected one of {', '.join(POOL_MODES)}")
+
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 300),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'connect_args': connect_args,
+    }
+
 def init_db(app):
     """Initialize database without recreating existing tables."""
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url(app.config)
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)
+
+    if app.config.get('DB_SKIP_SCHEMA_CHECK'):
+        # Saves a connection and a catalog query on every cold start; run init_db.py once instead
+        logger.info("Skipping startup schema check")
+        return
+
     with app.app_context():
         try:
             # Check if tables exist before creating
             inspector = inspect(db.engine)
             existing_tables = inspector.get_table_names()
-            
+
             if not existing_tables:
                 logger.info("No tables found, creating initial schema...")
                 db.create_all()
                 logger.info("Database schema created successfully!")
             else:
                 logger.info("Database tables already exist, skipping initialization")
-                
+
         except Exception as e:
             logger.error(f"Error checking database: {e}")
             # Don't raise the error, just log it
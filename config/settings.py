@@ -12,6 +12,7 @@ class Config:
 
     # Database settings
     POSTGRES_URL = os.getenv('POSTGRES_URL_NON_POOLING')
+    POSTGRES_POOLED_URL = os.getenv('POSTGRES_URL')  # pgbouncer endpoint, e.g. Vercel's pooled URL
     POSTGRES_USER = os.getenv('POSTGRES_USER')
     POSTGRES_PASSWORD = os.getenv('POSTGRES_PASSWORD')
     POSTGRES_HOST = os.getenv('POSTGRES_HOST')
@@ -19,15 +20,104 @@ class Config:
 
     # AI Service settings
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    AI_BACKEND = os.getenv('AI_BACKEND', 'gemini')                   # gemini, replay or synthetic
+    AI_RECORD_PATH = os.getenv('AI_RECORD_PATH')                     # Append every response to this replay file
+    AI_REPLAY_PATH = os.getenv('AI_REPLAY_PATH')                     # Recording served by the replay backend
+    AI_SYNTHETIC_LATENCY = float(os.getenv('AI_SYNTHETIC_LATENCY', 0.5))          # Seconds per synthetic response
+    AI_SYNTHETIC_TRUNCATE_RATE = float(os.getenv('AI_SYNTHETIC_TRUNCATE_RATE', 0.1))  # Fraction cut off mid-response
+    AI_SYNTHETIC_MALFORMED_RATE = float(os.getenv('AI_SYNTHETIC_MALFORMED_RATE', 0.2))  # Fraction with broken JSON
+    GEMINI_BASE_URL = os.getenv('GEMINI_BASE_URL')                   # Override the API endpoint, e.g. a local fake server
+    AI_DEADLINE = float(os.getenv('AI_DEADLINE', 90))                 # Seconds a generation call may take, retries included
+    AI_ATTEMPT_TIMEOUT = float(os.getenv('AI_ATTEMPT_TIMEOUT', 0))   # Seconds per attempt, 0 for the remaining deadline
+    AI_MAX_ATTEMPTS = int(os.getenv('AI_MAX_ATTEMPTS', 3))            # Attempts per call on retryable errors
+    AI_BACKOFF_BASE = float(os.getenv('AI_BACKOFF_BASE', 0.5))        # Seconds, doubled per attempt with full jitter
+    AI_BACKOFF_MAX = float(os.getenv('AI_BACKOFF_MAX', 8))            # Cap on a single backoff
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', 4))      # Calls in flight per process
+    AI_RATE_LIMIT_PER_MINUTE = float(os.getenv('AI_RATE_LIMIT_PER_MINUTE', 0))  # Requests per minute, 0 for no limit
+    AI_HEDGE_DELAY = float(os.getenv('AI_HEDGE_DELAY', 0))            # Seconds before sending a hedged duplicate, 0 disables
+
+    # Quiz generation settings
+    QUIZ_BATCH_SIZE = int(os.getenv('QUIZ_BATCH_SIZE', 10))          # Questions per generation call
+    QUIZ_MAX_WORKERS = int(os.getenv('QUIZ_MAX_WORKERS', 4))         # Concurrent generation calls
+    QUIZ_MAX_TOPUP_ROUNDS = int(os.getenv('QUIZ_MAX_TOPUP_ROUNDS', 2))  # Follow-up rounds to fill shortfalls
+
+    # Question pool settings
+    QUESTION_POOL_TOPICS = [t.strip() for t in os.getenv('QUESTION_POOL_TOPICS', '').split(',') if t.strip()]
+    QUESTION_POOL_TARGET = int(os.getenv('QUESTION_POOL_TARGET', 50))        # Stock to refill up to
+    QUESTION_POOL_LOW_WATER = int(os.getenv('QUESTION_POOL_LOW_WATER', 20))  # Refill when stock drops below
+    QUESTION_POOL_REFILL_INTERVAL = int(os.getenv('QUESTION_POOL_REFILL_INTERVAL', 300))  # Seconds between checks
+    QUESTION_POOL_BACKGROUND = os.getenv('QUESTION_POOL_BACKGROUND', 'false').lower() == 'true'
+
+    # Analytics write-behind settings (for long-running servers, not serverless)
+    ANALYTICS_WRITE_BEHIND = os.getenv('ANALYTICS_WRITE_BEHIND', 'false').lower() == 'true'
+    ANALYTICS_FLUSH_SIZE = int(os.getenv('ANALYTICS_FLUSH_SIZE', 200))          # Events per flush
+    ANALYTICS_FLUSH_INTERVAL = float(os.getenv('ANALYTICS_FLUSH_INTERVAL', 5))  # Seconds between flushes
+    ANALYTICS_MAX_PENDING = int(os.getenv('ANALYTICS_MAX_PENDING', 10000))      # Buffered events before new answers are dropped
+    ANALYTICS_MAX_BATCH = int(os.getenv('ANALYTICS_MAX_BATCH', 100))           # Answers accepted per batch request
+    ANALYTICS_RECONCILE_INTERVAL = int(os.getenv('ANALYTICS_RECONCILE_INTERVAL', 3600))  # Seconds between reconcile_analytics.py --loop runs
+    ANALYTICS_PAGE_SIZE = int(os.getenv('ANALYTICS_PAGE_SIZE', 50))            # Dashboard rows per page
+    ANALYTICS_MAX_PAGE_SIZE = int(os.getenv('ANALYTICS_MAX_PAGE_SIZE', 500))   # Largest page a client may request
+
+    # AI response cache settings
+    AI_CACHE_BACKEND = os.getenv('AI_CACHE_BACKEND', 'memory')       # memory, sqlite or none
+    AI_CACHE_PATH = os.getenv('AI_CACHE_PATH', '/tmp/triviabyte_ai_cache.sqlite3')
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 86400))             # Seconds before an entry expires
+    AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', 256))  # LRU size bound
+
+    # Question deduplication settings
+    QUESTION_DEDUPE_ENABLED = os.getenv('QUESTION_DEDUPE_ENABLED', 'true').lower() == 'true'
+    QUESTION_DEDUPE_THRESHOLD = float(os.getenv('QUESTION_DEDUPE_THRESHOLD', 0.7))         # Estimated similarity treated as a duplicate
+    QUESTION_DEDUPE_REFRESH_INTERVAL = int(os.getenv('QUESTION_DEDUPE_REFRESH_INTERVAL', 60))  # Seconds between checks for new questions
+    QUESTION_DEDUPE_REFRESH_OVERLAP = int(os.getenv('QUESTION_DEDUPE_REFRESH_OVERLAP', 1000))  # Ids below the newest re-read per refresh, for late commits
+
+    # Play-mode question cache settings
+    QUESTION_CACHE_ENABLED = os.getenv('QUESTION_CACHE_ENABLED', 'true').lower() == 'true'  # Sample /random-questions from memory
+    QUESTION_CACHE_CHECK_INTERVAL = float(os.getenv('QUESTION_CACHE_CHECK_INTERVAL', 5))  # Seconds between question version checks
+    QUESTION_CACHE_MAX_MB = int(os.getenv('QUESTION_CACHE_MAX_MB', 64))     # Memory for cached questions; larger banks fall back to SQL
+
+    # Connection pool settings
+    DB_USE_POOLER = os.getenv('DB_USE_POOLER', 'false').lower() == 'true'  # Connect through POSTGRES_POOLED_URL
+    DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'queue')                # queue (long-running) or null (serverless)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))                 # Connections kept open in queue mode
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))          # Extra connections allowed under load
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 300))         # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'  # Test connections on checkout
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 10))    # Seconds to wait for a new connection
+    DB_SKIP_SCHEMA_CHECK = os.getenv('DB_SKIP_SCHEMA_CHECK', 'false').lower() == 'true'  # Skip the table probe at startup
+
+    # Metrics settings
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # Time requests, SQL, AI calls and hashing
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')                       # Bearer token for scrapers; admins can always read /metrics
+
+    # Response compression settings
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'  # Compress text responses as the client accepts
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))    # Bytes; smaller responses are sent as they are
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))   # 1 (fastest) to 9 (smallest)
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))  # 0 to 11; used when brotli is installed
+
+    # Static asset settings
+    ASSETS_BUNDLED = os.getenv('ASSETS_BUNDLED', 'true').lower() == 'true'  # Serve build_assets.py output when it exists
 
     # Flask-SQLAlchemy settings
     SQLALCHEMY_DATABASE_URI = POSTGRES_URL.replace('postgres://', 'postgresql://')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     # Security settings
+    ADMIN_AUTH_TTL = int(os.getenv('ADMIN_AUTH_TTL', 60))  # Seconds admin session claims are trusted without a DB check
     PEPPER = os.getenv('PEPPER')  # Change in production
-    PASSWORD_HASH_TIME_COST = 2      # Number of iterations
-    PASSWORD_HASH_MEMORY_COST = 102400  # Memory usage in KiB
-    PASSWORD_HASH_PARALLELISM = 8    # Number of parallel threads
+    # Argon2 cost; run calibrate_password_hash.py to fit these to the host
+    PASSWORD_HASH_TIME_COST = int(os.getenv('PASSWORD_HASH_TIME_COST', 2))        # Number of iterations
+    PASSWORD_HASH_MEMORY_COST = int(os.getenv('PASSWORD_HASH_MEMORY_COST', 102400))  # Memory usage in KiB
+    PASSWORD_HASH_PARALLELISM = int(os.getenv('PASSWORD_HASH_PARALLELISM', 8))    # Number of parallel threads
     PASSWORD_HASH_LENGTH = 32        # Length of the hash in bytes
     PASSWORD_SALT_LENGTH = 16        # Length of the salt in bytes
+
+    # Login admission control
+    HASH_MEMORY_BUDGET_MB = int(os.getenv('HASH_MEMORY_BUDGET_MB', 256))     # Memory concurrent Argon2 hashes may use together
+    HASH_MAX_QUEUE = int(os.getenv('HASH_MAX_QUEUE', 8))                     # Logins waiting for a hash slot before 503s
+    HASH_QUEUE_TIMEOUT = float(os.getenv('HASH_QUEUE_TIMEOUT', 5))           # Seconds a login may wait for a hash slot
+    LOGIN_IP_LIMIT = int(os.getenv('LOGIN_IP_LIMIT', 20))                    # Login attempts per client IP per window, 0 disables
+    LOGIN_IP_WINDOW = int(os.getenv('LOGIN_IP_WINDOW', 60))                  # Seconds
+    LOGIN_USER_FAILURE_LIMIT = int(os.getenv('LOGIN_USER_FAILURE_LIMIT', 5))  # Failed logins per username per window, 0 disables
+    LOGIN_USER_WINDOW = int(os.getenv('LOGIN_USER_WINDOW', 900))             # Seconds
+    PROXY_COUNT = int(os.getenv('PROXY_COUNT', 0))                           # Trusted proxies setting X-Forwarded-For (1 on Vercel)
@@ -10,7 +10,8 @@ from dotenv import load_dotenv
 from config.database import db
 from models.user import User
 from models.quiz import Question
-from models.analytics import QuestionAnalytics
+from models.analytics import QuestionAnalytics, AnalyticsSummary
+from models.data_version import DataVersion
 from flask import Flask
 import logging
 
@@ -45,7 +46,7 @@ def init_db():
             logger.info("Creating database tables...")
             
             # Create tables in correct order
-            models = [User, Question, QuestionAnalytics]
+            models = [User, Question, QuestionAnalytics, AnalyticsSummary, DataVersion]
             for model in models:
                 model.__table__.create(db.engine, checkfirst=True)
                 logger.info(f"Created/verified table: {model.__tablename__}")
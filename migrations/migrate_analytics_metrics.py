@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the derived metric columns (attempts,
+accuracy, difficulty, avg_time) to question_analytics as stored generated
+columns, with the indexes used for server-side sorting and keyset pagination
+Run this after updating the QuestionAnalytics model
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.analytics import db, QuestionAnalytics
+from sqlalchemy import text, inspect
+
+COUNTER_COLUMNS = ['correct_count', 'wrong_count', 'total_score']
+GENERATED_COLUMNS = {
+    'attempts': 'INTEGER',
+    'accuracy': 'DOUBLE PRECISION',
+    'difficulty': 'DOUBLE PRECISION',
+    'avg_time': 'DOUBLE PRECISION',
+}
+
+def migrate_database():
+    """Make the counters NOT NULL, add the generated columns and index every sort key"""
+    with app.app_context():
+        try:
+            table = QuestionAnalytics.__table__
+            columns = {c['name'] for c in inspect(db.engine).get_columns('question_analytics')}
+            with db.engine.begin() as conn:
+                for name in COUNTER_COLUMNS:
+                    conn.execute(text(f'UPDATE question_analytics SET {name} = 0 WHERE {name} IS NULL'))
+                    conn.execute(text(f"ALTER TABLE question_analytics ALTER COLUMN {name} SET DEFAULT 0"))
+                    conn.execute(text(f'ALTER TABLE question_analytics ALTER COLUMN {name} SET NOT NULL'))
+                print("Backfilled and constrained analytics counters")
+
+                for name, sql_type in GENERATED_COLUMNS.items():
+                    if name in columns:
+                        print(f"{name} already exists")
+                        continue
+                    expression = table.c[name].computed.sqltext.text
+                    conn.execute(text(
+                        f'ALTER TABLE question_analytics ADD COLUMN {name} {sql_type} GENERATED ALWAYS AS ({expression}) STORED'
+                    ))
+                    print(f"Added generated column {name}")
+
+                for index in table.indexes:
+                    if index.unique:
+                        continue
+                    column_list = ', '.join(column.name for column in index.columns)
+                    conn.execute(text(f'CREATE INDEX IF NOT EXISTS {index.name} ON question_analytics ({column_list})'))
+                conn.execute(text('ANALYZE question_analytics'))
+                print("Created sort indexes on question_analytics")
+        except Exception as e:
+            print(f"Error adding analytics metric columns: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
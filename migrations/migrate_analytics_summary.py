@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Database migration script to create the analytics_summary table and fill it
+from the existing question_analytics rows
+Run this after updating the analytics models
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.analytics import db, AnalyticsSummary
+
+def migrate_database():
+    """Create analytics_summary and compute its initial totals"""
+    with app.app_context():
+        try:
+            AnalyticsSummary.__table__.create(db.engine, checkfirst=True)
+            print("Created analytics_summary table")
+            AnalyticsSummary.reconcile()
+            totals = AnalyticsSummary.read()
+            print(f"Summarized {totals['questions']} questions, "
+                  f"{totals['correct_count'] + totals['wrong_count']} attempts")
+        except Exception as e:
+            print(f"Error creating analytics summary: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Database migration script to replace question_analytics.avg_time_taken with a
+running total_time_taken, then enforce one analytics row per question
+Run this after updating the QuestionAnalytics model
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.analytics import db
+from sqlalchemy import text, inspect
+from migrate_analytics_unique import migrate_database as migrate_unique_index
+
+def migrate_database():
+    """Convert the float average into a summed total, then dedupe and index"""
+    with app.app_context():
+        try:
+            columns = {c['name'] for c in inspect(db.engine).get_columns('question_analytics')}
+            with db.engine.begin() as conn:
+                if 'total_time_taken' not in columns:
+                    conn.execute(text(
+                        'ALTER TABLE question_analytics ADD COLUMN total_time_taken DOUBLE PRECISION NOT NULL DEFAULT 0'
+                    ))
+                    print("Added total_time_taken column to question_analytics table")
+
+                if 'avg_time_taken' in columns:
+                    result = conn.execute(text("""
+                        UPDATE question_analytics
+                        SET total_time_taken = COALESCE(avg_time_taken, 0)
+                            * (COALESCE(correct_count, 0) + COALESCE(wrong_count, 0))
+                    """))
+                    conn.execute(text('ALTER TABLE question_analytics DROP COLUMN avg_time_taken'))
+                    print(f"Converted average time to totals for {result.rowcount} rows")
+                else:
+                    print("avg_time_taken already removed")
+        except Exception as e:
+            print(f"Error converting question_analytics totals: {e}")
+            return
+
+    migrate_unique_index()
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
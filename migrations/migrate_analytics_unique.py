@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Database migration script to merge duplicate question_analytics rows and add
+a unique index on question_id, required for upsert-based answer logging
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.analytics import db
+from sqlalchemy import text, inspect
+
+def migrate_database():
+    """Fold duplicate rows into the oldest one per question, then add the unique index"""
+    with app.app_context():
+        try:
+            columns = {c['name'] for c in inspect(db.engine).get_columns('question_analytics')}
+            if 'total_time_taken' in columns:
+                time_select = 'SUM(total_time_taken) AS total_time_taken'
+                time_update = 'total_time_taken = m.total_time_taken'
+            else:
+                time_select = ('SUM(avg_time_taken * (correct_count + wrong_count)) '
+                               '/ NULLIF(SUM(correct_count + wrong_count), 0) AS avg_time_taken')
+                time_update = 'avg_time_taken = COALESCE(m.avg_time_taken, 0)'
+
+            with db.engine.begin() as conn:
+                conn.execute(text('LOCK TABLE question_analytics IN SHARE ROW EXCLUSIVE MODE'))
+                merged = conn.execute(text(f"""
+                    WITH merged AS (
+                        SELECT question_id,
+                               MIN(id) AS keep_id,
+                               SUM(correct_count) AS correct_count,
+                               SUM(wrong_count) AS wrong_count,
+                               SUM(total_score) AS total_score,
+                               {time_select}
+                        FROM question_analytics
+                        WHERE question_id IS NOT NULL
+                        GROUP BY question_id
+                        HAVING COUNT(*) > 1
+                    )
+                    UPDATE question_analytics qa
+                    SET correct_count = m.correct_count,
+                        wrong_count = m.wrong_count,
+                        total_score = m.total_score,
+                        {time_update}
+                    FROM merged m
+                    WHERE qa.id = m.keep_id
+                """))
+                deleted = conn.execute(text("""
+                    DELETE FROM question_analytics qa
+                    USING question_analytics keep
+                    WHERE qa.question_id = keep.question_id AND qa.id > keep.id
+                """))
+                conn.execute(text(
+                    'CREATE UNIQUE INDEX IF NOT EXISTS ux_question_analytics_question_id ON question_analytics (question_id)'
+                ))
+            print(f"Merged duplicates for {merged.rowcount} questions, removed {deleted.rowcount} rows")
+            print("Added unique index on question_analytics.question_id")
+        except Exception as e:
+            print(f"Error migrating question_analytics: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the data version counter to analytics_summary
+Run this after updating the analytics models
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.analytics import db
+from sqlalchemy import text, inspect
+
+def migrate_database():
+    """Add analytics_summary.version, which ETags on the analytics API are built from"""
+    with app.app_context():
+        try:
+            columns = {c['name'] for c in inspect(db.engine).get_columns('analytics_summary')}
+            if 'version' in columns:
+                print("version already exists")
+                return
+            with db.engine.begin() as conn:
+                conn.execute(text('ALTER TABLE analytics_summary ADD COLUMN version BIGINT NOT NULL DEFAULT 0'))
+            print("Added version to analytics_summary")
+        except Exception as e:
+            print(f"Error adding analytics version: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the auth_version column used to revoke
+cached admin session claims
+Run this after updating the User model
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.user import db
+from sqlalchemy import text
+
+def migrate_database():
+    """Add auth_version to users with a default of 0"""
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text('ALTER TABLE users ADD COLUMN IF NOT EXISTS auth_version INTEGER NOT NULL DEFAULT 0'))
+                conn.commit()
+            print("Added auth_version column to users table")
+        except Exception as e:
+            print(f"Error adding auth_version column: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
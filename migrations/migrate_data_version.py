@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Database migration script to create the data_versions table used to tell
+question caches when the question bank has changed
+Run this after updating the models
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.data_version import db, DataVersion, QUESTIONS
+
+def migrate_database():
+    """Create data_versions and start the question bank's version at 1"""
+    with app.app_context():
+        try:
+            DataVersion.__table__.create(db.engine, checkfirst=True)
+            print("Created data_versions table")
+            DataVersion.bump(QUESTIONS)
+            db.session.commit()
+            print(f"Question bank version is {DataVersion.get(QUESTIONS)}")
+        except Exception as e:
+            print(f"Error creating data_versions: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
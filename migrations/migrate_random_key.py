@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the random_key sampling column to questions
+Run this after updating the Question model
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.quiz import db
+from sqlalchemy import text
+
+def migrate_database():
+    """Add random_key with a random default, backfill it and index it by difficulty"""
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                # A volatile default gives every existing row its own random value
+                conn.execute(text('ALTER TABLE questions ADD COLUMN IF NOT EXISTS random_key DOUBLE PRECISION NOT NULL DEFAULT random()'))
+                conn.execute(text('CREATE INDEX IF NOT EXISTS ix_questions_difficulty_random_key ON questions (difficulty, random_key)'))
+                conn.commit()
+            print("Added random_key column and index to questions table")
+        except Exception as e:
+            print(f"Error adding random_key column: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the topic field used by the question pool
+Run this after updating the Question model
+"""
+
+import sys
+import os
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app import app
+from models.quiz import db
+from sqlalchemy import text
+
+def migrate_database():
+    """Add topic column and an index for per-topic stock counts"""
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text('ALTER TABLE questions ADD COLUMN IF NOT EXISTS topic VARCHAR(200)'))
+                conn.execute(text('CREATE INDEX IF NOT EXISTS ix_questions_topic_difficulty ON questions (topic, difficulty)'))
+                conn.commit()
+            print("Added topic column and index to questions table")
+        except Exception as e:
+            print(f"Error adding topic column: {e}")
+
+if __name__ == "__main__":
+    print("Running database migration...")
+    migrate_database()
+    print("Migration completed!")
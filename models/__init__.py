@@ -1,4 +1,6 @@
 from .user import User
 from .quiz import Question
+from .analytics import QuestionAnalytics, AnalyticsSummary
+from .data_version import DataVersion
 
-__all__ = ['User', 'Question']
\ No newline at end of file
+__all__ = ['User', 'Question', 'QuestionAnalytics', 'AnalyticsSummary', 'DataVersion']
@@ -1,81 +1,460 @@
 from config.database import db
 from datetime import datetime
-from sqlalchemy import func
+import base64
+import json
+import random
+from flask import current_app
+from sqlalchemy import func, tuple_, literal_column, text
+from sqlalchemy.dialects.postgresql import insert
+
+# Derived metrics are stored generated columns so they can be indexed, sorted
+# and filtered in SQL. Generated columns cannot reference each other, so each
+# expression repeats the attempts sum.
+_ATTEMPTS_SQL = '(correct_count + wrong_count)'
+
+# Average answer time bands, in seconds, for the dashboard's response time chart
+TIME_BANDS = [(0, 7.5), (7.5, 15), (15, 22.5), (22.5, 30)]
+
+# Striped summary rows; writers pick one at random so they rarely contend
+SUMMARY_SLOTS = 8
+
+def _time_band(total_time, attempts):
+    """Index of the TIME_BANDS entry holding this average time, or None"""
+    average = total_time / attempts if attempts > 0 else 0
+    for index, (low, high) in enumerate(TIME_BANDS):
+        if low <= average < high:
+            return index
+    return None
+
+_SUMMARY_UPSERT = None
+
+def _summary_upsert():
+    """The slot upsert as text; the postgresql insert() construct is never
+    cached by SQLAlchemy, and compiling it costs more than running it"""
+    global _SUMMARY_UPSERT
+    if _SUMMARY_UPSERT is None:
+        counters = AnalyticsSummary.COUNTERS
+        _SUMMARY_UPSERT = text(
+            f"INSERT INTO analytics_summary (slot, {', '.join(counters)}, version, updated_at) "
+            f"VALUES (:slot, {', '.join(':' + name for name in counters)}, 1, :updated_at) "
+            f"ON CONFLICT (slot) DO UPDATE SET "
+            + ', '.join(f"{name} = analytics_summary.{name} + EXCLUDED.{name}" for name in counters)
+            + ", version = analytics_summary.version + 1, updated_at = EXCLUDED.updated_at"
+        )
+    return _SUMMARY_UPSERT
+
+class AnalyticsSummary(db.Model):
+    """Running totals over question_analytics.
+
+    Each answer upsert adds its deltas to one randomly chosen slot row in
+    the same transaction, so the totals are exact and reading them sums
+    SUMMARY_SLOTS rows however many questions there are. reconcile()
+    recomputes everything from question_analytics into slot 0.
+
+    Every write also bumps its slot's version, so the sum of the versions
+    changes whenever any analytics data does; HTTP validators use it.
+    """
+    __tablename__ = "analytics_summary"
+
+    slot = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    questions = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    correct_count = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    wrong_count = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    total_time_taken = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    total_score = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    # Attempts on questions whose average time falls in each TIME_BANDS entry
+    time_band_0 = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    time_band_1 = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    time_band_2 = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    time_band_3 = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    version = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    COUNTERS = ['questions', 'correct_count', 'wrong_count', 'total_time_taken', 'total_score',
+                'time_band_0', 'time_band_1', 'time_band_2', 'time_band_3']
+
+    @staticmethod
+    def add(deltas, changes):
+        """Fold one upsert into a summary slot.
+
+        deltas are the per-question answer deltas that were applied and
+        changes the rows the upsert returned: question_id, the new attempts
+        and total_time_taken, and whether the row was inserted. A question
+        whose average time crosses a band boundary moves all of its attempts
+        to the new band.
+        """
+        totals = dict.fromkeys(AnalyticsSummary.COUNTERS, 0)
+        for row in changes:
+            delta = deltas[row.question_id]
+            totals['correct_count'] += delta['correct']
+            totals['wrong_count'] += delta['wrong']
+            totals['total_time_taken'] += delta['time_sum']
+            totals['total_score'] += delta['score']
+
+            new_band = _time_band(row.total_time_taken, row.attempts)
+            if new_band is not None:
+                totals[f'time_band_{new_band}'] += row.attempts
+            if row.inserted:
+                totals['questions'] += 1
+                continue
+            old_attempts = row.attempts - delta['correct'] - delta['wrong']
+            old_band = _time_band(row.total_time_taken - delta['time_sum'], old_attempts)
+            if old_band is not None:
+                totals[f'time_band_{old_band}'] -= old_attempts
+
+        db.session.execute(
+            _summary_upsert(),
+            {'slot': random.randrange(SUMMARY_SLOTS), 'updated_at': datetime.utcnow(), **totals}
+        )
+
+    @staticmethod
+    def read():
+        """Sum the slots into one dict of totals"""
+        # SUM(bigint) is numeric in Postgres; cast back so callers get ints, not Decimals
+        result = db.session.query(*[
+            db.cast(func.coalesce(func.sum(column), 0), column.type).label(column.name)
+            for column in (getattr(AnalyticsSummary, name) for name in AnalyticsSummary.COUNTERS)
+        ]).one()
+        return result._asdict()
+
+    @staticmethod
+    def data_version():
+        """(version, last updated) of the analytics data, for ETag and Last-Modified"""
+        version, updated_at = db.session.query(
+            func.coalesce(func.sum(AnalyticsSummary.version), 0),
+            func.max(AnalyticsSummary.updated_at)
+        ).one()
+        return int(version), updated_at
+
+    @staticmethod
+    def reconcile():
+        """Recompute the totals from question_analytics and return the drift that was corrected.
+
+        The summary table is locked against concurrent writers while the
+        totals are recomputed, so an upsert either lands in the recomputed
+        totals or adds its delta after the new row is written, never both.
+        """
+        db.session.execute(text('LOCK TABLE analytics_summary IN SHARE ROW EXCLUSIVE MODE'))
+        before = AnalyticsSummary.read()
+        version, _ = AnalyticsSummary.data_version()
+        after = QuestionAnalytics._aggregate().one()._asdict()
+
+        db.session.query(AnalyticsSummary).delete()
+        # Carry the version over so it never goes backwards
+        db.session.add(AnalyticsSummary(slot=0, version=version + 1, updated_at=datetime.utcnow(), **after))
+        db.session.commit()
+        drift = {name: after[name] - before[name] for name in AnalyticsSummary.COUNTERS}
+        # Float totals pick up rounding differences; only report real drift
+        return {name: value for name, value in drift.items() if abs(value) > 1e-6}
 
 class QuestionAnalytics(db.Model):
     __tablename__ = "question_analytics"
+    __table_args__ = (
+        db.Index('ux_question_analytics_question_id', 'question_id', unique=True),
+        db.Index('ix_question_analytics_accuracy', 'accuracy', 'id'),
+        db.Index('ix_question_analytics_difficulty', 'difficulty', 'id'),
+        db.Index('ix_question_analytics_avg_time', 'avg_time', 'id'),
+        db.Index('ix_question_analytics_attempts', 'attempts', 'id'),
+        db.Index('ix_question_analytics_correct_count', 'correct_count', 'id'),
+        db.Index('ix_question_analytics_total_score', 'total_score', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'))  # Changed from 'question.id' to 'questions.id'
     question_text = db.Column(db.String(500))
-    correct_count = db.Column(db.Integer, default=0)
-    wrong_count = db.Column(db.Integer, default=0)
-    avg_time_taken = db.Column(db.Float, default=0)
-    total_score = db.Column(db.Integer, default=0)
+    correct_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    wrong_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_time_taken = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    total_score = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    attempts = db.Column(db.Integer, db.Computed(_ATTEMPTS_SQL, persisted=True))
+    accuracy = db.Column(db.Float, db.Computed(
+        f"CASE WHEN {_ATTEMPTS_SQL} > 0 THEN correct_count * 100.0 / {_ATTEMPTS_SQL} ELSE 0 END",
+        persisted=True))
+    difficulty = db.Column(db.Float, db.Computed(
+        f"CASE WHEN {_ATTEMPTS_SQL} > 0 THEN wrong_count * 100.0 / {_ATTEMPTS_SQL} ELSE 50 END",
+        persisted=True))
+    avg_time = db.Column(db.Float, db.Computed(
+        f"CASE WHEN {_ATTEMPTS_SQL} > 0 THEN total_time_taken / {_ATTEMPTS_SQL} ELSE 0 END",
+        persisted=True))
+
+    # API sort keys, as used by the dashboard, mapped to their columns
+    SORT_FIELDS = {
+        'accuracy': 'accuracy',
+        'difficulty': 'difficulty',
+        'avg_time_taken': 'avg_time',
+        'engagement': 'attempts',
+        'correct_answers': 'correct_count',
+        'total_score': 'total_score',
+    }
+
+    @property
+    def avg_time_taken(self):
+        attempts = (self.correct_count or 0) + (self.wrong_count or 0)
+        return (self.total_time_taken or 0) / attempts if attempts else 0
+
     @staticmethod
     def log_answer(question_id, question_text, is_correct, time_taken, score):
-        analytics = QuestionAnalytics.query.filter_by(question_id=question_id).first()
-        
-        if not analytics:
-            analytics = QuestionAnalytics(
-                question_id=question_id,
-                question_text=question_text,
-                correct_count=0,
-                wrong_count=0,
-                avg_time_taken=0,
-                total_score=0
-            )
-            db.session.add(analytics)
-
-        if is_correct:
-            analytics.correct_count += 1
-        else:
-            analytics.wrong_count += 1
+        QuestionAnalytics.apply_answer_deltas({
+            question_id: {
+                'question_text': question_text,
+                'correct': 1 if is_correct else 0,
+                'wrong': 0 if is_correct else 1,
+                'time_sum': time_taken,
+                'score': score
+            }
+        })
+
+    @staticmethod
+    def log_answers(answers):
+        """Log a batch of answers (e.g. a whole game round) in one transaction.
+
+        Each answer is a dict with question_id, is_correct, time_taken, score
+        and an optional question_text, which is looked up when omitted.
+        """
+        deltas = QuestionAnalytics.aggregate_answers(answers)
+        QuestionAnalytics.apply_answer_deltas(deltas)
+        return len(answers)
 
-        # Update average time taken
-        total_attempts = analytics.correct_count + analytics.wrong_count
-        analytics.avg_time_taken = ((analytics.avg_time_taken * (total_attempts - 1)) + time_taken) / total_attempts
-        analytics.total_score += score
+    @staticmethod
+    def _fill_question_texts(deltas):
+        """Look up question text for deltas sent without it, in one query"""
+        missing_text = [qid for qid, delta in deltas.items() if not delta['question_text']]
+        if not missing_text:
+            return
+
+        from models.quiz import Question
+        texts = dict(
+            db.session.query(Question.id, Question.question)
+            .filter(Question.id.in_(missing_text)).all()
+        )
+        for question_id in missing_text:
+            text = texts.get(question_id)
+            deltas[question_id]['question_text'] = text[:500] if text else None
+
+    @staticmethod
+    def aggregate_answers(answers):
+        """Sum answer events into per-question deltas for apply_answer_deltas"""
+        deltas = {}
+        for answer in answers:
+            question_id = answer['question_id']
+            delta = deltas.get(question_id)
+            if delta is None:
+                delta = {'question_text': answer.get('question_text'), 'correct': 0, 'wrong': 0, 'time_sum': 0.0, 'score': 0}
+                deltas[question_id] = delta
 
+            if answer['is_correct']:
+                delta['correct'] += 1
+            else:
+                delta['wrong'] += 1
+            delta['time_sum'] += answer['time_taken']
+            delta['score'] += answer['score']
+        return deltas
+
+    @staticmethod
+    def apply_answer_deltas(deltas):
+        """Apply aggregated answer counts in one atomic upsert.
+
+        deltas maps question_id to a dict with question_text, correct, wrong,
+        time_sum and score accumulated since the last flush. Counters are
+        incremented server-side, so concurrent writers never lose updates.
+        """
+        if not deltas:
+            return
+
+        QuestionAnalytics._fill_question_texts(deltas)
+        rows = [{
+            'question_id': question_id,
+            'question_text': delta['question_text'],
+            'correct_count': delta['correct'],
+            'wrong_count': delta['wrong'],
+            'total_time_taken': delta['time_sum'],
+            'total_score': delta['score'],
+            'created_at': datetime.utcnow()
+        } for question_id, delta in sorted(deltas.items())]  # Fixed order avoids deadlocks
+
+        table = QuestionAnalytics.__table__
+        stmt = insert(table).values(rows)
+        excluded = stmt.excluded
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.question_id],
+            set_={
+                'correct_count': table.c.correct_count + excluded.correct_count,
+                'wrong_count': table.c.wrong_count + excluded.wrong_count,
+                'total_time_taken': table.c.total_time_taken + excluded.total_time_taken,
+                'total_score': table.c.total_score + excluded.total_score,
+                'question_text': func.coalesce(table.c.question_text, excluded.question_text)
+            }
+        ).returning(
+            table.c.question_id,
+            table.c.attempts,
+            table.c.total_time_taken,
+            literal_column('xmax = 0').label('inserted')  # True when the row was inserted, not updated
+        )
+        changes = db.session.execute(stmt).all()
+        AnalyticsSummary.add(deltas, changes)
         db.session.commit()
 
     @staticmethod
-    def get_all_analytics():
-        analytics = QuestionAnalytics.query.all()
-        total_attempts_across_all = sum(a.correct_count + a.wrong_count for a in analytics)
-        
-        return [{
+    def _serialize(item, total_attempts):
+        return {
+            'id': item.id,
+            'question_id': item.question_id,
             'question': item.question_text,
             'correct_answers': item.correct_count,
             'wrong_answers': item.wrong_count,
-            'avg_time_taken': round(item.avg_time_taken, 2),
+            'avg_time_taken': round(item.avg_time, 2),
             'total_score': item.total_score,
-            'accuracy': round((item.correct_count / (item.correct_count + item.wrong_count)) * 100, 1) if (item.correct_count + item.wrong_count) > 0 else 0,
-            'difficulty': round((item.wrong_count / (item.correct_count + item.wrong_count)) * 100, 1) if (item.correct_count + item.wrong_count) > 0 else 50,
-            'engagement': item.correct_count + item.wrong_count,  # Raw number of attempts for better sorting
-            'engagement_rate': round((item.correct_count + item.wrong_count) / total_attempts_across_all * 100, 1) if total_attempts_across_all > 0 else 0,
-            'created_at': item.created_at.isoformat()
-        } for item in analytics]
+            'accuracy': round(item.accuracy, 1),
+            'difficulty': round(item.difficulty, 1),
+            'engagement': item.attempts,  # Raw number of attempts for better sorting
+            'engagement_rate': round(item.attempts / total_attempts * 100, 1) if total_attempts > 0 else 0,
+            'created_at': item.created_at.isoformat() if item.created_at else None
+        }
+
+    @staticmethod
+    def _total_attempts():
+        summary = AnalyticsSummary.read()
+        return summary['correct_count'] + summary['wrong_count']
+
+    @staticmethod
+    def get_all_analytics():
+        total_attempts = QuestionAnalytics._total_attempts()
+        return [QuestionAnalytics._serialize(item, total_attempts) for item in QuestionAnalytics.query.all()]
+
+    @staticmethod
+    def _encode_cursor(value, row_id):
+        raw = json.dumps([value, row_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            value, row_id = json.loads(raw)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(value, (int, float)) or not isinstance(row_id, int):
+            raise ValueError("Invalid cursor")
+        return value, row_id
+
+    @staticmethod
+    def _filtered_query(query, filters):
+        """Apply {'min_<sort key>': x, 'max_<sort key>': y} range filters"""
+        for name, bound in (filters or {}).items():
+            edge, _, field = name.partition('_')
+            column_name = QuestionAnalytics.SORT_FIELDS.get(field)
+            if edge not in ('min', 'max') or column_name is None:
+                raise ValueError(f"Unknown filter '{name}'")
+            column = getattr(QuestionAnalytics, column_name)
+            query = query.filter(column >= bound if edge == 'min' else column <= bound)
+        return query
+
+    @staticmethod
+    def get_analytics_page(sort='accuracy', order='desc', limit=50, cursor=None, filters=None):
+        """Return one page of per-question analytics using keyset pagination.
+
+        Rows are ordered by the sort column with the row id as a tie-breaker,
+        and next_cursor encodes the last (value, id) so the following page
+        starts with an index seek rather than an OFFSET scan. Raises
+        ValueError for an unknown sort, filter or a malformed cursor.
+        """
+        column_name = QuestionAnalytics.SORT_FIELDS.get(sort)
+        if column_name is None:
+            raise ValueError(f"Unknown sort field '{sort}'")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        column = getattr(QuestionAnalytics, column_name)
+
+        query = QuestionAnalytics._filtered_query(QuestionAnalytics.query, filters)
+        if cursor:
+            value, row_id = QuestionAnalytics._decode_cursor(cursor)
+            key = tuple_(column, QuestionAnalytics.id)
+            query = query.filter(key < (value, row_id) if order == 'desc' else key > (value, row_id))
+
+        if order == 'desc':
+            query = query.order_by(column.desc(), QuestionAnalytics.id.desc())
+        else:
+            query = query.order_by(column.asc(), QuestionAnalytics.id.asc())
+
+        # One extra row tells us whether another page exists
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        total_attempts = QuestionAnalytics._total_attempts()
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = QuestionAnalytics._encode_cursor(getattr(last, column_name), last.id)
+
+        return {
+            'items': [QuestionAnalytics._serialize(item, total_attempts) for item in rows],
+            'next_cursor': next_cursor,
+            'sort': sort,
+            'order': order,
+            'limit': limit,
+        }
+
+    @staticmethod
+    def _aggregate(filters=None):
+        """Query summing the (optionally filtered) rows into AnalyticsSummary's counters"""
+        attempts = QuestionAnalytics.attempts
+        avg_time = QuestionAnalytics.avg_time
+        query = db.session.query(
+            func.count(QuestionAnalytics.id).label('questions'),
+            func.coalesce(func.sum(QuestionAnalytics.correct_count), 0).label('correct_count'),
+            func.coalesce(func.sum(QuestionAnalytics.wrong_count), 0).label('wrong_count'),
+            func.coalesce(func.sum(QuestionAnalytics.total_time_taken), 0).label('total_time_taken'),
+            func.coalesce(func.sum(QuestionAnalytics.total_score), 0).label('total_score'),
+            *[
+                func.coalesce(func.sum(attempts).filter(avg_time >= low, avg_time < high), 0).label(f'time_band_{index}')
+                for index, (low, high) in enumerate(TIME_BANDS)
+            ]
+        )
+        return QuestionAnalytics._filtered_query(query, filters)
+
+    @staticmethod
+    def get_totals(filters=None):
+        """Totals for the dashboard, weighted by attempts.
+
+        Unfiltered totals come from the incrementally maintained summary;
+        filtered totals are aggregated over the matching rows in one pass.
+        The response time histogram counts attempts per average-time band.
+        """
+        if filters:
+            totals = QuestionAnalytics._aggregate(filters).one()._asdict()
+        else:
+            totals = AnalyticsSummary.read()
+        correct, wrong = totals['correct_count'], totals['wrong_count']
+        total_attempts = correct + wrong
+
+        return {
+            'questions': totals['questions'],
+            'total_attempts': total_attempts,
+            'correct_answers': correct,
+            'wrong_answers': wrong,
+            'average_accuracy': round(correct / total_attempts * 100, 1) if total_attempts > 0 else 0,
+            'average_time': round(totals['total_time_taken'] / total_attempts, 2) if total_attempts > 0 else 0,
+            'total_score': totals['total_score'],
+            'time_distribution': {
+                'labels': [f"{low:g}-{high:g}s" for low, high in TIME_BANDS],
+                'attempts': [totals[f'time_band_{index}'] for index in range(len(TIME_BANDS))],
+            },
+        }
 
     @staticmethod
     def get_summary_stats():
+        """Attempt-weighted totals across every question, read from the summary rows"""
         try:
-            result = db.session.query(
-                func.sum(QuestionAnalytics.correct_count).label('total_correct'),
-                func.sum(QuestionAnalytics.wrong_count).label('total_wrong'),
-                func.avg(QuestionAnalytics.avg_time_taken).label('avg_time'),
-                func.sum(QuestionAnalytics.total_score).label('total_score')
-            ).first()
-            
-            total_attempts = (result.total_correct or 0) + (result.total_wrong or 0)
-            
+            totals = QuestionAnalytics.get_totals()
             return {
-                'total_attempts': total_attempts,
-                'average_accuracy': round((result.total_correct / total_attempts * 100), 1) if total_attempts > 0 else 0,
-                'average_time': round(result.avg_time or 0, 2),
-                'total_score': result.total_score or 0
+                'total_attempts': totals['total_attempts'],
+                'average_accuracy': totals['average_accuracy'],
+                'average_time': totals['average_time'],
+                'total_score': totals['total_score']
             }
         except Exception as e:
             current_app.logger.error(f"Error calculating summary stats: {str(e)}")
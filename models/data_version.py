@@ -0,0 +1,34 @@
+from config.database import db
+from datetime import datetime
+from sqlalchemy import text
+
+# Named counters; bump the matching one in every transaction that changes the data
+QUESTIONS = 'questions'
+
+_BUMP = text(
+    "INSERT INTO data_versions (name, version, updated_at) VALUES (:name, 1, :updated_at) "
+    "ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1, updated_at = EXCLUDED.updated_at"
+)
+
+class DataVersion(db.Model):
+    """A counter per kind of data, bumped in the same transaction as each write.
+
+    Processes holding an in-memory copy compare versions to learn, with one
+    primary key lookup, whether their copy is still current.
+    """
+    __tablename__ = "data_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def bump(name):
+        """Increment name's version; takes effect when the caller commits"""
+        db.session.execute(_BUMP, {'name': name, 'updated_at': datetime.utcnow()})
+
+    @staticmethod
+    def get(name):
+        """Current version of name, 0 if it has never been bumped"""
+        version = db.session.query(DataVersion.version).filter(DataVersion.name == name).scalar()
+        return version or 0
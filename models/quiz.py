@@ -1,12 +1,20 @@
 from config.database import db
 from datetime import datetime
+import random
 
 class Question(db.Model):
     __tablename__ = "questions"
+    __table_args__ = (
+        db.Index('ix_questions_topic_difficulty', 'topic', 'difficulty'),
+        db.Index('ix_questions_difficulty_random_key', 'difficulty', 'random_key'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     question = db.Column(db.Text, nullable=False)
     options = db.Column(db.ARRAY(db.String), nullable=False)
     correct_answer = db.Column(db.String, nullable=False)
     difficulty = db.Column(db.String, nullable=False, default='medium')  # easy, medium, hard
+    topic = db.Column(db.String(200))  # Set for pool-generated questions
+    random_key = db.Column(db.Float, nullable=False, default=random.random,
+                           server_default=db.text('random()'))  # Uniform key for indexed sampling
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
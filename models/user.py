@@ -9,6 +9,7 @@ class User(db.Model):
     password_hash = db.Column(db.String(500), nullable=False)
     password_salt = db.Column(db.String(100), nullable=False)  # Add salt column
     is_admin = db.Column(db.Boolean, default=False)
+    auth_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bump to revoke sessions
 
     _password_service = PasswordService()
 
@@ -25,3 +26,20 @@ class User(db.Model):
             self.password_hash,
             self.password_salt
         )
+
+    def password_memory_cost(self) -> int:
+        """KiB of memory that verifying the stored hash allocates."""
+        return self._password_service.memory_cost(self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        """True when the stored hash was made with different Argon2 parameters."""
+        return self._password_service.needs_rehash(self.password_hash)
+
+    def set_admin(self, is_admin: bool) -> None:
+        """Change admin rights and invalidate existing sessions."""
+        self.is_admin = is_admin
+        self.revoke_sessions()
+
+    def revoke_sessions(self) -> None:
+        """Invalidate cached session claims; they are rejected on their next check."""
+        self.auth_version = (self.auth_version or 0) + 1
@@ -0,0 +1,38 @@
+import sys
+import time
+import argparse
+import logging
+from app import app
+from config.settings import Config
+from models.analytics import AnalyticsSummary
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def reconcile() -> dict:
+    """Recompute the analytics summary from question_analytics and log any drift."""
+    with app.app_context():
+        drift = AnalyticsSummary.reconcile()
+        if drift:
+            logger.warning(f"Corrected analytics summary drift: {drift}")
+        else:
+            logger.info("Analytics summary matches question_analytics")
+        return drift
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile the analytics summary with per-question analytics")
+    parser.add_argument('--loop', action='store_true', help="Keep running, reconciling every ANALYTICS_RECONCILE_INTERVAL seconds")
+    args = parser.parse_args()
+
+    try:
+        reconcile()
+        while args.loop:
+            time.sleep(Config.ANALYTICS_RECONCILE_INTERVAL)
+            reconcile()
+    except KeyboardInterrupt:
+        logger.info("\nOperation cancelled by user")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import time
+import argparse
+import logging
+from app import app
+from config.settings import Config
+from services.pool_service import QuestionPoolManager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def refill(manager: QuestionPoolManager, dry_run: bool = False) -> int:
+    """Report stock levels and top up every slot below the low-water mark."""
+    with app.app_context():
+        for (topic, difficulty), count in sorted(manager.stock_levels().items()):
+            logger.info(f"{topic}/{difficulty}: {count} questions")
+
+        if dry_run:
+            for (topic, difficulty), missing in manager.shortfalls().items():
+                logger.info(f"Would generate {missing} questions for {topic}/{difficulty}")
+            return 0
+
+        stored = manager.refill_once()
+        logger.info(f"Refill complete, stored {stored} questions")
+        return stored
+
+def main():
+    parser = argparse.ArgumentParser(description="Refill the pre-generated question pool")
+    parser.add_argument('--topics', help="Comma-separated topics (defaults to QUESTION_POOL_TOPICS)")
+    parser.add_argument('--loop', action='store_true', help="Keep running, checking every refill interval")
+    parser.add_argument('--dry-run', action='store_true', help="Only report stock levels and shortfalls")
+    args = parser.parse_args()
+
+    topics = [t.strip() for t in args.topics.split(',') if t.strip()] if args.topics else None
+    manager = QuestionPoolManager(topics=topics)
+
+    if not manager.topics:
+        print("No topics configured. Set QUESTION_POOL_TOPICS or pass --topics.")
+        sys.exit(1)
+
+    try:
+        refill(manager, args.dry_run)
+        while args.loop:
+            time.sleep(Config.QUESTION_POOL_REFILL_INTERVAL)
+            refill(manager, args.dry_run)
+    except KeyboardInterrupt:
+        logger.info("\nOperation cancelled by user")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
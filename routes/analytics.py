@@ -1,31 +1,59 @@
-from flask import Blueprint, render_template, jsonify
+from flask import Blueprint, render_template, jsonify, request
 from flask import current_app
-from models.quiz import Question
-from models.analytics import QuestionAnalytics
-from functools import wraps
-from flask import session, redirect, url_for
+from config.settings import Config
+from models.analytics import QuestionAnalytics, AnalyticsSummary
+from services.http_cache import conditional
+from routes.auth_routes import admin_required
 
 analytics_bp = Blueprint('analytics', __name__)
 
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('is_admin'):
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    return decorated_function
-
 @analytics_bp.route('/')
 @admin_required
 def index():
     return render_template('analytics/index.html')
 
+def _range_filters(args):
+    """Collect min_<field>/max_<field> query parameters as floats"""
+    filters = {}
+    for name, value in args.items():
+        if name.startswith(('min_', 'max_')) and value != '':
+            try:
+                filters[name] = float(value)
+            except ValueError:
+                raise ValueError(f"{name} must be a number")
+    return filters
+
 @analytics_bp.route('/api/questions')
 @admin_required
+@conditional(AnalyticsSummary.data_version, private=True, no_cache=True)
 def get_question_analytics():
+    """One page of question analytics.
+
+    Query parameters: sort (accuracy, difficulty, avg_time_taken, engagement,
+    correct_answers, total_score), order (asc/desc), limit, cursor (the
+    next_cursor of the previous page) and min_<sort>/max_<sort> range
+    filters. The first page also carries SQL-computed totals for the
+    filtered rows. Responses carry an ETag for the analytics data version;
+    a browser revalidating an unchanged page gets a 304.
+    """
     try:
-        analytics_data = QuestionAnalytics.get_all_analytics()
-        return jsonify(analytics_data)
+        limit = request.args.get('limit', Config.ANALYTICS_PAGE_SIZE, type=int)
+        limit = min(max(limit, 1), Config.ANALYTICS_MAX_PAGE_SIZE)
+        filters = _range_filters(request.args)
+        cursor = request.args.get('cursor')
+
+        page = QuestionAnalytics.get_analytics_page(
+            sort=request.args.get('sort', 'accuracy'),
+            order=request.args.get('order', 'desc'),
+            limit=limit,
+            cursor=cursor,
+            filters=filters
+        )
+        if not cursor:
+            page['totals'] = QuestionAnalytics.get_totals(filters)
+        return jsonify(page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching analytics: {str(e)}")
         return jsonify({'error': 'Failed to fetch analytics data'}), 500
@@ -0,0 +1,39 @@
+import mimetypes
+import os
+from flask import Blueprint, abort, request, send_from_directory
+from services.asset_service import get_asset_manifest
+
+assets_bp = Blueprint('assets', __name__)
+
+# Fingerprinted names change with their content, so a cached copy never goes stale
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+@assets_bp.route('/<path:filename>')
+def asset(filename):
+    """Serve a fingerprinted asset, precompressed when the client accepts it"""
+    manifest = get_asset_manifest()
+    if not manifest.is_served(filename):
+        abort(404)
+
+    directory, path = manifest.locate(filename)
+    encoding = None
+    for candidate in manifest.encodings_for(filename):
+        if request.accept_encodings[candidate]:
+            path, encoding = path + ENCODING_SUFFIXES[candidate], candidate
+            break
+
+    response = send_from_directory(
+        directory, path,
+        mimetype=mimetypes.guess_type(filename)[0],
+        download_name=os.path.basename(filename),
+        max_age=IMMUTABLE_MAX_AGE
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if manifest.encodings_for(filename):
+        response.vary.add('Accept-Encoding')
+    return response
@@ -1,6 +1,14 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from models.user import User
+from config.database import db
+from config.settings import Config
+from services.hashing_service import get_hashing_executor, get_login_limiters, HashingOverloaded
+from services.metrics_service import HASH_REJECTIONS
 from functools import wraps
+import time
+import logging
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -12,17 +20,55 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def _store_auth_claims(is_admin, auth_version):
+    session['is_admin'] = bool(is_admin)
+    session['auth_version'] = auth_version
+    session['auth_checked_at'] = time.time()
+
+def _session_is_admin():
+    """Check admin rights from the signed session, re-validating against the
+    database at most once per ADMIN_AUTH_TTL seconds. Revoked sessions (the
+    user's auth_version changed) are cleared on that check."""
+    if time.time() - session.get('auth_checked_at', 0) < Config.ADMIN_AUTH_TTL:
+        return session.get('is_admin', False)
+
+    row = db.session.query(User.is_admin, User.auth_version).filter_by(id=session['user_id']).first()
+    if not row or row.auth_version != session.get('auth_version'):
+        session.clear()
+        return None
+
+    _store_auth_claims(row.is_admin, row.auth_version)
+    return session['is_admin']
+
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
             return redirect(url_for('auth.login'))
-        user = User.query.get(session['user_id'])
-        if not user or not user.is_admin:
+        is_admin = _session_is_admin()
+        if is_admin is None:
+            return redirect(url_for('auth.login'))
+        if not is_admin:
             return redirect(url_for('quiz.index'))  # Updated to use quiz.index
         return f(*args, **kwargs)
     return decorated_function
 
+def _upgrade_password_hash(user, password):
+    """Re-hash with the current Argon2 parameters after a successful login.
+
+    Changing PASSWORD_HASH_* then rolls out to each account as it next signs
+    in. A failure here is logged and never blocks the login.
+    """
+    if not user.password_needs_rehash():
+        return
+    try:
+        get_hashing_executor().run(user.set_password, password)
+        db.session.commit()
+        logger.info(f"Upgraded password hash parameters for user {user.id}")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Could not upgrade password hash for user {user.id}: {str(e)}")
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     # Redirect if already logged in
@@ -30,15 +76,38 @@ def login():
         return redirect(url_for('quiz.index'))
 
     if request.method == 'POST':
-        username = request.form.get('username')
-        password = request.form.get('password')
-        
+        username = request.form.get('username') or ''
+        password = request.form.get('password') or ''
+        client_ip = request.remote_addr or 'unknown'
+
+        # Refuse throttled attempts before they cost an Argon2 hash
+        ip_limiter, user_limiter = get_login_limiters()
+        for reason, retry_after in (('throttled_ip', ip_limiter.retry_after(client_ip)),
+                                    ('throttled_user', user_limiter.retry_after(username))):
+            if retry_after:
+                HASH_REJECTIONS.inc(reason=reason)
+                flash('Too many login attempts. Please try again later.')
+                return render_template('auth/login.html'), 429, {'Retry-After': str(retry_after)}
+        ip_limiter.record(client_ip)
+
         user = User.query.filter_by(username=username).first()
-        if user and user.check_password(password):
+        try:
+            # Weighted by the stored hash's own cost, which may predate the current settings
+            valid = user is not None and get_hashing_executor().run(
+                user.check_password, password, memory_kib=user.password_memory_cost()
+            )
+        except HashingOverloaded as e:
+            flash('The server is busy. Please try again in a moment.')
+            return render_template('auth/login.html'), 503, {'Retry-After': str(e.retry_after)}
+
+        if valid:
+            user_limiter.reset(username)
+            _upgrade_password_hash(user, password)
             session['user_id'] = user.id
-            session['is_admin'] = user.is_admin
+            _store_auth_claims(user.is_admin, user.auth_version)
             return redirect(url_for('quiz.index'))  # Updated to use quiz.index
-        
+
+        user_limiter.record(username)
         flash('Invalid username or password')
     return render_template('auth/login.html')
 
@@ -0,0 +1,21 @@
+import hmac
+from flask import Blueprint, Response, request, session
+from config.settings import Config
+from routes.auth_routes import _session_is_admin
+from services.metrics_service import REGISTRY
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def _authorized():
+    """Admins via their session, scrapers via 'Authorization: Bearer <METRICS_TOKEN>'"""
+    if Config.METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '')
+        if hmac.compare_digest(supplied.encode(), f"Bearer {Config.METRICS_TOKEN}".encode()):
+            return True
+    return 'user_id' in session and bool(_session_is_admin())
+
+@metrics_bp.route('/metrics')
+def metrics():
+    if not _authorized():
+        return {'error': 'Forbidden'}, 403
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
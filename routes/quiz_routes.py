@@ -1,19 +1,39 @@
-from flask import Blueprint, render_template, request, jsonify, current_app, session
-from services.quiz_service import QuizService
-from services.ai_service import AIService
+from flask import Blueprint, render_template, request, jsonify, current_app, session, Response, stream_with_context
+from services.quiz_service import get_quiz_service
 from services.database_service import DatabaseService
+from services.sampling_service import SamplingService
+from services.dedupe_service import DuplicateQuestionError
+from services.ai_client import AIServiceError
 from models.quiz import Question
 from config.database import db
+from config.settings import Config
+import json
 import logging
-from sqlalchemy.sql import func
-from routes.auth_routes import admin_required, login_required
+from routes.auth_routes import admin_required
 from models.analytics import QuestionAnalytics
+from services.analytics_buffer import get_analytics_buffer
+from services.http_cache import cache_control
+from services.question_cache import get_question_cache, questions_payload
 
 quiz_bp = Blueprint('quiz', __name__)
-quiz_service = QuizService()
-ai_service = AIService()
 
+_TRUE_STRINGS = {'true', '1', 'yes', 'on'}
+_FALSE_STRINGS = {'false', '0', 'no', 'off', ''}
+
+def _parse_bool(value):
+    """Read a flag sent as a JSON boolean, 0/1 or a true/false string; raises ValueError otherwise"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS | _FALSE_STRINGS:
+        return value.strip().lower() in _TRUE_STRINGS
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+# The pages show admin links from the session, so browsers may keep them but
+# shared caches may not; the content ETag lets a reload come back as a 304
 @quiz_bp.route('/')
+@cache_control(etag=True, private=True, no_cache=True)
 def index():
     is_admin = session.get('is_admin', False)
     question_types = [
@@ -28,6 +48,7 @@ def index():
                          difficulty_levels=difficulty_levels, is_admin=is_admin)
 
 @quiz_bp.route('/play')
+@cache_control(etag=True, private=True, no_cache=True)
 def play():
     """Route for level selection page"""
     difficulty_levels = [
@@ -46,12 +67,17 @@ def generate():
         num_questions = max(int(data.get('num_questions', 5)), 1)
         question_types = data.get('question_types', ['multiple_choice'])
         difficulty = data.get('difficulty', 'medium')
+        try:
+            bypass_cache = _parse_bool(data.get('bypass_cache', False))
+        except ValueError as e:
+            return jsonify({'error': f"Invalid bypass_cache: {str(e)}", 'status': 'error'}), 400
         
-        quiz = quiz_service.generate_quiz(
+        quiz = get_quiz_service().generate_quiz(
             num_questions=num_questions,
             question_types=question_types,
             topic=topic,
-            difficulty=difficulty
+            difficulty=difficulty,
+            use_cache=not bypass_cache
         )
 
         return jsonify({
@@ -59,6 +85,12 @@ def generate():
             'status': 'success'
         })
 
+    except AIServiceError as e:
+        current_app.logger.error(f"Quiz generation error: {str(e)}")
+        return jsonify({
+            'error': "The AI service is unavailable, please try again shortly",
+            'status': 'error'
+        }), 503
     except Exception as e:
         current_app.logger.error(f"Quiz generation error: {str(e)}")
         return jsonify({
@@ -66,6 +98,43 @@ def generate():
             'status': 'error'
         }), 500
 
+@quiz_bp.route('/generate-stream', methods=['POST'])
+@admin_required
+def generate_stream():
+    """Stream generated questions as newline-delimited JSON events"""
+    data = request.get_json()
+    topic = data.get('topic')
+    num_questions = max(int(data.get('num_questions', 5)), 1)
+    question_types = data.get('question_types', ['multiple_choice'])
+    difficulty = data.get('difficulty', 'medium')
+    try:
+        bypass_cache = _parse_bool(data.get('bypass_cache', False))
+    except ValueError as e:
+        return jsonify({'error': f"Invalid bypass_cache: {str(e)}", 'status': 'error'}), 400
+
+    def events():
+        count = 0
+        try:
+            for question in get_quiz_service().generate_quiz_stream(
+                num_questions=num_questions,
+                question_types=question_types,
+                topic=topic,
+                difficulty=difficulty,
+                use_cache=not bypass_cache
+            ):
+                count += 1
+                yield json.dumps({'type': 'question', 'question': question}) + '\n'
+            yield json.dumps({'type': 'done', 'count': count, 'status': 'success'}) + '\n'
+        except Exception as e:
+            current_app.logger.error(f"Quiz stream error: {str(e)}")
+            yield json.dumps({'type': 'error', 'error': 'Failed to generate quiz', 'status': 'error'}) + '\n'
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @quiz_bp.route('/save-question', methods=['POST'])
 @admin_required
 def save_question():
@@ -86,6 +155,12 @@ def save_question():
             'question_id': saved_question.id
         })
 
+    except DuplicateQuestionError as e:
+        return jsonify({
+            'status': 'error',
+            'message': 'A similar question is already saved',
+            'duplicate_of': e.existing_id
+        }), 409
     except Exception as e:
         current_app.logger.error(f"Question save error: {str(e)}")
         return jsonify({
@@ -106,22 +181,11 @@ def save_all_questions():
                 'message': 'No questions provided'
             }), 400
         
-        saved_questions = []
-        failed_questions = []
-        
-        for question_data in questions_data:
-            try:
-                # Save each question
-                saved_question = DatabaseService.store_single_question(
-                    question=question_data['question'],
-                    options=question_data['options'],
-                    correct_answer=question_data['correct_answer'],
-                    difficulty=question_data.get('difficulty', 'medium')
-                )
-                saved_questions.append(saved_question.id)
-            except Exception as e:
-                current_app.logger.error(f"Failed to save question: {question_data.get('question', 'Unknown')}, Error: {str(e)}")
-                failed_questions.append(question_data.get('question', 'Unknown question'))
+        # One transaction for the whole batch; bad rows are isolated and reported
+        saved_questions, failures = DatabaseService.store_questions(questions_data)
+        for failure in failures:
+            current_app.logger.error(f"Failed to save question: {failure['question']}, Error: {failure['error']}")
+        failed_questions = [failure['question'] for failure in failures]
 
         if failed_questions:
             return jsonify({
@@ -130,6 +194,7 @@ def save_all_questions():
                 'saved_count': len(saved_questions),
                 'failed_count': len(failed_questions),
                 'failed_questions': failed_questions,
+                'failed_details': [{'index': f['index'], 'error': f['error']} for f in failures],
                 'saved_question_ids': saved_questions
             }), 207  # Multi-status
         else:
@@ -147,13 +212,21 @@ def save_all_questions():
             'message': "Failed to save questions"
         }), 500
 
+# Every call is a fresh random draw, so no HTTP cache may replay one
 @quiz_bp.route('/random-questions', methods=['GET'])
+@cache_control(no_store=True)
 def get_random_questions():  # Removed @login_required decorator
     try:
         difficulty = request.args.get('difficulty', 'medium')
+
+        # Sample the in-process cache of encoded questions when it can serve this difficulty
+        cache = get_question_cache()
+        records = cache.sample(difficulty, 5) if cache is not None else None
+        if records:
+            return Response(questions_payload(difficulty, records), mimetype='application/json')
         
         # Get 5 random questions from the database with specified difficulty
-        random_questions = Question.query.filter_by(difficulty=difficulty).order_by(func.random()).limit(5).all()
+        random_questions = SamplingService.sample_questions(difficulty, 5)
         
         # If no questions for the specified difficulty, return error instead of fallback
         if not random_questions:
@@ -206,19 +279,68 @@ def get_random_questions():  # Removed @login_required decorator
             'status': 'error'
         }), 500
 
+def _answer_event(answer):
+    """Validate one answer event from a client; raises KeyError, TypeError or ValueError"""
+    return {
+        'question_id': int(answer['question_id']),
+        'question_text': answer.get('question_text'),
+        'is_correct': _parse_bool(answer['is_correct']),
+        'time_taken': float(answer['time_taken']),
+        'score': int(answer['score'])
+    }
+
 @quiz_bp.route('/api/analytics/log', methods=['POST'])
 def log_analytics():
+    data = request.get_json(silent=True)
     try:
-        data = request.get_json()
-        
-        QuestionAnalytics.log_answer(
-            question_id=data['question_id'],
-            question_text=data['question_text'],
-            is_correct=data['is_correct'],
-            time_taken=data['time_taken'],
-            score=data['score']
-        )
+        answer = _answer_event(data)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return jsonify({'status': 'error', 'message': f'Invalid answer event: {str(e)}'}), 400
+
+    try:
+        analytics_buffer = get_analytics_buffer()
+        if analytics_buffer:
+            analytics_buffer.add(**answer)
+        else:
+            QuestionAnalytics.log_answer(**answer)
         
         return jsonify({'status': 'success'})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        db.session.rollback()
+        current_app.logger.error(f"Error logging answer: {str(e)}")
+        return jsonify({'status': 'error', 'message': 'Failed to log answer'}), 500
+
+
+@quiz_bp.route('/api/analytics/log-batch', methods=['POST'])
+def log_analytics_batch():
+    """Log a list of answer events (usually a whole round) in one request"""
+    # sendBeacon may not set a JSON content type, so parse the body regardless
+    data = request.get_json(force=True, silent=True) or {}
+    answers = data.get('answers')
+
+    if not isinstance(answers, list) or not answers:
+        return jsonify({'status': 'error', 'message': 'No answers provided'}), 400
+    if len(answers) > Config.ANALYTICS_MAX_BATCH:
+        return jsonify({
+            'status': 'error',
+            'message': f'At most {Config.ANALYTICS_MAX_BATCH} answers per request'
+        }), 400
+
+    try:
+        events = [_answer_event(answer) for answer in answers]
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return jsonify({'status': 'error', 'message': f'Invalid answer event: {str(e)}'}), 400
+
+    try:
+        analytics_buffer = get_analytics_buffer()
+        if analytics_buffer:
+            for event in events:
+                analytics_buffer.add(**event)
+        else:
+            QuestionAnalytics.log_answers(events)
+
+        return jsonify({'status': 'success', 'logged': len(events)})
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error logging analytics batch: {str(e)}")
+        return jsonify({'status': 'error', 'message': 'Failed to log answers'}), 500
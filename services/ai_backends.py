@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import uuid
+from config.settings import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AIBackend:
+    """Interface for text generation backends used by AIService.
+
+    generate() returns the full response text and stream() yields it in
+    chunks. The default stream() yields the whole response at once.
+    """
+
+    name = 'base'
+    model_name = 'unknown'
+
+    def cache_config(self):
+        """Settings that change the output, folded into response cache keys"""
+        return {'backend': self.name}
+
+    async def generate(self, contents):
+        raise NotImplementedError
+
+    async def stream(self, contents):
+        yield await self.generate(contents)
+
+class GeminiBackend(AIBackend):
+    """Google Gemini with search grounding."""
+
+    name = 'gemini'
+
+    def __init__(self, api_key=None, model_name='gemini-2.5-flash', base_url=None):
+        # google.genai takes most of a second to import, so only pay for it
+        # when an AI feature is actually used
+        from google import genai
+        from google.genai.types import Tool, GenerateContentConfig, GoogleSearch, HttpOptions
+
+        http_options = HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+        self.search_tool = Tool(google_search=GoogleSearch())
+        self.model_name = model_name
+
+        self.base_config = {
+            "temperature": 0.5,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 8192,
+            "tools": [self.search_tool],
+            "response_modalities": ["TEXT"]
+        }
+        self.generate_config = GenerateContentConfig(**self.base_config)
+
+    def cache_config(self):
+        config = {k: v for k, v in self.base_config.items() if k != 'tools'}
+        config['tools'] = ['google_search']
+        return config
+
+    async def generate(self, contents):
+        """Make one Gemini request and return its text"""
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=self.generate_config
+        )
+        return self._parse_response(response)
+
+    async def stream(self, contents):
+        """Make one streaming Gemini request and yield its text chunks"""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=self.generate_config
+        )
+        async for chunk in stream:
+            text = getattr(chunk, 'text', None)
+            if text:
+                yield text
+
+    def _parse_response(self, response):
+        """Parse response from Gemini API with robust text extraction"""
+        try:
+            content = ""
+
+            # Extract text content with multiple fallback methods
+            if hasattr(response, 'text') and response.text:
+                content = response.text
+            elif hasattr(response, 'candidates') and response.candidates:
+                # Extract from candidates if available
+                candidate = response.candidates[0]
+                if hasattr(candidate, 'content') and candidate.content:
+                    if hasattr(candidate.content, 'parts') and candidate.content.parts:
+                        content = candidate.content.parts[0].text
+                    elif hasattr(candidate.content, 'text'):
+                        content = candidate.content.text
+                elif hasattr(candidate, 'text'):
+                    content = candidate.text
+            elif isinstance(response, str):
+                content = response
+            else:
+                content = str(response)
+
+            # Clean and validate the content
+            if not content or not content.strip():
+                logger.warning("Empty response received from AI service")
+                return ""
+
+            logger.debug(f"Extracted content length: {len(content)} characters")
+            return content.strip()
+
+        except Exception as e:
+            logger.error(f"Error parsing response: {str(e)}", exc_info=True)
+            return ""
+
+def prompt_key(contents):
+    return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+
+class ReplayBackend(AIBackend):
+    """Serves previously recorded responses without network access.
+
+    Recordings are JSON lines of {"key": sha256(prompt), "text": response}.
+    A prompt that was recorded gets its own response; any other prompt gets
+    the recorded responses in turn, so a small recording can drive a long
+    benchmark.
+    """
+
+    name = 'replay'
+    model_name = 'replay'
+
+    def __init__(self, path=None, responses=None):
+        self.by_key = {}
+        self.responses = list(responses or [])
+        if path:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.by_key[entry['key']] = entry['text']
+                        self.responses.append(entry['text'])
+        if not self.responses:
+            raise ValueError("ReplayBackend needs at least one recorded response")
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def cache_config(self):
+        # Replayed text must never be mistaken for a live response in the cache
+        return {'backend': self.name, 'responses': len(self.responses)}
+
+    async def generate(self, contents):
+        recorded = self.by_key.get(prompt_key(contents))
+        if recorded is not None:
+            return recorded
+        with self._lock:
+            text = self.responses[self._next % len(self.responses)]
+            self._next += 1
+        return text
+
+class RecordingBackend(AIBackend):
+    """Wraps another backend and appends every response to a replay file."""
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self.name = inner.name
+        self.model_name = inner.model_name
+        self._lock = threading.Lock()
+
+    def cache_config(self):
+        return self.inner.cache_config()
+
+    def _record(self, contents, text):
+        if not text:
+            return
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'key': prompt_key(contents), 'text': text}) + '\n')
+
+    async def generate(self, contents):
+        text = await self.inner.generate(contents)
+        self._record(contents, text)
+        return text
+
+    async def stream(self, contents):
+        parts = []
+        async for chunk in self.inner.stream(contents):
+            parts.append(chunk)
+            yield chunk
+        self._record(contents, ''.join(parts))
+
+_REQUESTED_COUNT = re.compile(r'Generate (\d+)')
+_REQUESTED_DIFFICULTY = re.compile(r'\b(easy|medium|hard) difficulty')
+
+class SyntheticBackend(AIBackend):
+    """Generates quiz responses locally at a chosen latency and failure mix.
+
+    Reads the question count and difficulty from the prompt and answers
+    with well-formed JSON, or, at the configured rates, truncated output or
+    the malformations seen from real models (markdown fences, prose around
+    the JSON, trailing or missing commas).
+    """
+
+    name = 'synthetic'
+    model_name = 'synthetic'
+
+    MALFORMATIONS = ('fence', 'prose', 'trailing_comma', 'missing_comma')
+
+    def __init__(self, latency=0.0, jitter=0.0, truncate_rate=0.0, malformed_rate=0.0,
+                 stream_chunks=8, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.truncate_rate = truncate_rate
+        self.malformed_rate = malformed_rate
+        self.stream_chunks = max(int(stream_chunks), 1)
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def cache_config(self):
+        # Each synthetic response is unique, so caching would only hide the work being measured.
+        # The nonce must not come from self.random, or it would shift a seeded run's draws
+        return {'backend': self.name, 'nonce': uuid.uuid4().hex}
+
+    def make_response(self, contents):
+        count_match = _REQUESTED_COUNT.search(contents)
+        difficulty_match = _REQUESTED_DIFFICULTY.search(contents)
+        count = int(count_match.group(1)) if count_match else 5
+        difficulty = difficulty_match.group(1) if difficulty_match else 'medium'
+
+        with self._lock:
+            roll = self.random.random()
+            malformation = self.random.choice(self.MALFORMATIONS)
+            cut = self.random.uniform(0.3, 0.95)
+            # Distinct words per question, so deduplication keeps them all
+            subjects = [[self._word() for _ in range(3)] for _ in range(count)]
+
+        questions = [
+            {
+                "type": "multiple_choice",
+                "question": f"Which {a} is most closely linked to the {b} of {c}?",
+                "options": [f"{a} {option}" for option in ('north', 'south', 'east', 'west')],
+                "correct_answer": f"{a} north",
+                "difficulty": difficulty,
+            }
+            for a, b, c in subjects
+        ]
+        text = json.dumps({"questions": questions}, indent=2)
+
+        if roll < self.truncate_rate:
+            return text[:int(len(text) * cut)]
+        if roll < self.truncate_rate + self.malformed_rate:
+            if malformation == 'fence':
+                return f"```json\n{text}\n```"
+            if malformation == 'prose':
+                return f"Here are your questions:\n{text}\nLet me know if you need more."
+            if malformation == 'trailing_comma':
+                return text.replace('"\n    }', '",\n    }').replace('}\n  ]', '},\n  ]')
+            return text.replace('},\n    {', '}\n    {')
+        return text
+
+    def _word(self):
+        return ''.join(self.random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(self.random.randint(5, 9)))
+
+    async def _delay(self, seconds):
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def _latency(self):
+        with self._lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    async def generate(self, contents):
+        await self._delay(self._latency())
+        return self.make_response(contents)
+
+    async def stream(self, contents):
+        total = self._latency()
+        text = self.make_response(contents)
+        step = max(1, -(-len(text) // self.stream_chunks))
+        for start in range(0, len(text), step):
+            await self._delay(total / self.stream_chunks)
+            yield text[start:start + step]
+
+def create_ai_backend():
+    """Build the backend selected by AI_BACKEND (gemini, replay or synthetic)."""
+    backend_name = Config.AI_BACKEND.lower()
+    if backend_name == 'gemini':
+        backend = GeminiBackend(Config.GEMINI_API_KEY, base_url=Config.GEMINI_BASE_URL)
+    elif backend_name == 'replay':
+        if not Config.AI_REPLAY_PATH or not os.path.exists(Config.AI_REPLAY_PATH):
+            raise ValueError("AI_BACKEND=replay needs AI_REPLAY_PATH pointing at a recording")
+        backend = ReplayBackend(Config.AI_REPLAY_PATH)
+    elif backend_name == 'synthetic':
+        backend = SyntheticBackend(
+            latency=Config.AI_SYNTHETIC_LATENCY,
+            jitter=Config.AI_SYNTHETIC_LATENCY / 2,
+            truncate_rate=Config.AI_SYNTHETIC_TRUNCATE_RATE,
+            malformed_rate=Config.AI_SYNTHETIC_MALFORMED_RATE,
+        )
+    else:
+        raise ValueError(f"Unknown AI_BACKEND '{Config.AI_BACKEND}', expected gemini, replay or synthetic")
+
+    if Config.AI_RECORD_PATH:
+        backend = RecordingBackend(backend, Config.AI_RECORD_PATH)
+    logger.info(f"Using {backend.name} AI backend")
+    return backend
@@ -0,0 +1,241 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+class AIServiceError(Exception):
+    """Raised when an AI call fails after its retries or runs past its deadline"""
+
+def is_retryable(error):
+    """Return True for errors a later attempt may not hit (timeouts, 429, 5xx, dropped connections)"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    try:
+        import httpx
+        return isinstance(error, httpx.TransportError)
+    except ImportError:
+        return False
+
+class TokenBucket:
+    """Async token bucket; callers wait until a request fits under the rate limit."""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst if burst else max(1, int(self.rate * 5))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class _EventLoopThread:
+    """Runs one asyncio loop on a daemon thread for the synchronous facade."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='ai-client-loop', daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+_loop_thread = None
+_loop_thread_lock = threading.Lock()
+
+def _get_loop_thread():
+    global _loop_thread
+    if _loop_thread is None:
+        with _loop_thread_lock:
+            if _loop_thread is None:
+                _loop_thread = _EventLoopThread()
+    return _loop_thread
+
+class ResilientAIClient:
+    """Deadline, retry, rate-limit and hedging policy around an async model call.
+
+    call(prompt) is a coroutine returning the response text, and
+    stream(prompt) an async generator of text chunks. Every attempt runs
+    inside a global concurrency semaphore and token bucket, retryable errors
+    back off exponentially with full jitter, and nothing runs past the
+    per-call deadline. With hedge_delay set, a second identical request is
+    sent if the first has not answered by then and the faster one wins.
+
+    Flask views are synchronous, so generate_sync and stream_sync run the
+    coroutines on one shared background loop; the limits then hold across
+    every worker thread in the process.
+    """
+
+    def __init__(self, call, stream=None, deadline=60, attempt_timeout=None, max_attempts=3,
+                 backoff_base=0.5, backoff_max=8, max_concurrency=4, rate_per_minute=0, hedge_delay=0):
+        self.call = call
+        self.stream_call = stream
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_attempts = max(int(max_attempts), 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.limiter = TokenBucket(rate_per_minute) if rate_per_minute else None
+        self.hedge_delay = hedge_delay
+        self._semaphore = None
+        self.stats = {'calls': 0, 'retries': 0, 'hedges': 0, 'failures': 0}
+
+    def _slot(self):
+        # Created on first use so it belongs to the loop that runs the calls
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _limited_call(self, prompt):
+        async with self._slot():
+            if self.limiter:
+                await self.limiter.acquire()
+            self.stats['calls'] += 1
+            return await self.call(prompt)
+
+    async def _hedged_call(self, prompt):
+        if not self.hedge_delay:
+            return await self._limited_call(prompt)
+
+        tasks = [asyncio.ensure_future(self._limited_call(prompt))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if not done:
+                self.stats['hedges'] += 1
+                tasks.append(asyncio.ensure_future(self._limited_call(prompt)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate(self, prompt, deadline=None):
+        """Return the response text, retrying transient failures until the deadline."""
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.deadline)
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            timeout = min(remaining, self.attempt_timeout) if self.attempt_timeout else remaining
+            try:
+                return await asyncio.wait_for(self._hedged_call(prompt), timeout=timeout)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.stats['failures'] += 1
+                    raise AIServiceError(f"AI call failed: {e}") from e
+                last_error = e
+
+            delay = self._backoff(attempt)
+            if attempt + 1 >= self.max_attempts or loop.time() + delay >= deadline_at:
+                break
+            self.stats['retries'] += 1
+            logger.warning(f"AI call attempt {attempt + 1} failed ({last_error!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        self.stats['failures'] += 1
+        raise AIServiceError(f"AI call failed after {attempt + 1} attempts: {last_error!r}") from last_error
+
+    async def stream(self, prompt, deadline=None):
+        """Yield response chunks; failures before the first chunk are retried."""
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.deadline)
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            started = False
+            try:
+                async with self._slot():
+                    if self.limiter:
+                        await self.limiter.acquire()
+                    self.stats['calls'] += 1
+                    chunks = self.stream_call(prompt).__aiter__()
+                    while True:
+                        remaining = deadline_at - loop.time()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError()
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        yield chunk
+            except Exception as e:
+                if started or not is_retryable(e):
+                    # Text already went to the caller, so a retry would repeat it
+                    self.stats['failures'] += 1
+                    raise AIServiceError(f"AI stream failed: {e!r}") from e
+                last_error = e
+
+            delay = self._backoff(attempt)
+            if attempt + 1 >= self.max_attempts or loop.time() + delay >= deadline_at:
+                break
+            self.stats['retries'] += 1
+            logger.warning(f"AI stream attempt {attempt + 1} failed ({last_error!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        self.stats['failures'] += 1
+        raise AIServiceError(f"AI stream failed after {attempt + 1} attempts: {last_error!r}") from last_error
+
+    def generate_sync(self, prompt, deadline=None):
+        """Blocking facade over generate() for synchronous callers."""
+        return _get_loop_thread().submit(self.generate(prompt, deadline)).result()
+
+    def stream_sync(self, prompt, deadline=None):
+        """Blocking facade over stream(); closing the generator cancels the call."""
+        chunks = queue.Queue()
+        finished = object()
+
+        async def pump():
+            try:
+                async for chunk in self.stream(prompt, deadline):
+                    chunks.put(chunk)
+                chunks.put(finished)
+            except Exception as e:
+                chunks.put(e)
+
+        future = _get_loop_thread().submit(pump())
+        try:
+            while True:
+                item = chunks.get()
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
@@ -1,31 +1,38 @@
 import json
-from google import genai
-from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
+import threading
+import time
 from config.settings import Config  # Update import path
+from services.cache_service import create_response_cache
+from services.ai_client import ResilientAIClient, AIServiceError
+from services.ai_backends import create_ai_backend
+from services.metrics_service import AI_CALL_DURATION, AI_CACHE_HITS
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AIService:
-    def __init__(self):
+    def __init__(self, backend=None):
         logger.info("Initializing AIService")
-        self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
-        self.search_tool = Tool(google_search=GoogleSearch())
-        
-        self.base_config = {
-            "temperature": 0.5,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-            "tools": [self.search_tool],
-            "response_modalities": ["TEXT"]
-        }
-        logger.debug("AIService initialized with gemini-2.5-flash")
-
-    def generate_content(self, prompt, topic=None):
-        """Generate content using Gemini API with built-in search"""
-        try:
-            enhanced_prompt = f"""
+        self.backend = backend or create_ai_backend()
+        self.model_name = self.backend.model_name
+        self.cache = create_response_cache()
+        self.ai_client = ResilientAIClient(
+            call=self.backend.generate,
+            stream=self.backend.stream,
+            deadline=Config.AI_DEADLINE,
+            attempt_timeout=Config.AI_ATTEMPT_TIMEOUT,
+            max_attempts=Config.AI_MAX_ATTEMPTS,
+            backoff_base=Config.AI_BACKOFF_BASE,
+            backoff_max=Config.AI_BACKOFF_MAX,
+            max_concurrency=Config.AI_MAX_CONCURRENCY,
+            rate_per_minute=Config.AI_RATE_LIMIT_PER_MINUTE,
+            hedge_delay=Config.AI_HEDGE_DELAY,
+        )
+        logger.debug(f"AIService initialized with {self.model_name}")
+
+    def _enhance_prompt(self, prompt, topic=None):
+        """Wrap a prompt with topic context and output instructions"""
+        return f"""
             Topic: {topic if topic else 'General'}
             
             {prompt}
@@ -34,65 +41,107 @@ class AIService:
             IMPORTANT: Return ONLY valid JSON in the exact format specified. Do not include any explanatory text before or after the JSON.
             """
 
-            logger.debug("Generating content with Gemini API")
-            response = self.client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=enhanced_prompt,
-                config=GenerateContentConfig(
-                    **self.base_config
-                )
-            )
-            
-            parsed_response = self._parse_response(response)
-            
-            # Log response details for debugging
-            if parsed_response:
-                logger.debug(f"Response received, length: {len(parsed_response)}")
-                # Log first and last 200 characters for debugging
-                if len(parsed_response) > 400:
-                    logger.debug(f"Response preview: {parsed_response[:200]}...{parsed_response[-200:]}")
-                else:
-                    logger.debug(f"Response: {parsed_response}")
-            else:
-                logger.warning("Empty response received from AI service")
-            
-            return parsed_response
-            
-        except Exception as e:
-            logger.error(f"Error generating content: {str(e)}", exc_info=True)
-            return ""
+    def _cache_key(self, enhanced_prompt):
+        """Build a content-addressed cache key from the final prompt and model config"""
+        return self.cache.make_key(self.model_name, enhanced_prompt, self.backend.cache_config())
+
+    def evict(self, prompt, topic=None):
+        """Drop the cached response for prompt, e.g. once its questions are in the bank"""
+        if self.cache:
+            self.cache.delete(self._cache_key(self._enhance_prompt(prompt, topic)))
+
+    def generate_content(self, prompt, topic=None, use_cache=True):
+        """Generate content with the configured AI backend (Gemini with built-in search by default).
 
-    def _parse_response(self, response):
-        """Parse response from Gemini API with robust text extraction"""
+        Non-empty responses are cached by prompt and config when a response
+        cache is configured; pass use_cache=False to force a fresh call.
+        Transient failures are retried within AI_DEADLINE; raises
+        AIServiceError once the call cannot succeed.
+        """
+        enhanced_prompt = self._enhance_prompt(prompt, topic)
+
+        cache_key = self._cache_key(enhanced_prompt) if self.cache else None
+        if cache_key and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                logger.debug("Serving response from cache")
+                AI_CACHE_HITS.inc(operation='generate')
+                return cached
+
+        logger.debug(f"Generating content with {self.backend.name} backend")
         try:
-            content = ""
-            
-            # Extract text content with multiple fallback methods
-            if hasattr(response, 'text') and response.text:
-                content = response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                # Extract from candidates if available
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and candidate.content:
-                    if hasattr(candidate.content, 'parts') and candidate.content.parts:
-                        content = candidate.content.parts[0].text
-                    elif hasattr(candidate.content, 'text'):
-                        content = candidate.content.text
-                elif hasattr(candidate, 'text'):
-                    content = candidate.text
-            elif isinstance(response, str):
-                content = response
+            with AI_CALL_DURATION.time(backend=self.backend.name, operation='generate'):
+                parsed_response = self.ai_client.generate_sync(enhanced_prompt)
+        except AIServiceError as e:
+            logger.error(f"Error generating content: {str(e)}")
+            raise
+        
+        # Log response details for debugging
+        if parsed_response:
+            logger.debug(f"Response received, length: {len(parsed_response)}")
+            # Log first and last 200 characters for debugging
+            if len(parsed_response) > 400:
+                logger.debug(f"Response preview: {parsed_response[:200]}...{parsed_response[-200:]}")
             else:
-                content = str(response)
-            
-            # Clean and validate the content
-            if not content or not content.strip():
-                logger.warning("Empty response received from AI service")
-                return ""
-            
-            logger.debug(f"Extracted content length: {len(content)} characters")
-            return content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error parsing response: {str(e)}", exc_info=True)
-            return ""
\ No newline at end of file
+                logger.debug(f"Response: {parsed_response}")
+            if cache_key:
+                self.cache.set(cache_key, parsed_response)
+        else:
+            logger.warning("Empty response received from AI service")
+        
+        return parsed_response
+
+    def generate_content_stream(self, prompt, topic=None, use_cache=True):
+        """Stream generated text from the AI backend chunk by chunk.
+
+        A cached response is yielded as a single chunk. A completed stream is
+        written back to the cache so later non-streaming calls can reuse it.
+        Raises AIServiceError if the stream fails.
+        """
+        enhanced_prompt = self._enhance_prompt(prompt, topic)
+
+        cache_key = self._cache_key(enhanced_prompt) if self.cache else None
+        if cache_key and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                logger.debug("Serving streamed response from cache")
+                AI_CACHE_HITS.inc(operation='stream')
+                yield cached
+                return
+
+        logger.debug(f"Streaming content with {self.backend.name} backend")
+        parts = []
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            for text in self.ai_client.stream_sync(enhanced_prompt):
+                parts.append(text)
+                yield text
+            outcome = 'ok'
+        except AIServiceError as e:
+            logger.error(f"Error streaming content: {str(e)}")
+            raise
+        except GeneratorExit:
+            # The caller had enough questions and closed the stream early
+            outcome = 'closed'
+            raise
+        finally:
+            AI_CALL_DURATION.observe(time.perf_counter() - started, backend=self.backend.name,
+                                     operation='stream', outcome=outcome)
+
+        content = ''.join(parts).strip()
+        if content and cache_key:
+            self.cache.set(cache_key, content)
+        logger.debug(f"Stream finished, length: {len(content)}")
+
+_ai_service = None
+_ai_service_lock = threading.Lock()
+
+def get_ai_service():
+    """Return the process-wide AIService, creating it on first use."""
+    global _ai_service
+    if _ai_service is None:
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
+    return _ai_service
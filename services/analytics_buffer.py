@@ -0,0 +1,180 @@
+import atexit
+import signal
+import sys
+import threading
+from sqlalchemy.exc import DataError, IntegrityError
+from config.settings import Config
+from services.metrics_service import ANALYTICS_EVENTS_DROPPED
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AnswerAggregator:
+    """Write-behind buffer for answer analytics.
+
+    Answers are summed per question in memory and written with a single
+    upsert when the buffer reaches ANALYTICS_FLUSH_SIZE events, every
+    ANALYTICS_FLUSH_INTERVAL seconds, and at interpreter shutdown.
+
+    If a flush fails, each question is retried on its own: rows the
+    database rejects (e.g. a question_id that does not exist) are logged
+    and dropped, so one bad answer cannot hold back the rest. While the
+    database is unreachable events stay buffered, up to max_pending;
+    answers arriving beyond that are dropped.
+    """
+
+    def __init__(self, app, flush_size, flush_interval, max_pending=None):
+        self.app = app
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending if max_pending is not None else Config.ANALYTICS_MAX_PENDING
+        self._pending = {}
+        self._pending_events = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='analytics-flush', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, question_id, question_text, is_correct, time_taken, score):
+        """Record one answer; flushes inline once the size threshold is hit.
+
+        Raises ValueError or TypeError, leaving the buffer untouched, if a
+        field cannot be converted.
+        """
+        question_id, time_taken, score = int(question_id), float(time_taken), int(score)
+        with self._lock:
+            if self._pending_events >= self.max_pending:
+                ANALYTICS_EVENTS_DROPPED.inc(reason='buffer_full')
+                return
+            delta = self._pending.get(question_id)
+            if delta is None:
+                delta = {'question_text': question_text, 'correct': 0, 'wrong': 0, 'time_sum': 0.0, 'score': 0}
+                self._pending[question_id] = delta
+            elif not delta['question_text']:
+                delta['question_text'] = question_text
+
+            if is_correct:
+                delta['correct'] += 1
+            else:
+                delta['wrong'] += 1
+            delta['time_sum'] += time_taken
+            delta['score'] += score
+            self._pending_events += 1
+            should_flush = self._pending_events >= self.flush_size
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write all pending deltas; returns the number of events written.
+
+        Deltas that could not be written because the database was
+        unavailable are merged back for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                deltas, events = self._pending, self._pending_events
+                self._pending, self._pending_events = {}, 0
+
+            with self.app.app_context():
+                try:
+                    self._apply(deltas)
+                except Exception as e:
+                    logger.warning(f"Analytics flush of {events} events failed, retrying per question: {str(e)}")
+                    return self._flush_each(deltas)
+
+            logger.debug(f"Flushed {events} answer events for {len(deltas)} questions")
+            return events
+
+    def _apply(self, deltas):
+        from config.database import db
+        from models.analytics import QuestionAnalytics
+
+        try:
+            QuestionAnalytics.apply_answer_deltas(deltas)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+    def _flush_each(self, deltas):
+        """Write deltas one question at a time after a failed batch.
+
+        A question the database rejects is dropped; any other error is
+        taken to mean the database is unavailable, and that question and
+        the ones not yet tried are requeued.
+        """
+        written = 0
+        question_ids = sorted(deltas)
+        for index, question_id in enumerate(question_ids):
+            delta = deltas[question_id]
+            try:
+                self._apply({question_id: delta})
+            except (IntegrityError, DataError) as e:
+                dropped = _event_count(delta)
+                ANALYTICS_EVENTS_DROPPED.inc(dropped, reason='rejected')
+                logger.error(f"Dropping {dropped} answer events for question {question_id}: {str(e)}")
+            except Exception as e:
+                remaining = {qid: deltas[qid] for qid in question_ids[index:]}
+                logger.error(f"Analytics flush failed, keeping {sum(map(_event_count, remaining.values()))} "
+                             f"events: {str(e)}")
+                self._requeue(remaining)
+                break
+            else:
+                written += _event_count(delta)
+        return written
+
+    def _requeue(self, deltas):
+        with self._lock:
+            for question_id, delta in deltas.items():
+                pending = self._pending.get(question_id)
+                if pending is None:
+                    self._pending[question_id] = delta
+                else:
+                    for field in ('correct', 'wrong', 'time_sum', 'score'):
+                        pending[field] += delta[field]
+                self._pending_events += _event_count(delta)
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the flush thread and write whatever is still buffered."""
+        self._stop_event.set()
+        self.flush()
+
+def _event_count(delta):
+    return delta['correct'] + delta['wrong']
+
+_aggregator = None
+
+def init_analytics_buffer(app):
+    """Enable write-behind answer logging if configured; returns the aggregator or None."""
+    global _aggregator
+    if not Config.ANALYTICS_WRITE_BEHIND:
+        return None
+
+    _aggregator = AnswerAggregator(
+        app, Config.ANALYTICS_FLUSH_SIZE, Config.ANALYTICS_FLUSH_INTERVAL, Config.ANALYTICS_MAX_PENDING
+    )
+    _aggregator.start()
+
+    # Turn SIGTERM into a normal exit so atexit handlers flush the buffer
+    if threading.current_thread() is threading.main_thread():
+        previous = signal.getsignal(signal.SIGTERM)
+        if previous in (signal.SIG_DFL, None):
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    logger.info(f"Analytics write-behind enabled (size={Config.ANALYTICS_FLUSH_SIZE}, interval={Config.ANALYTICS_FLUSH_INTERVAL}s)")
+    return _aggregator
+
+def get_analytics_buffer():
+    return _aggregator
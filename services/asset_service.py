@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import threading
+from config.settings import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+BUILD_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+# Output bundle -> source files under static/, in the order the page loads them
+BUNDLES = {
+    'js/app.js': ['js/quizAPI.js', 'js/quizUI.js', 'js/quizLogic.js', 'js/main.js', 'js/gameUI.js'],
+    'css/game.css': ['css/game.css'],
+}
+# Given a content-hashed URL but served from static/ as they are, not copied
+IN_PLACE_DIRS = ['sounds']
+
+def in_place_files(static_dir=STATIC_DIR):
+    """Names under static/ of the files served in place, e.g. 'sounds/click.mp3'"""
+    return [
+        f"{directory}/{filename}"
+        for directory in IN_PLACE_DIRS
+        for filename in sorted(os.listdir(os.path.join(static_dir, directory)))
+        if not filename.startswith('.')
+    ]
+
+def source_digest(static_dir=STATIC_DIR):
+    """Hash of every file the build reads, to tell whether a build is current"""
+    digest = hashlib.sha256()
+    names = [source for sources in BUNDLES.values() for source in sources] + in_place_files(static_dir)
+    for name in sorted(set(names)):
+        digest.update(name.encode('utf-8') + b'\0')
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+class AssetManifest:
+    """Maps logical asset names to the fingerprinted files written by build_assets.py.
+
+    Without a build (or with ASSETS_BUNDLED=false) every name resolves to its
+    unbundled source files under /static, so development needs no build step.
+    A build whose sources have since changed is ignored the same way.
+    """
+
+    def __init__(self, build_dir=BUILD_DIR, enabled=True, static_dir=STATIC_DIR):
+        self.build_dir = build_dir
+        self.static_dir = static_dir
+        self.assets = {}
+        self.encodings = {}
+        self.in_place = {}
+        path = os.path.join(build_dir, MANIFEST_NAME)
+        if enabled and os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get('source_digest') == source_digest(static_dir):
+                self.assets = manifest['assets']
+                self.encodings = manifest.get('encodings', {})
+                self.in_place = manifest.get('in_place', {})
+                logger.info(f"Serving {len(self.assets)} built assets from {build_dir}")
+            else:
+                logger.warning(f"{path} is out of date with static/; serving source files until "
+                               f"build_assets.py is run again")
+        self._served = set(self.assets.values())
+
+    @property
+    def built(self):
+        return bool(self.assets)
+
+    def urls(self, name):
+        """URLs to load for a bundle or single asset, in order"""
+        from flask import url_for
+        if name in self.assets:
+            return [url_for('assets.asset', filename=self.assets[name])]
+        return [url_for('static', filename=source) for source in BUNDLES.get(name, [name])]
+
+    def url(self, name):
+        return self.urls(name)[0]
+
+    def sound_urls(self):
+        """{file name: URL} for every game sound, for the client to load on demand"""
+        sounds_dir = os.path.join(self.static_dir, 'sounds')
+        return {
+            filename: self.url(f'sounds/{filename}')
+            for filename in sorted(os.listdir(sounds_dir)) if not filename.startswith('.')
+        }
+
+    def is_served(self, filename):
+        """True for the fingerprinted output files, never the manifest itself"""
+        return filename in self._served
+
+    def locate(self, filename):
+        """(directory, file name) that a fingerprinted name is served from"""
+        if filename in self.in_place:
+            return self.static_dir, self.in_place[filename]
+        return self.build_dir, filename
+
+    def encodings_for(self, filename):
+        """Precompressed variants written for filename, best first"""
+        return self.encodings.get(filename, [])
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+def get_asset_manifest():
+    """Return the process-wide AssetManifest, loading it on first use."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = AssetManifest(enabled=Config.ASSETS_BUNDLED)
+    return _manifest
+
+def init_assets(app):
+    """Expose asset_urls(name) and sound_urls() to templates."""
+    app.jinja_env.globals['asset_urls'] = lambda name: get_asset_manifest().urls(name)
+    app.jinja_env.globals['sound_urls'] = lambda: get_asset_manifest().sound_urls()
@@ -1,34 +1,143 @@
 from models.quiz import Question, db
-from typing import List
+from models.data_version import DataVersion, QUESTIONS
+from services.question_cache import get_question_cache
+from services.dedupe_service import DuplicateIndex, DuplicateQuestionError, get_question_bank_index
+from sqlalchemy import insert
+from typing import List, Tuple
 import json
 
 class DatabaseService:
+    # Rows per INSERT statement; larger batches are split into chunks of this size
+    BULK_CHUNK_SIZE = 500
+
     @staticmethod
-    def store_single_question(question: str, options: List[str], correct_answer: str, difficulty: str = 'medium'):
-        """Store a single question in the database"""
+    def store_single_question(question: str, options: List[str], correct_answer: str, difficulty: str = 'medium', topic: str = None):
+        """Store a single question in the database, rejecting duplicates of the bank"""
+        bank = get_question_bank_index()
+        if bank is not None:
+            bank.refresh_if_stale(wait=False)
+            existing_id = bank.find_duplicate(question)
+            if existing_id is not None:
+                raise DuplicateQuestionError(existing_id)
+
         db_question = Question(
             question=question,
             options=options,
             correct_answer=correct_answer,
             difficulty=difficulty,
+            topic=topic,
         )
-        
+
         db.session.add(db_question)
+        DataVersion.bump(QUESTIONS)
         db.session.commit()
+        DatabaseService._invalidate_caches()
+        if bank is not None:
+            bank.record(db_question.id, question)
         return db_question
 
+    @staticmethod
+    def _invalidate_caches():
+        """Let this process's question cache see a save at once, not after its next version check"""
+        cache = get_question_cache()
+        if cache is not None:
+            cache.invalidate()
+
+    @staticmethod
+    def _question_row(q: dict) -> dict:
+        """Build an insert row from a question dict, raising ValueError if it is unusable"""
+        for field in ('question', 'options', 'correct_answer'):
+            if not q.get(field):
+                raise ValueError(f"Missing {field}")
+        if not isinstance(q['options'], list):
+            raise ValueError("Options must be a list")
+        topic_length = Question.__table__.c.topic.type.length
+        if q.get('topic') and len(q['topic']) > topic_length:
+            raise ValueError(f"Topic longer than {topic_length} characters")
+
+        return {
+            'question': q['question'],
+            'options': q['options'],
+            'correct_answer': q['correct_answer'],
+            'difficulty': q.get('difficulty', 'medium'),
+            'topic': q.get('topic'),
+        }
+
+    @staticmethod
+    def _insert_rows(rows: List[Tuple[int, dict]], saved: dict, failures: list):
+        """Insert rows under a savepoint, bisecting on failure to isolate bad rows"""
+        try:
+            with db.session.begin_nested():
+                ids = db.session.execute(
+                    insert(Question).returning(Question.id, sort_by_parameter_order=True),
+                    [row for _, row in rows]
+                ).scalars().all()
+        except Exception as e:
+            if len(rows) == 1:
+                index, row = rows[0]
+                failures.append({'index': index, 'question': row['question'], 'error': str(e.__cause__ or e).strip()})
+                return
+            middle = len(rows) // 2
+            DatabaseService._insert_rows(rows[:middle], saved, failures)
+            DatabaseService._insert_rows(rows[middle:], saved, failures)
+            return
+
+        for (index, _), question_id in zip(rows, ids):
+            saved[index] = question_id
+
     @staticmethod
     def store_questions(questions: List[dict]):
-        db_questions = []
-        for q in questions:
-            db_question = Question(
-                question=q['question'],
-                options=q['options'],
-                correct_answer=q['correct_answer'],
-                difficulty=q.get('difficulty', 'medium')
-            )
-            db_questions.append(db_question)
-        
-        db.session.add_all(db_questions)
-        db.session.commit()
-        return db_questions
+        """Store many questions in one transaction.
+
+        Rows go in as multi-row INSERT ... RETURNING statements. A statement
+        that fails is retried in halves under savepoints, so one bad row only
+        costs a few extra statements and never aborts the rest of the batch.
+        Rows that duplicate the bank or an earlier row of the batch are
+        rejected before anything is inserted.
+
+        Returns (saved_ids, failures) where saved_ids follows input order and
+        failures is a list of {'index', 'question', 'error'} dicts.
+        """
+        saved = {}
+        failures = []
+        rows = []
+        bank = get_question_bank_index()
+        if bank is not None:
+            bank.refresh_if_stale(wait=False)
+        batch = DuplicateIndex(threshold=bank.threshold) if bank is not None else None
+
+        for index, q in enumerate(questions):
+            try:
+                row = DatabaseService._question_row(q)
+                if bank is not None:
+                    existing_id = bank.find_duplicate(row['question'])
+                    if existing_id is not None:
+                        raise DuplicateQuestionError(existing_id)
+                    earlier = batch.find_duplicate(row['question'])
+                    if earlier is not None:
+                        raise ValueError(f"Duplicate of question at index {earlier}")
+                    batch.add(index, row['question'])
+                rows.append((index, row))
+            except (ValueError, TypeError, AttributeError) as e:
+                text = q.get('question', 'Unknown question') if isinstance(q, dict) else 'Unknown question'
+                failures.append({'index': index, 'question': text, 'error': str(e)})
+
+        try:
+            for start in range(0, len(rows), DatabaseService.BULK_CHUNK_SIZE):
+                DatabaseService._insert_rows(rows[start:start + DatabaseService.BULK_CHUNK_SIZE], saved, failures)
+            if saved:
+                DataVersion.bump(QUESTIONS)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if saved:
+            DatabaseService._invalidate_caches()
+
+        if bank is not None:
+            for index, row in rows:
+                if index in saved:
+                    bank.record(saved[index], row['question'])
+
+        failures.sort(key=lambda failure: failure['index'])
+        return [saved[index] for index in sorted(saved)], failures
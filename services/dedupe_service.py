@@ -0,0 +1,245 @@
+import random
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from config.settings import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+# Words that change with rewording but not with meaning
+_STOPWORDS = frozenset("""
+    a an the of is are was were be what which who whom whose when where why how
+    in on at to for by with from and or this that these those does do did
+    following called known as name named can its
+""".split())
+
+_MASK64 = (1 << 64) - 1
+_MASK32 = 0xFFFFFFFF
+
+def normalize_question(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_NON_WORD.sub(' ', text.lower()).split())
+
+def _shingles(normalized):
+    """Character trigrams of the question's content words"""
+    content = ' '.join(word for word in normalized.split() if word not in _STOPWORDS) or normalized
+    if len(content) <= 3:
+        return {content}
+    return {content[i:i + 3] for i in range(len(content) - 2)}
+
+class DuplicateQuestionError(ValueError):
+    """Raised when a question duplicates one already in the bank"""
+
+    def __init__(self, existing_id):
+        super().__init__(f"Duplicate of question {existing_id}")
+        self.existing_id = existing_id
+
+class DuplicateIndex:
+    """In-memory exact and near-duplicate index over question text.
+
+    Exact duplicates match on a hash of the normalized text. Near duplicates
+    use MinHash signatures over character trigrams of the content words,
+    bucketed with LSH bands so a lookup only compares against the few
+    questions that share a band, then accepts a candidate whose estimated
+    Jaccard similarity reaches the threshold. A lookup takes well under a
+    millisecond at 100k questions; memory is roughly 1 KiB per question,
+    mostly the band buckets.
+    """
+
+    def __init__(self, threshold=None, num_perm=32, bands=8, seed=1):
+        self.threshold = threshold if threshold is not None else Config.QUESTION_DEDUPE_THRESHOLD
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Each hash function is the shingle hash XORed with a random 64-bit salt;
+        # far cheaper than (a * x + b) mod p and accurate enough at this size
+        rng = random.Random(seed)
+        self._salts = [rng.getrandbits(64) for _ in range(num_perm)]
+        self._exact = {}                        # hash(normalized text) -> question id
+        self._buckets = [{} for _ in range(bands)]  # band key -> slot or list of slots
+        self._ids = array('q')                  # slot -> question id
+        self._signatures = array('I')           # num_perm values per slot
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def signature(self, normalized):
+        hashes = [hash(shingle) & _MASK64 for shingle in _shingles(normalized)]
+        return [min([h ^ salt for h in hashes]) & _MASK32 for salt in self._salts]
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def add(self, question_id, text):
+        normalized = normalize_question(text)
+        if not normalized:
+            return
+        signature = self.signature(normalized)
+        with self._lock:
+            self._exact.setdefault(hash(normalized), question_id)
+            slot = len(self._ids)
+            self._ids.append(question_id)
+            self._signatures.extend(signature)
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                existing = bucket.get(key)
+                if existing is None:
+                    bucket[key] = slot
+                elif isinstance(existing, list):
+                    existing.append(slot)
+                else:
+                    bucket[key] = [existing, slot]
+
+    def find_duplicate(self, text):
+        """Return the id of a stored question that duplicates text, or None."""
+        normalized = normalize_question(text)
+        if not normalized:
+            return None
+
+        exact = self._exact.get(hash(normalized))
+        if exact is not None:
+            return exact
+
+        signature = self.signature(normalized)
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            found = bucket.get(key)
+            if found is None:
+                continue
+            if isinstance(found, list):
+                candidates.update(found)
+            else:
+                candidates.add(found)
+
+        best_id, best_score = None, self.threshold
+        num_perm = self.num_perm
+        for slot in candidates:
+            stored = self._signatures[slot * num_perm:(slot + 1) * num_perm]
+            score = sum(1 for x, y in zip(signature, stored) if x == y) / num_perm
+            if score >= best_score:
+                best_id, best_score = self._ids[slot], score
+        return best_id
+
+class QuestionBankIndex(DuplicateIndex):
+    """DuplicateIndex over the questions table, loaded lazily and topped up
+    with newer rows at most every QUESTION_DEDUPE_REFRESH_INTERVAL seconds.
+
+    Lookups never touch the database, so they are safe from worker threads.
+    Questions are never deleted by the app, so only new ids are fetched.
+    Ids are handed out at insert but become visible at commit, so a slow
+    transaction can commit ids below ones already loaded; each refresh
+    re-reads the last refresh_overlap ids below max_id to catch them.
+    """
+
+    def __init__(self, refresh_interval=None, refresh_overlap=None, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh_interval = refresh_interval if refresh_interval is not None else Config.QUESTION_DEDUPE_REFRESH_INTERVAL
+        self.refresh_overlap = refresh_overlap if refresh_overlap is not None else Config.QUESTION_DEDUPE_REFRESH_OVERLAP
+        self.max_id = 0
+        self._indexed = set()       # Ids already added at or above the overlap window
+        self._indexed_lock = threading.Lock()
+        self._refreshed_at = None
+        self._refresh_lock = threading.Lock()
+
+    def _add_once(self, question_id, text):
+        with self._indexed_lock:
+            if question_id in self._indexed:
+                return False
+            self._indexed.add(question_id)
+        self.add(question_id, text)
+        return True
+
+    def _rows_after(self, question_id):
+        """(id, text) of every question with a higher id, in id order"""
+        from config.database import db
+        from models.quiz import Question
+
+        return db.session.query(Question.id, Question.question).filter(
+            Question.id > question_id
+        ).order_by(Question.id).yield_per(5000)
+
+    def refresh(self):
+        """Load questions added since the last refresh; returns the number loaded."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0  # Another thread is already refreshing
+        try:
+            loaded = 0
+            max_id = self.max_id
+            for question_id, text in self._rows_after(max(max_id - self.refresh_overlap, 0)):
+                max_id = max(max_id, question_id)
+                if self._add_once(question_id, text):
+                    loaded += 1
+            self.max_id = max_id
+
+            # Ids below the window are never read again, so need not be remembered
+            floor = max_id - self.refresh_overlap
+            with self._indexed_lock:
+                self._indexed = {question_id for question_id in self._indexed if question_id > floor}
+            self._refreshed_at = time.monotonic()
+            if loaded:
+                logger.info(f"Loaded {loaded} questions into the duplicate index ({len(self)} total)")
+            return loaded
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_logged(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Could not refresh the duplicate index: {str(e)}")
+
+    def refresh_if_stale(self, wait=True):
+        """Refresh when the interval has passed; errors are logged, not raised.
+
+        With wait=False the refresh runs on a background thread, so a cold
+        process does not hold up the request while the bank is indexed;
+        lookups meanwhile see whatever has been loaded so far.
+        """
+        if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        if wait:
+            self._refresh_logged()
+            return
+        if self._refresh_lock.locked():
+            return
+
+        from flask import current_app, has_app_context
+        if not has_app_context():
+            logger.warning("No app context, skipping duplicate index refresh")
+            return
+        app = current_app._get_current_object()
+
+        def run():
+            from config.database import db
+            with app.app_context():
+                try:
+                    self._refresh_logged()
+                finally:
+                    db.session.remove()
+
+        threading.Thread(target=run, name='question-dedupe-refresh', daemon=True).start()
+
+    def record(self, question_id, text):
+        """Add a question this process just stored without waiting for a refresh"""
+        self._add_once(question_id, text)
+
+_bank_index = None
+_bank_index_lock = threading.Lock()
+
+def get_question_bank_index():
+    """Return the shared bank index, or None when deduplication is disabled."""
+    global _bank_index
+    if not Config.QUESTION_DEDUPE_ENABLED:
+        return None
+    if _bank_index is None:
+        with _bank_index_lock:
+            if _bank_index is None:
+                _bank_index = QuestionBankIndex()
+    return _bank_index
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from config.settings import Config
+from services.metrics_service import HASH_QUEUE_WAIT, HASH_REJECTIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+class HashingOverloaded(Exception):
+    """Raised when a hash cannot start soon enough; the caller should answer 503"""
+
+    def __init__(self, reason, retry_after=1):
+        super().__init__(f"Password hashing overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class HashingExecutor:
+    """Admits Argon2 work only while it fits in a memory budget.
+
+    Each job is weighted by the memory its hash allocates: a verify uses
+    the cost stored in that hash, which may predate the current settings,
+    and a new hash uses memory_cost_kib. A job starts once the jobs already
+    running leave room for it, in arrival order; a job larger than the
+    whole budget runs alone. Up to max_queue may wait; beyond that, or once
+    a job has waited queue_timeout seconds, callers get HashingOverloaded
+    instead of tying up a request thread and more memory.
+    """
+
+    def __init__(self, memory_budget_kib, memory_cost_kib, max_queue=8, queue_timeout=5.0):
+        self.memory_budget_kib = max(memory_budget_kib, 1)
+        self.memory_cost_kib = max(memory_cost_kib, 1)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._in_use_kib = 0
+        self._running = 0
+        self._waiting = deque()     # Tickets of queued jobs, oldest first
+        self._changed = threading.Condition()
+
+    def _acquire(self, cost):
+        enqueued_at = time.monotonic()
+        with self._changed:
+            if not self._waiting and self._fits(cost):
+                self._start(cost)
+                HASH_QUEUE_WAIT.observe(0.0)
+                return
+            if len(self._waiting) >= self.max_queue:
+                HASH_REJECTIONS.inc(reason='queue_full')
+                raise HashingOverloaded('queue_full')
+
+            ticket = object()
+            self._waiting.append(ticket)
+            try:
+                while self._waiting[0] is not ticket or not self._fits(cost):
+                    remaining = enqueued_at + self.queue_timeout - time.monotonic()
+                    if remaining <= 0:
+                        # The client has likely given up; skip the expensive part
+                        HASH_REJECTIONS.inc(reason='queue_timeout')
+                        raise HashingOverloaded('queue_timeout', retry_after=int(self.queue_timeout))
+                    self._changed.wait(remaining)
+                self._start(cost)
+            finally:
+                self._waiting.remove(ticket)
+                self._changed.notify_all()  # The next job in line may fit now
+        HASH_QUEUE_WAIT.observe(time.monotonic() - enqueued_at)
+
+    def _fits(self, cost):
+        return self._running == 0 or self._in_use_kib + cost <= self.memory_budget_kib
+
+    def _start(self, cost):
+        self._in_use_kib += cost
+        self._running += 1
+
+    def _release(self, cost):
+        with self._changed:
+            self._in_use_kib -= cost
+            self._running -= 1
+            self._changed.notify_all()
+
+    def run(self, func, *args, memory_kib=None):
+        """Run func(*args) once memory_kib (default memory_cost_kib) fits in the budget
+        and return its result, or raise HashingOverloaded."""
+        cost = min(max(memory_kib or self.memory_cost_kib, 1), self.memory_budget_kib)
+        self._acquire(cost)
+        try:
+            return func(*args)
+        finally:
+            self._release(cost)
+
+    @property
+    def pending(self):
+        """Jobs running or waiting"""
+        with self._changed:
+            return self._running + len(self._waiting)
+
+    @property
+    def in_use_kib(self):
+        with self._changed:
+            return self._in_use_kib
+
+class AttemptLimiter:
+    """Sliding-window attempt counter per key (a username or client IP).
+
+    Keeps at most `limit` timestamps per key and at most max_keys keys,
+    evicting the least recently used, so memory stays bounded under a
+    flood of distinct keys.
+    """
+
+    def __init__(self, limit, window, max_keys=10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._attempts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, key):
+        """Seconds until key may try again, or 0 if it is under the limit"""
+        if not self.limit:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if not attempts:
+                return 0
+            while attempts and now - attempts[0] >= self.window:
+                attempts.popleft()
+            if len(attempts) < self.limit:
+                return 0
+            return max(1, int(self.window - (now - attempts[0])) + 1)
+
+    def record(self, key):
+        if not self.limit:
+            return
+        with self._lock:
+            attempts = self._attempts.pop(key, None)
+            if attempts is None:
+                attempts = deque(maxlen=self.limit)
+            attempts.append(time.monotonic())
+            self._attempts[key] = attempts
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._attempts.pop(key, None)
+
+_executor = None
+_ip_limiter = None
+_user_limiter = None
+_init_lock = threading.Lock()
+
+def get_hashing_executor():
+    """Return the process-wide HashingExecutor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                _executor = HashingExecutor(
+                    Config.HASH_MEMORY_BUDGET_MB * 1024,
+                    Config.PASSWORD_HASH_MEMORY_COST,
+                    max_queue=Config.HASH_MAX_QUEUE,
+                    queue_timeout=Config.HASH_QUEUE_TIMEOUT,
+                )
+                logger.info(f"Password hashing limited to {Config.HASH_MEMORY_BUDGET_MB} MB of Argon2 memory, "
+                            f"{Config.HASH_MAX_QUEUE} queued")
+    return _executor
+
+def get_login_limiters():
+    """Return the (per client IP, per username) login attempt limiters."""
+    global _ip_limiter, _user_limiter
+    if _ip_limiter is None:
+        with _init_lock:
+            if _ip_limiter is None:
+                _user_limiter = AttemptLimiter(Config.LOGIN_USER_FAILURE_LIMIT, Config.LOGIN_USER_WINDOW)
+                _ip_limiter = AttemptLimiter(Config.LOGIN_IP_LIMIT, Config.LOGIN_IP_WINDOW)
+    return _ip_limiter, _user_limiter
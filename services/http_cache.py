@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+from functools import wraps
+from werkzeug.http import is_resource_modified
+from config.settings import Config
+import logging
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'text/javascript',
+    'text/html', 'text/css', 'text/plain', 'image/svg+xml',
+}
+
+def _apply_cache_control(response, directives):
+    for name, value in directives.items():
+        setattr(response.cache_control, name, value)
+
+def cache_control(etag=False, **directives):
+    """Set Cache-Control directives, e.g. no_store=True, on the view's response.
+
+    With etag=True the body is hashed into a weak ETag and a request whose
+    If-None-Match matches gets an empty 304 instead.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+            response = make_response(view(*args, **kwargs))
+            _apply_cache_control(response, directives)
+            if etag and response.status_code == 200:
+                response.add_etag(weak=True)
+                response.make_conditional(request)
+            return response
+        return wrapper
+    return decorator
+
+def conditional(data_version, **directives):
+    """Validate the view's response against a data version instead of its body.
+
+    data_version() returns (version, last modified datetime). When the
+    client already holds that version the view is not run at all and the
+    response is an empty 304, so repeat requests cost one version lookup
+    rather than the queries and serialization behind the body.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import current_app, make_response, request
+            version, last_modified = data_version()
+            stamp = last_modified.isoformat() if last_modified else ''
+            # The timestamp keeps a recreated database from reusing old version numbers
+            etag = hashlib.sha1(f"{version}:{stamp}".encode('utf-8')).hexdigest()[:20]
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            _apply_cache_control(response, directives)
+            return response
+        return wrapper
+    return decorator
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESS_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=Config.COMPRESS_GZIP_LEVEL, mtime=0)
+
+def _choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def init_compression(app):
+    """Compress text responses of at least COMPRESS_MIN_SIZE bytes with brotli
+    (when the brotli package is installed) or gzip, as the client accepts.
+
+    Streamed and file responses pass through untouched, so generation
+    streams still flush as they go.
+    """
+    from flask import request
+
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding(request.accept_encodings)
+        if encoding is None or (response.content_length or 0) < Config.COMPRESS_MIN_SIZE:
+            return response
+
+        response.set_data(_compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names exact bytes, which the encoded body no longer matches
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    logger.info(f"Response compression enabled ({'brotli, gzip' if brotli else 'gzip'})")
@@ -0,0 +1,159 @@
+import json
+import re
+
+# Only these characters change the scanner state; everything else is skipped
+_STRUCTURAL_CHARS = re.compile(r'[{}\[\]"\\]')
+
+# Local repairs applied to a single object's text when it fails to decode
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_LEADING_COMMA = re.compile(r'([\[{])\s*,')
+_REPEATED_COMMA = re.compile(r',(\s*,)+')
+_MISSING_COMMA = re.compile(r'(["}\]]|\d|true|false|null)(\s*\n\s*)(?=["{\[])')
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+class QuestionStreamParser:
+    """Incrementally extract question objects from streamed model output.
+
+    Text is fed in arbitrary chunks. The scanner tracks string/escape state and
+    container nesting, and every object that is a direct element of an array
+    (e.g. each entry of "questions": [...]) is decoded as soon as its closing
+    brace arrives. Only the text of the object currently being read is kept,
+    and repairs are applied to that object alone, so the response is scanned
+    exactly once however malformed it is.
+    """
+
+    def __init__(self):
+        self._offset = 0            # Absolute position of the current chunk
+        self._stack = []            # Open containers, '{' or '['
+        self._in_string = False
+        self._escape_at = -1        # Absolute position of a pending backslash
+        self._candidate_depth = None
+        self._candidate_parts = []
+        self._candidate_from = 0    # Candidate start within the current chunk
+        self._root_parts = []       # Text of a top-level object, kept until it proves to be a wrapper
+        self._root_from = None
+        self.repaired = 0           # Objects that needed a local repair to decode
+        # How each candidate object was decoded: as-is, after a local repair,
+        # after closing a truncated tail, or not at all
+        self.outcomes = {'direct': 0, 'repaired': 0, 'truncated': 0, 'failed': 0}
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the objects it completed."""
+        completed = []
+        if not chunk:
+            return completed
+
+        for match in _STRUCTURAL_CHARS.finditer(chunk):
+            char = match.group()
+            position = self._offset + match.start()
+
+            if self._in_string:
+                if self._escape_at == position - 1:
+                    # Escaped character, including an escaped backslash
+                    self._escape_at = -1
+                elif char == '\\':
+                    self._escape_at = position
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == '{':
+                if not self._stack:
+                    self._root_parts = []
+                    self._root_from = match.start()
+                elif self._candidate_depth is None and self._stack[-1] == '[':
+                    self._candidate_depth = len(self._stack)
+                    self._candidate_parts = []
+                    self._candidate_from = match.start()
+                    # Array elements are extracted individually, so the root text is no longer needed
+                    self._root_from = None
+                    self._root_parts = []
+                self._stack.append('{')
+            elif char == '[':
+                self._stack.append('[')
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if char != '}':
+                    continue
+                if self._candidate_depth is not None and len(self._stack) == self._candidate_depth:
+                    self._candidate_parts.append(chunk[self._candidate_from:match.end()])
+                    obj = self._decode(''.join(self._candidate_parts))
+                    if obj is not None:
+                        completed.append(obj)
+                    self._candidate_depth = None
+                    self._candidate_parts = []
+                elif not self._stack and self._root_from is not None:
+                    # A lone top-level object, e.g. a single question without a wrapper
+                    self._root_parts.append(chunk[self._root_from:match.end()])
+                    obj = self._decode(''.join(self._root_parts))
+                    if obj is not None and 'question' in obj:
+                        completed.append(obj)
+                    self._root_from = None
+                    self._root_parts = []
+
+        if self._candidate_depth is not None:
+            self._candidate_parts.append(chunk[self._candidate_from:])
+            self._candidate_from = 0
+        if self._root_from is not None:
+            self._root_parts.append(chunk[self._root_from:])
+            self._root_from = 0
+
+        self._offset += len(chunk)
+        return completed
+
+    def finish(self):
+        """Close a truncated trailing object and return it if it decodes."""
+        if self._candidate_depth is None:
+            return []
+
+        text = ''.join(self._candidate_parts)
+        if self._in_string:
+            text += '"'
+        text += ''.join(_CLOSERS[c] for c in reversed(self._stack[self._candidate_depth:]))
+
+        self._candidate_depth = None
+        self._candidate_parts = []
+        obj = self._decode(text, truncated=True)
+        return [obj] if obj is not None else []
+
+    def _decode(self, text, truncated=False):
+        try:
+            # strict=False tolerates raw newlines and tabs inside strings
+            obj = json.loads(text, strict=False)
+            outcome = 'direct'
+        except json.JSONDecodeError:
+            obj = self._decode_repaired(text)
+            outcome = 'repaired'
+        if not isinstance(obj, dict):
+            self.outcomes['failed'] += 1
+            return None
+        self.outcomes['truncated' if truncated else outcome] += 1
+        return obj
+
+    def _decode_repaired(self, text):
+        repaired = _REPEATED_COMMA.sub(',', text)
+        repaired = _LEADING_COMMA.sub(r'\1', repaired)
+        repaired = _TRAILING_COMMA.sub(r'\1', repaired)
+        repaired = _MISSING_COMMA.sub(r'\1,\2', repaired)
+        try:
+            obj = json.loads(repaired, strict=False)
+        except json.JSONDecodeError:
+            return None
+        self.repaired += 1
+        return obj
+
+def extract_questions(text):
+    """Extract every question object from a complete, possibly malformed response.
+
+    Handles markdown fences, surrounding prose, missing or trailing commas
+    between questions and truncated output in a single pass.
+    """
+    if not text:
+        return []
+
+    parser = QuestionStreamParser()
+    return parser.feed(text) + parser.finish()
@@ -0,0 +1,256 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cached page render up to a slow multi-batch generation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing count, one series per label combination."""
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self, items):
+        return [f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+class Gauge(_Metric):
+    """A value that goes up and down, such as a cache's size."""
+
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _render_samples(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+class Histogram(_Metric):
+    """Bucketed observations with running sum and count, as Prometheus expects."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block; an 'outcome' label is set to ok or error."""
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            if 'outcome' in self.labelnames:
+                labels['outcome'] = outcome
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_samples(self, items):
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                bucket_label = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, bucket_label)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, documentation, labelnames=()):
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'triviabyte_http_request_duration_seconds', 'Time to handle a request, by route',
+    ('method', 'endpoint', 'status'))
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    'triviabyte_db_queries_per_request', 'SQL statements executed per request',
+    ('endpoint',), QUERY_COUNT_BUCKETS)
+DB_TIME_PER_REQUEST = REGISTRY.histogram(
+    'triviabyte_db_query_seconds_per_request', 'Time spent in SQL statements per request',
+    ('endpoint',))
+AI_CALL_DURATION = REGISTRY.histogram(
+    'triviabyte_ai_call_duration_seconds', 'AI generation calls including retries, by backend',
+    ('backend', 'operation', 'outcome'))
+AI_CACHE_HITS = REGISTRY.counter(
+    'triviabyte_ai_cache_hits', 'AI responses served from the response cache', ('operation',))
+QUIZ_PARSE_OBJECTS = REGISTRY.counter(
+    'triviabyte_quiz_parse_objects', 'Question objects by how they were decoded from model output',
+    ('strategy',))
+PASSWORD_HASH_DURATION = REGISTRY.histogram(
+    'triviabyte_password_hash_duration_seconds', 'Argon2 hash and verify time',
+    ('operation', 'outcome'))
+HASH_QUEUE_WAIT = REGISTRY.histogram(
+    'triviabyte_password_hash_queue_wait_seconds', 'Time a hash waited for a free slot in the hashing pool')
+HASH_REJECTIONS = REGISTRY.counter(
+    'triviabyte_password_hash_rejections', 'Logins refused before hashing, by reason', ('reason',))
+ANALYTICS_EVENTS_DROPPED = REGISTRY.counter(
+    'triviabyte_analytics_events_dropped', 'Buffered answer events discarded, by reason', ('reason',))
+QUESTION_CACHE_LOOKUPS = REGISTRY.counter(
+    'triviabyte_question_cache_lookups', 'Play-mode question samples by how they were served',
+    ('outcome',))
+QUESTION_CACHE_BYTES = REGISTRY.gauge(
+    'triviabyte_question_cache_bytes', 'Memory held by cached question records, by difficulty',
+    ('difficulty',))
+QUESTION_CACHE_QUESTIONS = REGISTRY.gauge(
+    'triviabyte_question_cache_questions', 'Questions held in the question cache, by difficulty',
+    ('difficulty',))
+
+def record_parse_outcomes(outcomes):
+    """Add a QuestionStreamParser's decode outcomes to the parse counter."""
+    for strategy, count in outcomes.items():
+        if count:
+            QUIZ_PARSE_OBJECTS.inc(count, strategy=strategy)
+
+def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    from flask import has_request_context
+    if has_request_context():
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    from flask import g, has_request_context
+    starts = conn.info.get('query_start')
+    if not has_request_context() or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    g.metrics_query_count = g.get('metrics_query_count', 0) + 1
+    g.metrics_query_time = g.get('metrics_query_time', 0.0) + elapsed
+
+def _on_handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    starts = connection.info.get('query_start') if connection is not None else None
+    if starts:
+        starts.pop()
+
+def init_metrics(app):
+    """Time every request and count its SQL statements.
+
+    Streamed responses are timed until their first byte, when the view
+    returns; time spent generating the rest of the body is not included.
+    """
+    from flask import g, request
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    # Listeners are global, so several apps in one process share them
+    if not event.contains(Engine, 'before_cursor_execute', _on_before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _on_before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _on_after_cursor_execute)
+        event.listen(Engine, 'handle_error', _on_handle_error)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        # The route pattern, not the path, keeps label cardinality bounded
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            method=request.method, endpoint=endpoint, status=response.status_code
+        )
+        DB_QUERIES_PER_REQUEST.observe(g.pop('metrics_query_count', 0), endpoint=endpoint)
+        DB_TIME_PER_REQUEST.observe(g.pop('metrics_query_time', 0.0), endpoint=endpoint)
+        return response
+
+    logger.info("Request metrics enabled")
@@ -1,19 +1,25 @@
-from argon2 import PasswordHasher
+from argon2 import PasswordHasher, extract_parameters
 from argon2.exceptions import VerifyMismatchError, InvalidHash
 import secrets
+import time
 import base64
 from config.settings import Config
+from services.metrics_service import PASSWORD_HASH_DURATION
 import logging
 
 logger = logging.getLogger(__name__)
 
 class PasswordService:
-    def __init__(self):
-        """Initialize password service with Argon2 configuration."""
+    def __init__(self, time_cost=None, memory_cost=None, parallelism=None):
+        """Initialize password service with Argon2 configuration.
+
+        Costs default to the PASSWORD_HASH_* settings; the calibration tool
+        passes candidates explicitly.
+        """
         self.ph = PasswordHasher(
-            time_cost=Config.PASSWORD_HASH_TIME_COST,
-            memory_cost=Config.PASSWORD_HASH_MEMORY_COST,
-            parallelism=Config.PASSWORD_HASH_PARALLELISM,
+            time_cost=time_cost or Config.PASSWORD_HASH_TIME_COST,
+            memory_cost=memory_cost or Config.PASSWORD_HASH_MEMORY_COST,
+            parallelism=parallelism or Config.PASSWORD_HASH_PARALLELISM,
             hash_len=Config.PASSWORD_HASH_LENGTH,
             salt_len=Config.PASSWORD_SALT_LENGTH
         )
@@ -38,7 +44,8 @@ class PasswordService:
             salted = peppered + salt
             
             # Hash the combination
-            password_hash = self.ph.hash(salted)
+            with PASSWORD_HASH_DURATION.time(operation='hash'):
+                password_hash = self.ph.hash(salted)
             
             # Encode salt for storage
             salt_b64 = base64.b64encode(salt).decode('utf-8')
@@ -70,7 +77,13 @@ class PasswordService:
             salted = peppered + salt
             
             # Verify the password
-            self.ph.verify(stored_hash, salted)
+            started = time.perf_counter()
+            try:
+                self.ph.verify(stored_hash, salted)
+            except VerifyMismatchError:
+                PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation='verify', outcome='mismatch')
+                raise
+            PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation='verify', outcome='ok')
             return True
             
         except VerifyMismatchError:
@@ -82,6 +95,21 @@ class PasswordService:
             logger.error(f"Error verifying password: {str(e)}")
             return False
 
+    def memory_cost(self, stored_hash: str) -> int:
+        """
+        Memory in KiB that verifying stored_hash allocates.
+        
+        Args:
+            stored_hash: The stored Argon2 hash
+            
+        Returns:
+            int: The hash's own memory cost, or the configured one if it cannot be parsed
+        """
+        try:
+            return extract_parameters(stored_hash).memory_cost
+        except Exception:
+            return self.ph.memory_cost
+
     def needs_rehash(self, stored_hash: str) -> bool:
         """
         Check if the hash needs to be updated due to parameter changes.
@@ -0,0 +1,174 @@
+import threading
+from contextlib import contextmanager
+from sqlalchemy import func, select, text
+from config.settings import Config
+from config.database import db
+from models.quiz import Question
+from services.database_service import DatabaseService
+import logging
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+# First key of the advisory locks held while refilling a pool slot
+_SLOT_LOCK_NAMESPACE = 7301
+# Transaction-scoped, so the lock also holds behind a transaction-mode pgbouncer
+_TRY_SLOT_LOCK = text("SELECT pg_try_advisory_xact_lock(:namespace, hashtext(:slot))")
+
+class QuestionPoolManager:
+    """Keep a stock of pre-generated questions per (topic, difficulty).
+
+    Refills run outside any user request: generation happens first, then
+    the new questions are inserted in a single commit, so /random-questions
+    keeps serving the existing pool the whole time. While a slot refills,
+    a Postgres advisory lock on it is held in a transaction of its own;
+    other processes (e.g. each gunicorn worker's refill thread) skip slots
+    they cannot lock.
+    """
+
+    def __init__(self, quiz_service=None, topics=None, target=None, low_water=None):
+        self._quiz_service = quiz_service
+        self.topics = topics if topics is not None else Config.QUESTION_POOL_TOPICS
+        self.target = target if target is not None else Config.QUESTION_POOL_TARGET
+        self.low_water = low_water if low_water is not None else Config.QUESTION_POOL_LOW_WATER
+        self._refilling = set()
+        self._lock = threading.Lock()
+
+    @property
+    def quiz_service(self):
+        # Resolved on first refill so merely importing the pool never loads the AI client
+        if self._quiz_service is None:
+            from services.quiz_service import get_quiz_service
+            self._quiz_service = get_quiz_service()
+        return self._quiz_service
+
+    def stock_levels(self):
+        """Return {(topic, difficulty): count} for every configured pool slot."""
+        rows = db.session.query(
+            Question.topic, Question.difficulty, func.count(Question.id)
+        ).filter(
+            Question.topic.in_(self.topics)
+        ).group_by(Question.topic, Question.difficulty).all()
+
+        counts = {(topic, difficulty): count for topic, difficulty, count in rows}
+        return {
+            (topic, difficulty): counts.get((topic, difficulty), 0)
+            for topic in self.topics
+            for difficulty in DIFFICULTIES
+        }
+
+    def shortfalls(self):
+        """Return slots below the low-water mark with the count needed to reach target."""
+        return {
+            slot: self.target - count
+            for slot, count in self.stock_levels().items()
+            if count < self.low_water
+        }
+
+    @contextmanager
+    def _slot_lock(self, topic, difficulty):
+        """Yield a connection holding the slot's advisory lock, or None if another process holds it"""
+        with db.engine.connect() as conn, conn.begin():
+            acquired = conn.execute(_TRY_SLOT_LOCK, {
+                'namespace': _SLOT_LOCK_NAMESPACE, 'slot': f"{topic}/{difficulty}"
+            }).scalar()
+            yield conn if acquired else None
+
+    def refill_slot(self, topic, difficulty, count):
+        """Generate and store questions for one slot; returns the number stored."""
+        slot = (topic, difficulty)
+        with self._lock:
+            if slot in self._refilling:
+                logger.info(f"Refill already running for {topic}/{difficulty}")
+                return 0
+            self._refilling.add(slot)
+
+        try:
+            with self._slot_lock(topic, difficulty) as conn:
+                if conn is None:
+                    logger.info(f"Refill for {topic}/{difficulty} is running in another process")
+                    return 0
+                # Another process may have filled the slot since the shortfall was read
+                stock = conn.execute(select(func.count(Question.id)).where(
+                    Question.topic == topic, Question.difficulty == difficulty
+                )).scalar()
+                count = min(count, self.target - stock)
+                if count <= 0:
+                    return 0
+                return self._generate_and_store(topic, difficulty, count)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error refilling {topic}/{difficulty}: {str(e)}")
+            return 0
+        finally:
+            with self._lock:
+                self._refilling.discard(slot)
+
+    def _generate_and_store(self, topic, difficulty, count):
+        logger.info(f"Refilling {topic}/{difficulty} with {count} questions")
+        questions = self.quiz_service.generate_quiz(
+            topic=topic,
+            num_questions=count,
+            question_types=['multiple_choice'],
+            difficulty=difficulty,
+            use_cache=False  # A refill stores what it gets, so a cached response is always a duplicate
+        )
+        if not questions:
+            logger.warning(f"No questions generated for {topic}/{difficulty}")
+            return 0
+
+        for question in questions:
+            question['topic'] = topic
+            question['difficulty'] = difficulty
+        saved_ids, failures = DatabaseService.store_questions(questions)
+        if failures:
+            logger.warning(f"{len(failures)} generated questions for {topic}/{difficulty} were rejected")
+        logger.info(f"Stored {len(saved_ids)} questions for {topic}/{difficulty}")
+        return len(saved_ids)
+
+    def refill_once(self):
+        """Top up every slot below its low-water mark; returns questions stored."""
+        shortfalls = self.shortfalls()
+        # Release the read transaction; each refill holds only its slot lock's connection
+        db.session.close()
+
+        stored = 0
+        for (topic, difficulty), count in shortfalls.items():
+            stored += self.refill_slot(topic, difficulty, count)
+        return stored
+
+class PoolRefillWorker(threading.Thread):
+    """Daemon thread that runs QuestionPoolManager.refill_once on an interval."""
+
+    def __init__(self, app, manager, interval):
+        super().__init__(name='question-pool-refill', daemon=True)
+        self.app = app
+        self.manager = manager
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.manager.refill_once()
+                except Exception as e:
+                    logger.error(f"Question pool refill failed: {str(e)}")
+                finally:
+                    db.session.remove()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+def start_pool_worker(app):
+    """Start the background refill worker if the pool is configured."""
+    if not Config.QUESTION_POOL_TOPICS:
+        logger.info("No question pool topics configured, refill worker not started")
+        return None
+
+    worker = PoolRefillWorker(app, QuestionPoolManager(), Config.QUESTION_POOL_REFILL_INTERVAL)
+    worker.start()
+    logger.info(f"Question pool refill worker started for {len(Config.QUESTION_POOL_TOPICS)} topics")
+    return worker
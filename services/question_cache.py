@@ -0,0 +1,193 @@
+import json
+import random
+import sys
+import threading
+import time
+from array import array
+from config.settings import Config
+from services.metrics_service import QUESTION_CACHE_BYTES, QUESTION_CACHE_LOOKUPS, QUESTION_CACHE_QUESTIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only these are cached, so arbitrary ?difficulty= values cannot grow the cache
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Postgres encodes each question as /random-questions sends it, keys in the
+# sorted order jsonify uses; several times faster than decoding the rows and
+# encoding them again in Python
+_ENCODED_QUESTIONS_SQL = """
+    SELECT row_to_json(q)::text FROM (
+        SELECT correct_answer, created_at, difficulty, id, options, question, 'multiple_choice' AS type
+        FROM questions WHERE difficulty = :difficulty
+    ) AS q
+"""
+
+def questions_payload(difficulty, records):
+    """The /random-questions success body wrapped around encoded questions"""
+    return b''.join([
+        b'{"count":', str(len(records)).encode('ascii'),
+        b',"difficulty":', json.dumps(difficulty).encode('utf-8'),
+        b',"questions":[', b','.join(records), b'],"status":"success"}\n',
+    ])
+
+class _Shard:
+    """The encoded questions of one difficulty packed into a single buffer,
+    with an offset per question; no Python object per question."""
+
+    __slots__ = ('data', 'offsets', 'version')
+
+    def __init__(self, version):
+        self.data = bytearray()
+        self.offsets = array('I', [0])
+        self.version = version
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def add(self, record):
+        self.data += record
+        self.offsets.append(len(self.data))
+
+    def freeze(self):
+        # bytes drops the spare capacity a growing bytearray keeps
+        self.data = bytes(self.data)
+
+    @property
+    def nbytes(self):
+        return sys.getsizeof(self.data) + sys.getsizeof(self.offsets)
+
+    def sample(self, count):
+        offsets, data = self.offsets, self.data
+        picks = random.sample(range(len(self)), min(count, len(self)))
+        return [data[offsets[i]:offsets[i + 1]] for i in picks]
+
+class QuestionCache:
+    """Play-mode questions per difficulty, held in memory as pre-encoded JSON.
+
+    A difficulty is loaded the first time it is asked for. Every question
+    save bumps the 'questions' DataVersion in its own transaction, and the
+    cache reads that version at most every check_interval seconds, so in
+    steady state a sample costs no database query. A process sees its own
+    saves at once and other processes' within check_interval. A stale
+    difficulty is rebuilt in full rather than topped up by id, since ids
+    can commit out of order; other threads keep sampling the old copy
+    meanwhile.
+
+    Memory is the encoded JSON plus 4 bytes per question. A difficulty
+    that would take the total past max_bytes is not cached and is sampled
+    from the database instead.
+    """
+
+    def __init__(self, check_interval=None, max_bytes=None):
+        self.check_interval = check_interval if check_interval is not None else Config.QUESTION_CACHE_CHECK_INTERVAL
+        self.max_bytes = max_bytes if max_bytes is not None else Config.QUESTION_CACHE_MAX_MB * 1024 * 1024
+        self._shards = {}
+        self._over_budget = {}      # difficulty -> version it did not fit at
+        self._version = None
+        self._checked_at = None
+        self._load_lock = threading.Lock()
+
+    def invalidate(self):
+        """Re-read the version on the next sample, e.g. after this process saved questions"""
+        self._checked_at = None
+
+    def _current_version(self):
+        from models.data_version import DataVersion, QUESTIONS
+
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self._version = DataVersion.get(QUESTIONS)
+            self._checked_at = now
+        return self._version
+
+    def sample(self, difficulty, count):
+        """Up to count encoded questions of difficulty, or None when the cache
+        cannot serve it and the caller should query the database."""
+        if difficulty not in DIFFICULTIES:
+            return None
+        shard = self._shards.get(difficulty)
+        outcome = 'hit'
+        try:
+            version = self._current_version()
+            if shard is None or shard.version != version:
+                shard = self._load(difficulty, version, shard)
+                outcome = 'load'
+        except Exception as e:
+            from config.database import db
+            db.session.rollback()
+            logger.error(f"Could not refresh the question cache: {str(e)}")
+            shard = None
+        if shard is None:
+            QUESTION_CACHE_LOOKUPS.inc(outcome='fallback')
+            return None
+        QUESTION_CACHE_LOOKUPS.inc(outcome=outcome)
+        return shard.sample(count)
+
+    def _load(self, difficulty, version, stale):
+        if self._over_budget.get(difficulty) == version:
+            return None
+        # With an older copy to hand, don't queue behind another thread's rebuild
+        if not self._load_lock.acquire(blocking=stale is None):
+            return stale
+        try:
+            shard = self._shards.get(difficulty)
+            if shard is not None and shard.version == version:
+                return shard  # Loaded while this thread waited
+            return self._build(difficulty, version)
+        finally:
+            self._load_lock.release()
+
+    def _build(self, difficulty, version):
+        from sqlalchemy import text
+        from config.database import db
+
+        start = time.perf_counter()
+        budget = self.max_bytes - sum(shard.nbytes for name, shard in self._shards.items() if name != difficulty)
+        shard = _Shard(version)
+        result = db.session.execute(
+            text(_ENCODED_QUESTIONS_SQL).execution_options(yield_per=2000),
+            {'difficulty': difficulty}
+        ).scalars()
+        for record in result:
+            shard.add(record.encode('utf-8'))
+            if shard.nbytes > budget:
+                result.close()
+                self._shards.pop(difficulty, None)
+                self._over_budget[difficulty] = version
+                self._record_size(difficulty, None)
+                logger.warning(f"{difficulty} questions exceed the {self.max_bytes // (1024 * 1024)} MB "
+                               f"question cache; sampling them from the database")
+                return None
+
+        shard.freeze()
+        self._shards[difficulty] = shard
+        self._record_size(difficulty, shard)
+        logger.info(f"Cached {len(shard)} {difficulty} questions ({shard.nbytes // 1024} KiB) "
+                    f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return shard
+
+    def _record_size(self, difficulty, shard):
+        QUESTION_CACHE_BYTES.set(shard.nbytes if shard else 0, difficulty=difficulty)
+        QUESTION_CACHE_QUESTIONS.set(len(shard) if shard else 0, difficulty=difficulty)
+
+    def stats(self):
+        """{difficulty: {'questions', 'bytes', 'version'}} for what is currently cached"""
+        return {
+            difficulty: {'questions': len(shard), 'bytes': shard.nbytes, 'version': shard.version}
+            for difficulty, shard in self._shards.items()
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_question_cache():
+    """Return the process-wide QuestionCache, or None when it is disabled."""
+    global _cache
+    if not Config.QUESTION_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QuestionCache()
+    return _cache
@@ -1,12 +1,27 @@
-import json
-from services.ai_service import AIService
-from services.database_service import DatabaseService
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.ai_service import get_ai_service
+from services.ai_client import AIServiceError
+from services.json_stream import QuestionStreamParser
+from services.metrics_service import record_parse_outcomes
+from services.dedupe_service import DuplicateIndex, get_question_bank_index
+from config.settings import Config
+import logging
+
+logger = logging.getLogger(__name__)
 
 class QuizService:
-    def __init__(self):
-        self.ai_service = AIService()
+    def __init__(self, ai_service=None):
+        self._ai_service = ai_service
+
+    @property
+    def ai_service(self):
+        # Resolved on first generation so constructing the service stays cheap
+        if self._ai_service is None:
+            self._ai_service = get_ai_service()
+        return self._ai_service
 
-    def _create_prompt(self, topic, num_questions, question_types, difficulty='medium'):
+    def _create_prompt(self, topic, num_questions, question_types, difficulty='medium', batch_label=None):
         difficulty_descriptions = {
             'easy': 'basic knowledge that most people would know, suitable for beginners',
             'medium': 'moderate difficulty requiring some general knowledge',
@@ -15,10 +30,16 @@ class QuizService:
         
         difficulty_desc = difficulty_descriptions.get(difficulty, 'moderate difficulty')
         
+        # Sharded generation labels each batch so concurrent batches explore
+        # different aspects of the topic and get distinct cache keys
+        batch_note = ''
+        if batch_label:
+            batch_note = f"\n        This is {batch_label} of a larger quiz - focus on aspects of {topic} that other batches are unlikely to cover.\n"
+        
         return f"""Generate {num_questions} {difficulty} difficulty general knowledge multiple choice questions that test a broad understanding of {topic}.
         
         Difficulty Level: {difficulty.upper()} - Questions should be {difficulty_desc}.
-        
+        {batch_note}
         Strictly follow these rules:
         - Questions should cover diverse aspects of {topic} that an educated person might know
         - Adjust complexity based on difficulty: {difficulty_desc}
@@ -49,230 +70,16 @@ class QuizService:
         - Use proper JSON formatting with no trailing commas
         """
 
-    def _clean_response(self, text):
-        """Clean the response to ensure it's valid JSON with comprehensive error handling"""
-        if not text or not text.strip():
-            return ""
-        
-        text = text.strip()
-        
-        # Remove common markdown code block markers
-        if text.startswith('```json'):
-            text = text[7:]
-        elif text.startswith('```'):
-            text = text[3:]
-        
-        if text.endswith('```'):
-            text = text[:-3]
-        
-        text = text.strip()
-        
-        # Find JSON boundaries more robustly
-        try:
-            # Look for the first { or [ to start JSON
-            start_idx = -1
-            for i, char in enumerate(text):
-                if char in '{[':
-                    start_idx = i
-                    break
-            
-            if start_idx == -1:
-                # No JSON start found
-                return ""
-            
-            # Find the matching closing bracket
-            bracket_count = 0
-            brace_count = 0
-            end_idx = -1
-            start_char = text[start_idx]
-            
-            for i in range(start_idx, len(text)):
-                char = text[i]
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                elif char == '[':
-                    bracket_count += 1
-                elif char == ']':
-                    bracket_count -= 1
-                
-                # Check if we've closed all brackets/braces
-                if start_char == '{' and brace_count == 0 and i > start_idx:
-                    end_idx = i
-                    break
-                elif start_char == '[' and bracket_count == 0 and i > start_idx:
-                    end_idx = i
-                    break
-            
-            if end_idx != -1:
-                text = text[start_idx:end_idx + 1]
-            else:
-                text = text[start_idx:]
-            
-            # Additional cleaning
-            text = text.strip()
-            
-            # Fix common JSON issues
-            text = self._fix_json_issues(text)
-            
-            return text
-        except Exception as e:
-            print(f"Error cleaning response: {e}")
-            return text.strip()
-    
-    def _fix_json_issues(self, text):
-        """Fix common JSON formatting issues"""
-        try:
-            import re
-            
-            # Remove trailing commas before closing brackets/braces
-            text = re.sub(r',(\s*[}\]])', r'\1', text)
-            
-            # Fix empty arrays that start with comma
-            text = re.sub(r'\[\s*,', '[', text)
-            
-            # Fix arrays/objects that start with comma after opening bracket
-            text = re.sub(r'(\[|\{)\s*,', r'\1', text)
-            
-            # Fix multiple consecutive commas
-            text = re.sub(r',\s*,+', ',', text)
-            
-            # Fix unterminated strings by adding missing quotes
-            lines = text.split('\n')
-            fixed_lines = []
-            
-            for line in lines:
-                original_line = line
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Skip lines that are just structural JSON
-                if line in ['{', '}', '[', ']', ',']:
-                    fixed_lines.append(line)
-                    continue
-                
-                # Count quotes to detect unterminated strings
-                quote_count = line.count('"')
-                if quote_count > 0 and quote_count % 2 != 0:
-                    # Odd number of quotes - likely unterminated string
-                    if line.endswith(','):
-                        line = line[:-1] + '",'
-                    elif line.endswith('}') or line.endswith(']'):
-                        last_char = line[-1]
-                        line = line[:-1] + '"' + last_char
-                    else:
-                        line = line + '"'
-                
-                fixed_lines.append(line)
-            
-            result = '\n'.join(fixed_lines)
-            
-            # Final cleanup of trailing commas
-            result = re.sub(r',(\s*[}\]])', r'\1', result)
-            
-            return result
-        except Exception as e:
-            print(f"Error fixing JSON issues: {e}")
-            return text
-    
-    def _advanced_json_repair(self, text):
-        """Advanced JSON repair using regular expressions"""
-        try:
-            import re
-            
-            # Start with basic fixes
-            repaired = self._fix_json_issues(text)
-            
-            # More aggressive comma fixing
-            # Remove trailing commas before any closing bracket or brace
-            repaired = re.sub(r',\s*(?=[}\]])', '', repaired)
-            
-            # Fix cases where there's a comma right after opening bracket
-            repaired = re.sub(r'(\[|\{)\s*,', r'\1', repaired)
-            
-            # Fix missing commas between array elements (simple heuristic)
-            # Look for pattern: "text" followed by newline and quote (missing comma)
-            repaired = re.sub(r'("\s*)\n\s*(?=")', r'\1,\n', repaired)
-            
-            # Fix missing commas between object properties
-            repaired = re.sub(r'(},?\s*)\n\s*(?=")', r'},\n', repaired)
-            
-            # Remove any double commas that might have been introduced
-            repaired = re.sub(r',,+', ',', repaired)
-            
-            # Final cleanup pass
-            repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
-            
-            # Validate that we have proper JSON structure
-            brace_count = repaired.count('{') - repaired.count('}')
-            bracket_count = repaired.count('[') - repaired.count(']')
-            
-            if brace_count != 0 or bracket_count != 0:
-                print(f"Warning: Unbalanced braces ({brace_count}) or brackets ({bracket_count})")
-                return None
-            
-            return repaired
-            
-        except Exception as e:
-            print(f"Error in advanced JSON repair: {e}")
-            return None
-    
-    def _debug_json_repair(self, text):
-        """Debug version with detailed logging"""
-        try:
-            import re
-            
-            print("=== Debug JSON Repair ===")
-            print(f"Original length: {len(text)}")
-            
-            # Step 1: Remove trailing commas
-            step1 = re.sub(r',(\s*[}\]])', r'\1', text)
-            changes1 = len(re.findall(r',\s*[}\]]', text))
-            print(f"Step 1: Removed {changes1} trailing commas")
-            
-            # Step 2: Fix leading commas in arrays
-            step2 = re.sub(r'(\[|\{)\s*,', r'\1', step1)
-            changes2 = len(re.findall(r'(\[|\{)\s*,', step1))
-            print(f"Step 2: Fixed {changes2} leading commas")
-            
-            # Step 3: Remove multiple consecutive commas
-            step3 = re.sub(r',\s*,+', ',', step2)
-            changes3 = len(re.findall(r',\s*,+', step2))
-            print(f"Step 3: Fixed {changes3} consecutive commas")
-            
-            # Step 4: Fix array beginnings with comma
-            step4 = re.sub(r'\[\s*,', '[', step3)
-            changes4 = len(re.findall(r'\[\s*,', step3))
-            print(f"Step 4: Fixed {changes4} arrays starting with comma")
-            
-            print(f"Final length: {len(step4)}")
-            
-            # Test if it's valid JSON
-            try:
-                json.loads(step4)
-                print("✅ Repaired JSON is valid!")
-                return step4
-            except json.JSONDecodeError as e:
-                print(f"❌ Repaired JSON still invalid: {e}")
-                # Show problematic area
-                error_pos = getattr(e, 'pos', 0)
-                start = max(0, error_pos - 50)
-                end = min(len(step4), error_pos + 50)
-                print(f"Problem area: {step4[start:end]}")
-                return None
-                
-        except Exception as e:
-            print(f"Error in debug repair: {e}")
-            return None
-    
-    def _validate_and_sanitize_questions(self, questions_data):
-        """Validate and sanitize questions data"""
+    def _validate_and_sanitize_questions(self, questions_data, bank_duplicates=None):
+        """Validate and sanitize questions data, dropping duplicates of the question bank.
+
+        The text of each bank duplicate is appended to bank_duplicates when given.
+        """
         if not isinstance(questions_data, list):
             return []
         
         sanitized_questions = []
+        bank = get_question_bank_index()
         
         for question in questions_data:
             if not isinstance(question, dict):
@@ -287,6 +94,12 @@ class QuizService:
             if not question_text:
                 continue
             
+            # Only consults the in-memory index, so this is safe on generation threads
+            if bank is not None and bank.find_duplicate(question_text) is not None:
+                if bank_duplicates is not None:
+                    bank_duplicates.append(question_text)
+                continue
+            
             # Sanitize options
             options = question.get('options', [])
             if not isinstance(options, list) or len(options) != 4:
@@ -321,113 +134,217 @@ class QuizService:
         
         return sanitized_questions
     
-    def generate_quiz(self, topic, num_questions, question_types, difficulty='medium'):
+    def _refresh_question_bank(self):
+        """Top up the duplicate index in the background so players never wait on it"""
+        bank = get_question_bank_index()
+        if bank is not None:
+            bank.refresh_if_stale(wait=False)
+
+    def _merge_questions(self, merged, seen, batch, limit):
+        """Append questions from a batch, skipping near-duplicates, up to limit"""
+        for question in batch:
+            if len(merged) >= limit:
+                break
+            if seen.find_duplicate(question['question']) is not None:
+                continue
+            seen.add(len(merged), question['question'])
+            merged.append(question)
+
+    def _generate_sharded(self, topic, num_questions, question_types, difficulty, use_cache=True):
+        """Generate a large quiz as concurrent fixed-size batches.
+
+        Batches run on a bounded thread pool, results are merged and
+        deduplicated in submission order, and any shortfall (truncated or
+        duplicate-heavy batches) is topped up with follow-up rounds.
+
+        If the AI service fails, no further rounds are started; the
+        questions already merged are returned, and AIServiceError is raised
+        when there are none.
+        """
+        batch_size = max(int(Config.QUIZ_BATCH_SIZE), 1)
+        max_workers = max(int(Config.QUIZ_MAX_WORKERS), 1)
+        merged = []
+        seen = DuplicateIndex()
+        ai_error = None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for round_number in range(Config.QUIZ_MAX_TOPUP_ROUNDS + 1):
+                missing = num_questions - len(merged)
+                if missing <= 0:
+                    break
+
+                batch_counts = [batch_size] * (missing // batch_size)
+                if missing % batch_size:
+                    batch_counts.append(missing % batch_size)
+
+                logger.info(f"Round {round_number + 1}: requesting {missing} questions in {len(batch_counts)} batches")
+                futures = [
+                    executor.submit(
+                        self._generate_batch, topic, count, question_types, difficulty,
+                        batch_label=f"batch {index + 1} of {len(batch_counts)} (round {round_number + 1})",
+                        use_cache=use_cache
+                    )
+                    for index, count in enumerate(batch_counts)
+                ]
+
+                for future in futures:
+                    try:
+                        batch = future.result()
+                    except AIServiceError as e:
+                        logger.error(f"Batch generation failed: {str(e)}")
+                        ai_error = e
+                        continue
+                    except Exception as e:
+                        logger.error(f"Batch generation failed: {str(e)}")
+                        continue
+                    self._merge_questions(merged, seen, batch, num_questions)
+
+                if ai_error is not None:
+                    break  # Top-up rounds would fail the same way
+
+        if not merged and ai_error is not None:
+            raise ai_error
+        if len(merged) < num_questions:
+            logger.warning(f"Only generated {len(merged)} of {num_questions} requested questions")
+
+        return merged
+
+    def _iter_parsed(self, parser, chunks):
+        """Yield objects parsed from each chunk, then any truncated trailing object"""
+        for chunk in chunks:
+            yield parser.feed(chunk)
+        yield parser.finish()
+
+    def generate_quiz_stream(self, topic, num_questions, question_types, difficulty='medium', use_cache=True):
+        """Yield validated questions as soon as each one is parsed from the stream.
+
+        Questions are requested in batches of at most QUIZ_BATCH_SIZE, one
+        streamed call at a time, until the requested count is reached or the
+        top-up rounds are exhausted.
+        """
+        num_questions = max(int(num_questions), 1)
+        batch_size = max(int(Config.QUIZ_BATCH_SIZE), 1)
+        planned_batches = -(-num_questions // batch_size)
+        max_batches = planned_batches + Config.QUIZ_MAX_TOPUP_ROUNDS
+        seen = DuplicateIndex()
+        emitted = 0
+        self._refresh_question_bank()
+
+        for batch_number in range(max_batches):
+            missing = num_questions - emitted
+            if missing <= 0:
+                break
+
+            count = min(batch_size, missing)
+            batch_label = None
+            if batch_number >= planned_batches:
+                batch_label = f"top-up batch {batch_number - planned_batches + 1}"
+            elif planned_batches > 1:
+                batch_label = f"batch {batch_number + 1} of {planned_batches}"
+            prompt = self._create_prompt(topic, count, question_types, difficulty, batch_label)
+
+            parser = QuestionStreamParser()
+            bank_duplicates = []
+            chunks = self.ai_service.generate_content_stream(prompt, topic=topic, use_cache=use_cache)
+            try:
+                for parsed in self._iter_parsed(parser, chunks):
+                    for question in self._validate_and_sanitize_questions(parsed, bank_duplicates):
+                        if seen.find_duplicate(question['question']) is not None:
+                            continue
+                        seen.add(emitted, question['question'])
+                        emitted += 1
+                        yield question
+                        if emitted >= num_questions:
+                            return
+            finally:
+                record_parse_outcomes(parser.outcomes)
+
+            if bank_duplicates:
+                # A cached response would keep repeating questions that are now in the bank
+                self.ai_service.evict(prompt, topic=topic)
+                use_cache = False
+
+        logger.info(f"Streamed {emitted} of {num_questions} requested questions")
+
+    def generate_quiz(self, topic, num_questions, question_types, difficulty='medium', use_cache=True):
+        # Remove max limit check, keep minimum of 1
+        num_questions = max(int(num_questions), 1)
+        self._refresh_question_bank()
+
+        if num_questions > Config.QUIZ_BATCH_SIZE:
+            questions = self._generate_sharded(topic, num_questions, question_types, difficulty, use_cache=use_cache)
+            logger.info(f"Successfully generated {len(questions)} questions")
+            return questions
+
+        return self._generate_batch(topic, num_questions, question_types, difficulty, use_cache=use_cache)
+
+    def _generate_batch(self, topic, num_questions, question_types, difficulty='medium', batch_label=None, use_cache=True):
         try:
-            # Remove max limit check, keep minimum of 1
-            num_questions = max(int(num_questions), 1)
-            prompt = self._create_prompt(topic, num_questions, question_types, difficulty)
+            prompt = self._create_prompt(topic, num_questions, question_types, difficulty, batch_label)
             
             # Pass topic for context-aware generation
-            response = self.ai_service.generate_content(prompt, topic=topic)
+            response = self.ai_service.generate_content(prompt, topic=topic, use_cache=use_cache)
             
             # Handle different response types
             if hasattr(response, 'text'):
-                cleaned_text = self._clean_response(response.text)
-            elif isinstance(response, str):
-                cleaned_text = self._clean_response(response)
+                response_text = response.text
             else:
-                cleaned_text = self._clean_response(str(response))
+                response_text = response if isinstance(response, str) else str(response)
             
-            if not cleaned_text:
-                print("Error: No content received from AI service")
+            if not response_text or not response_text.strip():
+                logger.error("No content received from AI service")
                 return []
             
-            # Try multiple parsing strategies
-            quiz_data = None
-            parsing_errors = []
-            
-            # Strategy 1: Direct JSON parsing
-            try:
-                quiz_data = json.loads(cleaned_text)
-            except json.JSONDecodeError as e:
-                parsing_errors.append(f"Direct parsing failed: {e}")
-                
-                # Strategy 2: Try to extract JSON from text using regex
-                try:
-                    import re
-                    # More comprehensive regex to find complete JSON objects
-                    json_pattern = r'\{(?:[^{}]|{[^{}]*})*\}'
-                    matches = re.findall(json_pattern, cleaned_text, re.DOTALL)
-                    if matches:
-                        # Try the longest match first
-                        matches.sort(key=len, reverse=True)
-                        for match in matches:
-                            try:
-                                # Clean the match before parsing
-                                cleaned_match = self._fix_json_issues(match)
-                                quiz_data = json.loads(cleaned_match)
-                                break
-                            except json.JSONDecodeError:
-                                continue
-                except Exception as e2:
-                    parsing_errors.append(f"Regex extraction failed: {e2}")
-                
-                # Strategy 3: Try to fix common JSON issues and parse again
-                if not quiz_data:
-                    try:
-                        fixed_text = self._fix_json_issues(cleaned_text)
-                        quiz_data = json.loads(fixed_text)
-                    except json.JSONDecodeError as e3:
-                        parsing_errors.append(f"Fixed JSON parsing failed: {e3}")
-                
-                # Strategy 4: Advanced regex-based repair and extraction
-                if not quiz_data:
-                    try:
-                        repaired_text = self._advanced_json_repair(cleaned_text)
-                        if repaired_text:
-                            quiz_data = json.loads(repaired_text)
-                    except json.JSONDecodeError as e4:
-                        parsing_errors.append(f"Advanced repair failed: {e4}")
+            # Single pass over the response, repairing each question object locally
+            parser = QuestionStreamParser()
+            questions_data = parser.feed(response_text) + parser.finish()
+            record_parse_outcomes(parser.outcomes)
             
-            if not quiz_data:
-                print(f"Error parsing quiz response after all strategies. Errors: {'; '.join(parsing_errors)}")
-                print(f"Raw response (first 500 chars): {cleaned_text[:500]}")
-                
-                # Final attempt with detailed debug info
-                try:
-                    print("Attempting final detailed repair...")
-                    final_attempt = self._debug_json_repair(cleaned_text)
-                    if final_attempt:
-                        quiz_data = json.loads(final_attempt)
-                        print("✅ Final repair attempt succeeded!")
-                except Exception as final_e:
-                    print(f"Final repair attempt failed: {final_e}")
-                
-                if not quiz_data:
-                    return []
+            if not questions_data:
+                logger.error("Error parsing quiz response: no question objects found")
+                logger.debug(f"Raw response (first 500 chars): {response_text[:500]}")
+                return []
             
-            # Ensure we have a questions array
-            if not isinstance(quiz_data, dict) or 'questions' not in quiz_data:
-                if isinstance(quiz_data, list):
-                    quiz_data = {'questions': quiz_data}
-                else:
-                    print(f"Invalid quiz data format: {type(quiz_data)}")
-                    return []
+            if parser.repaired:
+                logger.info(f"Repaired {parser.repaired} malformed question objects")
             
             # Validate and sanitize questions
-            questions = self._validate_and_sanitize_questions(quiz_data['questions'])
+            bank_duplicates = []
+            questions = self._validate_and_sanitize_questions(questions_data, bank_duplicates)
+            
+            if bank_duplicates:
+                # The response, possibly from the cache, repeats questions already in the bank;
+                # evict it so the next request for this prompt asks the model again
+                self.ai_service.evict(prompt, topic=topic)
+                logger.info(f"Dropped {len(bank_duplicates)} questions already in the bank")
+                if not questions and use_cache:
+                    return self._generate_batch(topic, num_questions, question_types, difficulty,
+                                                batch_label=batch_label, use_cache=False)
             
             if not questions:
-                print("No valid questions found after sanitization")
+                logger.warning("No valid questions found after sanitization")
                 return []
             
-            print(f"Successfully generated {len(questions)} questions")
+            logger.info(f"Successfully generated {len(questions)} questions")
             return questions
             
+        except AIServiceError:
+            # Let callers tell an unavailable AI service apart from a bad response
+            raise
         except Exception as e:
-            print(f"Error generating quiz: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error generating quiz: {str(e)}")
             
             # Fallback: return empty list so the UI can handle it gracefully
             return []
+
+_quiz_service = None
+_quiz_service_lock = threading.Lock()
+
+def get_quiz_service():
+    """Return the process-wide QuizService, creating it on first use."""
+    global _quiz_service
+    if _quiz_service is None:
+        with _quiz_service_lock:
+            if _quiz_service is None:
+                _quiz_service = QuizService()
+    return _quiz_service
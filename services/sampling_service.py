@@ -0,0 +1,70 @@
+import random
+from typing import List
+from sqlalchemy import func, select
+from models.quiz import Question, db
+
+class SamplingService:
+    """Random question sampling that stays fast as the question bank grows.
+
+    Every question carries a uniform random_key indexed together with its
+    difficulty. A sample is drawn by picking random points in [0, 1) and
+    taking the first question at or after each point (wrapping around to the
+    lowest key), so each probe is a single index lookup instead of the full
+    scan and sort that ORDER BY random() needs.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    @staticmethod
+    def _probe_ids(difficulty: str, probes: int) -> set:
+        """Return the ids found by the given number of random index probes"""
+        base = select(Question.id).where(Question.difficulty == difficulty)
+        lowest = base.order_by(Question.random_key).limit(1).scalar_subquery()
+        columns = [
+            func.coalesce(
+                base.where(Question.random_key >= random.random())
+                    .order_by(Question.random_key).limit(1).scalar_subquery(),
+                lowest
+            )
+            for _ in range(probes)
+        ]
+        row = db.session.execute(select(*columns)).first()
+        return {question_id for question_id in row if question_id is not None}
+
+    @staticmethod
+    def sample_ids(difficulty: str, count: int = 5) -> List[int]:
+        """Return up to count distinct random question ids for a difficulty"""
+        ids = set()
+        for _ in range(SamplingService.MAX_ATTEMPTS):
+            needed = count - len(ids)
+            if needed <= 0:
+                break
+            # Probe a little more than needed since probes can land on the same row
+            found = SamplingService._probe_ids(difficulty, needed + 2)
+            if not found:
+                return []
+            ids.update(found)
+
+        if len(ids) < count:
+            # Small banks collide often; a random sort is cheap at that size
+            remaining = db.session.execute(
+                select(Question.id)
+                .where(Question.difficulty == difficulty, Question.id.notin_(ids))
+                .order_by(func.random())
+                .limit(count - len(ids))
+            ).scalars().all()
+            ids.update(remaining)
+
+        ids = list(ids)
+        random.shuffle(ids)
+        return ids[:count]
+
+    @staticmethod
+    def sample_questions(difficulty: str, count: int = 5) -> List[Question]:
+        """Return up to count random questions for a difficulty, in random order"""
+        ids = SamplingService.sample_ids(difficulty, count)
+        if not ids:
+            return []
+
+        questions = {q.id: q for q in Question.query.filter(Question.id.in_(ids)).all()}
+        return [questions[question_id] for question_id in ids if question_id in questions]
@@ -0,0 +1,99 @@
+const QuizAPI={generateQuiz:async function(quizConfig){try{const response=await $.ajax({url:'/generate',method:'POST',contentType:'application/json',data:JSON.stringify(quizConfig)});return response;}catch(error){console.error('API Error:',error);throw error;}},generateQuizStream:async function(quizConfig,onQuestion){const response=await fetch('/generate-stream',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(quizConfig)});if(!response.ok||!response.body){const error=new Error(`Stream request failed with status ${response.status}`);error.streamUnavailable=true;throw error;}
+const reader=response.body.getReader();const decoder=new TextDecoder();let buffer='';let count=0;const handleLine=(line)=>{if(!line.trim())return;const event=JSON.parse(line);if(event.type==='question'){const[question]=this.sanitizeQuestions([event.question]);if(question){count++;onQuestion(question);}}else if(event.type==='error'){throw new Error(event.error||'Quiz generation failed');}};while(true){const{done,value}=await reader.read();if(done)break;buffer+=decoder.decode(value,{stream:true});const lines=buffer.split('\n');buffer=lines.pop();lines.forEach(handleLine);}
+handleLine(buffer+decoder.decode());return count;},saveQuestion:async function(question){try{const response=await $.ajax({url:'/save-question',method:'POST',contentType:'application/json',data:JSON.stringify(question)});return response;}catch(error){console.error('API Error:',error);throw error;}},saveAllQuestions:async function(questions){try{const response=await $.ajax({url:'/save-all-questions',method:'POST',contentType:'application/json',data:JSON.stringify({questions:questions})});return response;}catch(error){console.error('API Error:',error);throw error;}},getRandomQuestions:async function(difficulty='medium'){try{const response=await $.ajax({url:`/random-questions?difficulty=${difficulty}`,method:'GET',contentType:'application/json'});return response;}catch(error){console.error('API Error:',error);throw error;}},parseQuizData:function(response){try{let quizData;if(typeof response==='string'){quizData=this.parseJSONSafely(response);}else if(response.quiz){const rawQuiz=response.quiz;if(typeof rawQuiz==='string'){quizData=this.parseJSONSafely(this.cleanJSONString(rawQuiz));}else if(Array.isArray(rawQuiz)){quizData={questions:rawQuiz};}else{quizData=rawQuiz;}}else if(Array.isArray(response)){quizData={questions:response};}else{quizData=response;}
+if(!quizData||typeof quizData!=='object'){throw new Error('Quiz data must be an object');}
+if(!quizData.questions){if(Array.isArray(quizData)){quizData={questions:quizData};}else{throw new Error('Quiz data must contain questions');}}
+if(!Array.isArray(quizData.questions)){throw new Error('Questions must be an array');}
+const validQuestions=this.sanitizeQuestions(quizData.questions);if(validQuestions.length===0){throw new Error('No valid questions found');}
+quizData.questions=validQuestions;quizData.questions=quizData.questions.map(question=>{if(question.metadata&&question.metadata.grounding_chunks){question.references=question.metadata.grounding_chunks.filter(chunk=>chunk.web&&chunk.web.uri).map(chunk=>({title:chunk.web.title||'Web Source',url:chunk.web.uri}));}
+if(question.metadata&&question.metadata.search_entry_point){question.searchResults=question.metadata.search_entry_point.rendered_content;}
+if(!question.explanation){question.explanation={text:"No explanation available.",references:[]};}else if(typeof question.explanation==='string'){question.explanation={text:question.explanation,references:[]};}else if(typeof question.explanation==='object'){question.explanation={text:question.explanation.text||question.explanation.explanation||"No explanation available.",references:question.explanation.references||[]};}
+return question;});return quizData;}catch(error){console.error('Error parsing quiz data:',error);throw new Error('Failed to parse quiz data: '+error.message);}},cleanJSONString:function(jsonStr){if(!jsonStr)return'';let cleaned=jsonStr.trim();if(cleaned.startsWith('```json')){cleaned=cleaned.substring(7);}
+if(cleaned.startsWith('```')){cleaned=cleaned.substring(3);}
+if(cleaned.endsWith('```')){cleaned=cleaned.substring(0,cleaned.length-3);}
+cleaned=cleaned.trim();const firstBrace=cleaned.indexOf('{');const firstBracket=cleaned.indexOf('[');let startIndex=-1;if(firstBrace!==-1&&(firstBracket===-1||firstBrace<firstBracket)){startIndex=firstBrace;}else if(firstBracket!==-1){startIndex=firstBracket;}
+if(startIndex!==-1){cleaned=cleaned.substring(startIndex);}
+return cleaned;},parseJSONSafely:function(jsonStr){const strategies=[()=>JSON.parse(jsonStr),()=>JSON.parse(this.cleanJSONString(jsonStr)),()=>{let fixed=this.fixCommonJSONIssues(jsonStr);return JSON.parse(fixed);},()=>{const jsonPattern=/\{[\s\S]*\}/;const match=jsonStr.match(jsonPattern);if(match){return JSON.parse(match[0]);}
+throw new Error('No JSON pattern found');}];let lastError=null;for(const strategy of strategies){try{return strategy();}catch(error){lastError=error;continue;}}
+throw new Error('All JSON parsing strategies failed. Last error: '+lastError.message);},fixCommonJSONIssues:function(jsonStr){let fixed=jsonStr;try{const lines=fixed.split('\n');const fixedLines=lines.map(line=>{line=line.trim();if(!line||line==='{'||line==='}'||line==='['||line===']'||line===','){return line;}
+const quoteCount=(line.match(/"/g)||[]).length;if(quoteCount%2!==0){if(line.endsWith(',')){line=line.slice(0,-1)+'",';}else if(line.endsWith('}')||line.endsWith(']')){const lastChar=line.slice(-1);line=line.slice(0,-1)+'"'+lastChar;}else{line=line+'"';}}
+return line;});fixed=fixedLines.join('\n');fixed=fixed.replace(/"\s*\n\s*"/g,'",\n"');fixed=fixed.replace(/}\s*\n\s*{/g,'},\n{');fixed=fixed.replace(/,\s*]/g,']');fixed=fixed.replace(/,\s*}/g,'}');}catch(error){console.warn('Error fixing JSON issues:',error);}
+return fixed;},sanitizeQuestions:function(questions){if(!Array.isArray(questions)){return[];}
+const validQuestions=[];const seenQuestions=new Set();for(const question of questions){if(!question||typeof question!=='object'){continue;}
+if(!question.question||!question.options||!question.correct_answer){continue;}
+const questionText=String(question.question).trim();if(!questionText||seenQuestions.has(questionText)){continue;}
+if(!Array.isArray(question.options)||question.options.length!==4){continue;}
+const sanitizedOptions=question.options.map(option=>String(option).trim()).filter(option=>option);if(sanitizedOptions.length!==4){continue;}
+const correctAnswer=String(question.correct_answer).trim();if(!sanitizedOptions.includes(correctAnswer)){continue;}
+const difficulty=(question.difficulty||'medium').toLowerCase();const validDifficulty=['easy','medium','hard'].includes(difficulty)?difficulty:'medium';seenQuestions.add(questionText);validQuestions.push({type:'multiple_choice',question:questionText,options:sanitizedOptions,correct_answer:correctAnswer,difficulty:validDifficulty});}
+return validQuestions;}};;const QuizUI={shuffleArray:function(array){const shuffledArray=[...array];for(let i=shuffledArray.length-1;i>0;i--){const j=Math.floor(Math.random()*(i+1));[shuffledArray[i],shuffledArray[j]]=[shuffledArray[j],shuffledArray[i]];}
+return shuffledArray;},showLoading:function(){$('#quizContainer').addClass('hidden');$('#saveAllQuestions').addClass('hidden');$('button[type="submit"]').prop('disabled',true).html('<span class="inline-block animate-spin rounded-full h-4 w-4 border-b-2 border-white mr-2"></span> Generating...');},hideLoading:function(){$('button[type="submit"]').prop('disabled',false).text('Generate Quiz');},displayMultipleChoice:function(question,index,questionBody){const shuffledOptions=this.shuffleArray(question.options);const mcOptions=$('<div>').addClass('space-y-3');shuffledOptions.forEach((option,optionIndex)=>{mcOptions.append(`
+                <div class="flex items-center">
+                    <input class="mr-3 text-blue-600 cursor-pointer" type="radio" name="q${index}" id="q${index}_${optionIndex}" value="${option}">
+                    <label class="flex-1 py-3 px-4 bg-gray-100 rounded-lg font-medium cursor-pointer hover:bg-gray-200 transition-colors" for="q${index}_${optionIndex}">${option}</label>
+                </div>
+            `);});questionBody.append(mcOptions);},displayQuiz:function(quiz){this.beginQuiz();quiz.questions.forEach(question=>this.appendQuestion(question));this.finishQuiz();},beginQuiz:function(){$('#questions').empty();this.currentQuiz={questions:[]};return this.currentQuiz;},appendQuestion:function(question){const index=this.currentQuiz.questions.length;this.currentQuiz.questions.push(question);const questionDiv=$('<div>').addClass('bg-white rounded-lg shadow-sm mb-6');const questionBody=$('<div>').addClass('p-6');const headerDiv=$('<div>').addClass('flex justify-between items-center mb-6');headerDiv.append($('<h5>').addClass('text-lg font-bold').text(`Question ${index + 1}`),$('<button>').addClass('bg-blue-100 text-blue-600 px-4 py-2 rounded-lg shadow-sm hover:bg-blue-200 transition-colors cursor-pointer').attr('data-question-index',index).html('<i class="bi bi-save mr-2"></i>Save').on('click',()=>this.handleSaveQuestion(question)));questionBody.append(headerDiv);questionBody.append($('<p>').addClass('text-gray-800 mb-6').text(question.question));this.displayMultipleChoice(question,index,questionBody);questionDiv.append(questionBody);$('#questions').append(questionDiv);},finishQuiz:function(){const questionsContainer=$('#questions');questionsContainer.append(`
+            <button id="submitQuiz" class="w-full bg-blue-600 text-white py-3 px-6 rounded-lg shadow-sm text-lg font-medium hover:bg-blue-700 transition-colors cursor-pointer">
+                <i class="bi bi-check-circle mr-2"></i>Submit Answers
+            </button>
+        `);$('#saveAllQuestions').removeClass('hidden');$('#saveAllQuestions').off('click').on('click',()=>this.handleSaveAllQuestions());},handleSaveQuestion:async function(question){try{const response=await QuizAPI.saveQuestion(question);if(response.status==='success'){alert('Question saved successfully!');}}catch(error){console.error('Error saving question:',error);alert('Failed to save question. Please try again.');}},handleSaveAllQuestions:async function(){if(!this.currentQuiz||!this.currentQuiz.questions){alert('No questions to save!');return;}
+const $saveAllBtn=$('#saveAllQuestions');const originalText=$saveAllBtn.html();$saveAllBtn.prop('disabled',true).html('<span class="inline-block animate-spin rounded-full h-4 w-4 border-b-2 border-white mr-2"></span>Saving...');try{const response=await QuizAPI.saveAllQuestions(this.currentQuiz.questions);if(response.status==='success'){alert(`All ${response.saved_count} questions saved successfully!`);}else if(response.status==='partial_success'){alert(`Saved ${response.saved_count} questions successfully. ${response.failed_count} questions failed to save.\n\nFailed questions: ${response.failed_questions.join(', ')}`);}else{alert('Failed to save questions. Please try again.');}}catch(error){console.error('Error saving all questions:',error);if(error.responseJSON&&error.responseJSON.status==='partial_success'){const data=error.responseJSON;alert(`Saved ${data.saved_count} questions successfully. ${data.failed_count} questions failed to save.\n\nFailed questions: ${data.failed_questions.join(', ')}`);}else{alert('Failed to save questions. Please try again.');}}finally{$saveAllBtn.prop('disabled',false).html(originalText);}},displayResults:function(answers){const questionsContainer=$('#questions');questionsContainer.empty();$('#saveAllQuestions').addClass('hidden');const correctCount=answers.filter(a=>a.isCorrect).length;const score=Math.round((correctCount/answers.length)*100);const prizeEligible=correctCount>=3;const prizeStatusHtml=prizeEligible
+?'<div class="text-green-600 font-bold text-lg mb-2"><i class="bi bi-trophy mr-2"></i>Prize Winner!</div>'
+:'<div class="text-orange-600 font-bold text-lg mb-2"><i class="bi bi-info-circle mr-2"></i>Need 3+ correct for prize</div>';questionsContainer.prepend(`
+            <div class="bg-white rounded-lg shadow-sm mb-6">
+                <div class="p-6 text-center">
+                    <h3 class="text-2xl font-bold mb-4">Quiz Results</h3>
+                    <div class="text-5xl text-blue-600 font-bold mb-2">${score}%</div>
+                    <div class="text-gray-600 mb-3">${correctCount} out of ${answers.length} correct</div>
+                    ${prizeStatusHtml}
+                    <div class="text-sm text-blue-600 mt-4 p-3 bg-blue-50 rounded-lg border border-blue-200">
+                        <i class="bi bi-info-circle mr-2"></i><strong>Remember:</strong> One try per person. For another attempt, please line up again.
+                    </div>
+                </div>
+            </div>
+        `);answers.forEach((answer,index)=>{const questionDiv=$('<div>').addClass('bg-white rounded-lg shadow-sm mb-4');const questionBody=$('<div>').addClass('p-6');const badge=$('<span>').addClass(`inline-block px-3 py-1 rounded-full text-sm font-medium ${answer.isCorrect ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'}`).text(answer.isCorrect?'Correct':'Incorrect');questionBody.append($('<div>').addClass('flex justify-between items-center mb-4').append($('<h5>').addClass('text-lg font-bold').text(`Question ${index + 1}`),badge));questionBody.append($('<p>').addClass('text-gray-800 mb-4').text(answer.questionText));this.displayResultAnswers(answer,questionBody);questionDiv.append(questionBody);questionsContainer.append(questionDiv);});questionsContainer.append($('<button>').addClass('w-full bg-blue-600 text-white py-3 px-6 rounded-lg shadow-sm text-lg font-medium hover:bg-blue-700 transition-colors mt-6 cursor-pointer').html('<i class="bi bi-arrow-clockwise mr-2"></i>Start New Quiz').on('click',()=>{window.scrollTo({top:0,behavior:'smooth'});setTimeout(()=>{$('#quizForm').trigger('reset');$('#quizContainer').addClass('hidden');$('#saveAllQuestions').addClass('hidden');$('.bg-white.rounded-lg.shadow-md.mb-6').removeClass('hidden');},300);}));},displayResultAnswers:function(answer,container){const answersSection=$('<div>').addClass('mb-4');this.displayMCResult(answer,answersSection);container.append(answersSection);},displayMCResult:function(answer,container){const options=answer.options;options.forEach(option=>{const isUserAnswer=String(answer.userAnswer).toLowerCase()===String(option).toLowerCase();const isCorrectAnswer=String(answer.correctAnswer).toLowerCase()===String(option).toLowerCase();let optionClasses='flex items-center mb-2 p-3 rounded-lg';if(isCorrectAnswer){optionClasses+=' bg-green-50';}
+if(isUserAnswer){optionClasses+=isCorrectAnswer?' border-2 border-green-500':' border-2 border-red-500';}
+const optionDiv=$('<div>').addClass(optionClasses);optionDiv.append($('<div>').addClass('flex items-center flex-1').append($('<input>').addClass('mr-3 text-blue-600').attr({type:'radio',disabled:true,checked:isUserAnswer}),$('<label>').addClass('flex-1 cursor-default').text(option),isUserAnswer&&$('<i>').addClass(`bi bi-${isCorrectAnswer ? 'check-lg text-green-600' : 'x-lg text-red-600'} ml-2`)));container.append(optionDiv);});},isValidUrl:function(url){try{new URL(url);return true;}catch{return false;}},getSourceName:function(url){try{const hostname=new URL(url).hostname;return hostname.replace(/^www\./,'');}catch{return'source';}},};;const QuizLogic={currentQuiz:null,init:function(){console.log('QuizLogic.init() called');this.setupFormSubmission();this.setupQuizSubmission();console.log('QuizLogic.startQuizWithDifficulty available:',typeof this.startQuizWithDifficulty);},setupFormSubmission:function(){$('#quizForm').on('submit',async(e)=>{e.preventDefault();const selectedDifficulty=$('input[name="difficulty"]:checked').val()||'medium';const quizConfig={topic:$('#topic').val(),num_questions:$('#numQuestions').val(),question_types:['multiple_choice'],difficulty:selectedDifficulty,bypass_cache:$('#bypassCache').is(':checked')};QuizUI.showLoading();try{this.currentQuiz=QuizUI.beginQuiz();let streamed=0;let streamUnavailable=false;try{await QuizAPI.generateQuizStream(quizConfig,(question)=>{streamed++;QuizUI.appendQuestion(question);$('#quizContainer').removeClass('hidden');});}catch(streamError){if(streamError.streamUnavailable){console.warn('Streaming unavailable, using the blocking endpoint:',streamError);streamUnavailable=true;}else if(streamed===0){throw streamError;}else{console.warn('Stream ended early:',streamError);}}
+if(streamUnavailable){const response=await QuizAPI.generateQuiz(quizConfig);this.currentQuiz=QuizAPI.parseQuizData(response);QuizUI.displayQuiz(this.currentQuiz);this.currentQuiz=QuizUI.currentQuiz;}else if(streamed>0){QuizUI.finishQuiz();}else{throw new Error('No questions were generated');}
+$('#quizContainer').removeClass('hidden');}catch(error){console.error('Error:',error);alert('Error generating quiz. Please try again.');}finally{QuizUI.hideLoading();}});},setupQuizSubmission:function(){$(document).on('click','#submitQuiz',()=>{if(!this.currentQuiz)return;const $submitBtn=$('#submitQuiz');$submitBtn.prop('disabled',true).html('<span class="inline-block animate-spin rounded-full h-4 w-4 border-b-2 border-white mr-2"></span>Submitting...');const answers=this.gatherAnswers();if(answers.length!==this.currentQuiz.questions.length){alert("Please answer all questions before submitting.");$submitBtn.prop('disabled',false).html('<i class="bi bi-check-circle mr-2"></i>Submit Answers');return;}
+setTimeout(()=>{this.submitQuiz(answers);},500);});},startQuizWithDifficulty:async function(difficulty){try{const response=await QuizAPI.getRandomQuestions(difficulty);if(response.status==='success'&&response.questions.length>0){GameUI.startGame(response.questions);return true;}else if(response.status==='error'){let errorMessage=response.error||'No questions available for this difficulty level.';if(response.available_difficulties){const availableDiffs=[];for(const[diff,count]of Object.entries(response.available_difficulties)){if(count>0){availableDiffs.push(`${diff} (${count} questions)`);}}
+if(availableDiffs.length>0){errorMessage+=`\n\nAvailable difficulty levels:\n${availableDiffs.join('\n')}`;errorMessage+='\n\nPlease select a different difficulty level or ask an admin to add more questions.';}else{errorMessage+='\n\nNo questions available in any difficulty level. Please ask an admin to add questions to the database.';}}
+alert(errorMessage);return false;}else{alert('No questions available for this difficulty level.');return false;}}catch(error){console.error('Error:',error);if(error.status===404){try{const errorData=error.responseJSON||JSON.parse(error.responseText);let errorMessage=errorData.error||'No questions found for this difficulty.';if(errorData.available_difficulties){const availableDiffs=[];for(const[diff,count]of Object.entries(errorData.available_difficulties)){if(count>0){availableDiffs.push(`${diff} (${count} questions)`);}}
+if(availableDiffs.length>0){errorMessage+=`\n\nAvailable difficulty levels:\n${availableDiffs.join('\n')}`;errorMessage+='\n\nPlease select a different difficulty level.';}}
+alert(errorMessage);}catch(parseError){alert('No questions available for this difficulty level. Please try a different level or ask an admin to add more questions.');}
+return false;}else{alert('Error loading questions. Please try again.');return false;}}},submitQuiz:function(answers){const quizData=this.currentQuiz;const resultsDetails=answers.map((answer,index)=>{const question=quizData.questions[index];const isCorrect=this.compareAnswers(answer.userAnswer,question.correct_answer);return{questionText:question.question,userAnswer:answer.userAnswer,correctAnswer:question.correct_answer,isCorrect:isCorrect,type:'multiple_choice',options:question.options};});window.scrollTo({top:0,behavior:'smooth'});setTimeout(()=>{QuizUI.displayResults(resultsDetails);},300);},gatherAnswers:function(){const answers=[];const seenQuestions=new Set();this.currentQuiz.questions.forEach((question,index)=>{if(seenQuestions.has(question.question))return;seenQuestions.add(question.question);const userAnswer=$(`[name="q${index}"]:checked`).val();answers.push({questionText:question.question,userAnswer:userAnswer,correctAnswer:question.correct_answer,isCorrect:this.compareAnswers(userAnswer,question.correct_answer),type:'multiple_choice',options:question.options});});return answers;},compareAnswers:function(userAnswer,correctAnswer){if(!userAnswer)return false;return String(userAnswer).toLowerCase()===String(correctAnswer).toLowerCase();}};window.QuizLogic=QuizLogic;$(document).ready(function(){if(typeof window.QuizLogic==='object'&&typeof window.QuizLogic.startQuizWithDifficulty==='function'){console.log('✅ QuizLogic.startQuizWithDifficulty is ready and accessible');}else{console.error('❌ QuizLogic.startQuizWithDifficulty is not available');console.log('QuizLogic type:',typeof window.QuizLogic);console.log('startQuizWithDifficulty type:',typeof window.QuizLogic?.startQuizWithDifficulty);}});;$(document).ready(function(){QuizLogic.init();});;const GameUI={currentQuestion:0,timer:null,timeLeft:30,currentScore:0,currentStreak:0,bestStreak:0,correctAnswers:0,isNewQuestion:false,colors:['#e21b3c','#1368ce','#d89e00','#26890c'],bgm:null,bgmTargetVolume:0.3,bgmFadeInterval:null,isMuted:false,countdownSound:null,pendingAnswers:[],countdownDuration:5000,countdownTimeout:null,getTimerDuration:function(){const difficulty=sessionStorage.getItem('selectedDifficulty')||'medium';const timerMap={'easy':30,'medium':45,'hard':60};return timerMap[difficulty]||45;},soundUrl:function(file){return(window.SOUND_URLS&&window.SOUND_URLS[file])||`/static/sounds/${file}`;},loadBgm:function(){if(!this.bgm){this.bgm=new Audio(this.soundUrl('bgm.mp3'));}},initBgm:function(){if(this.bgm){this.bgm.loop=true;this.bgm.volume=0;}
+const $muteBtn=$('#muteButton i');if(this.isMuted){$muteBtn.removeClass('bi-volume-up').addClass('bi-volume-mute');}else{$muteBtn.removeClass('bi-volume-mute').addClass('bi-volume-up');}
+$('#muteButton').off('click').on('click',()=>{this.toggleMute();});},toggleMute:function(){this.isMuted=!this.isMuted;const $muteBtn=$('#muteButton i');if(this.isMuted){if(this.bgm)this.bgm.volume=0;$muteBtn.removeClass('bi-volume-up').addClass('bi-volume-mute');}else{if(this.bgm){if(this.bgm.paused&&this.currentQuestion<this.questions?.length){this.bgm.play();}
+this.bgm.volume=this.bgmTargetVolume;}
+$muteBtn.removeClass('bi-volume-mute').addClass('bi-volume-up');}
+localStorage.setItem('gameIsMuted',this.isMuted);},fadeInBgm:function(){if(this.isMuted)return;clearInterval(this.bgmFadeInterval);this.bgm.volume=0;this.bgm.play().catch(()=>console.log('BGM autoplay prevented'));this.bgmFadeInterval=setInterval(()=>{if(this.bgm.volume<this.bgmTargetVolume){this.bgm.volume=Math.min(this.bgmTargetVolume,this.bgm.volume+0.02);}else{clearInterval(this.bgmFadeInterval);}},100);},startGame:function(questions){this.resetGame();this.questions=questions;const difficulty=sessionStorage.getItem('selectedDifficulty')||'medium';const prize=sessionStorage.getItem('selectedPrize')||'Biscuit';const $difficultyDisplay=$('#difficultyLevel');if($difficultyDisplay.length){$difficultyDisplay.text(difficulty.toUpperCase());$difficultyDisplay.removeClass('text-green-600 text-yellow-600 text-red-600');if(difficulty==='easy'){$difficultyDisplay.addClass('text-green-600');}else if(difficulty==='medium'){$difficultyDisplay.addClass('text-yellow-600');}else{$difficultyDisplay.addClass('text-red-600');}}
+const $prizeDisplay=$('#prizeDisplay');if($prizeDisplay.length){const prizeEmojis={'Candy':'🍭','Biscuit':'🍪','Keychain':'🔑'};const emoji=prizeEmojis[prize]||'🏆';$prizeDisplay.text(`${emoji} ${prize}`);}
+this.loadBgm();this.initBgm();this.fadeInBgm();$('#totalQuestions').text(this.questions.length);$('.bg-white.rounded-lg.shadow-md.mb-6').addClass('hidden');$('#quizContainer').addClass('hidden');$('#gameContainer').removeClass('hidden');$('#questionDisplay').removeClass('hidden');$('#scoreDisplay').removeClass('hidden');$('#finalResults').addClass('hidden');this.showQuestion();},resetGame:function(){this.flushAnswerAnalytics();if(this.bgm){this.bgm.pause();this.bgm.currentTime=0;}
+this.currentQuestion=0;this.currentScore=0;this.currentStreak=0;this.bestStreak=0;this.correctAnswers=0;$('#currentScore').text('0');$('#currentStreak').text('0');$('#currentQuestionNum').text('1');$('#timerProgress').css('width','100%');$('#timer').text(this.getTimerDuration());$('#questionText').empty();$('#answerGrid').empty();},showQuestion:function(){if(this.currentQuestion>=this.questions.length){this.endGame();return;}
+this.isNewQuestion=true;const question=this.questions[this.currentQuestion];$('#currentQuestionNum').text(this.currentQuestion+1);$('#timerProgress').css('width','100%');const progress=((this.currentQuestion+1)/this.questions.length)*100;$('#questionProgress').css('width',`${progress}%`);$('#questionText').text(question.question);const answerGrid=$('#answerGrid').empty();this.shuffleArray(question.options).forEach((option,index)=>{const button=$('<div>').addClass('answer-container').append($('<button>').addClass('w-full py-4 px-6 text-white font-bold text-lg rounded-lg shadow-lg transform transition-all duration-300 hover:scale-105 answer-btn cursor-pointer').css('background-color',this.colors[index]).css('transform','scale(0)').text(option).on('click',()=>this.handleAnswer(option)));answerGrid.append(button);});$('.answer-btn').each((i,btn)=>{setTimeout(()=>{$(btn).css('transform','scale(1)');},i*100);});this.startTimer();},startTimer:function(){const timerDuration=this.getTimerDuration();this.timeLeft=timerDuration;$('#timer').text(this.timeLeft);$('#timer, #timerProgress').removeClass('countdown-warning');clearInterval(this.bgmFadeInterval);if(!this.isMuted){this.bgm.volume=this.bgmTargetVolume;}
+const $progressBar=$('#timerProgress');$progressBar.removeClass('timer-high timer-medium timer-low').addClass('timer-high');clearInterval(this.timer);this.timer=setInterval(()=>{this.timeLeft--;$('#timer').text(this.timeLeft);const progressWidth=(this.timeLeft/timerDuration)*100;$progressBar.css('width',`${progressWidth}%`);const lowThreshold=Math.ceil(timerDuration*0.27);const mediumThreshold=Math.ceil(timerDuration*0.5);if(this.timeLeft<=lowThreshold){$progressBar.removeClass('timer-medium').addClass('timer-low');if(this.timeLeft===5&&this.isNewQuestion){this.playSound('5-second-countdown');$('#timer, #timerProgress').addClass('countdown-warning');const fadeInterval=setInterval(()=>{if(this.bgm.volume>0.1){this.bgm.volume=Math.max(0.1,this.bgm.volume-0.04);}else{clearInterval(fadeInterval);}},200);}}else if(this.timeLeft<=mediumThreshold){$progressBar.removeClass('timer-high').addClass('timer-medium');}
+if(this.timeLeft<=0){this.isNewQuestion=false;$('#timer, #timerProgress').removeClass('countdown-warning');this.handleAnswer(null);}},1000);},handleAnswer:function(answer){if(this.countdownTimeout){clearTimeout(this.countdownTimeout);this.countdownTimeout=null;}
+if(this.countdownSound){const fadeOut=setInterval(()=>{if(this.countdownSound.volume>0.1){this.countdownSound.volume-=0.1;}else{this.countdownSound.pause();this.countdownSound=null;clearInterval(fadeOut);}},50);}
+this.isNewQuestion=false;clearInterval(this.timer);$('.answer-btn').removeClass('selected');if(answer!==null){$('.answer-btn').each(function(){if($(this).text()===answer){$(this).addClass('selected');}});}
+const question=this.questions[this.currentQuestion];const isCorrect=answer===question.correct_answer;if(answer!==null){if(isCorrect){const timeBonus=this.timeLeft*100;const points=1000+timeBonus;this.currentScore+=points;this.correctAnswers++;this.currentStreak++;this.bestStreak=Math.max(this.bestStreak,this.currentStreak);setTimeout(()=>this.playSound('success'),600);}else{this.currentStreak=0;setTimeout(()=>this.playSound('error'),600);}
+$('#currentScore').text(this.currentScore);$('#currentStreak').text(this.currentStreak);}
+this.logAnswerAnalytics({question_id:question.id,is_correct:isCorrect,time_taken:this.getTimerDuration()-this.timeLeft,score:isCorrect?(1000+(this.timeLeft*100)):0});this.showAnswerFeedback(isCorrect,question.correct_answer,answer===null);},logAnswerAnalytics:function(data){this.pendingAnswers.push(data);},flushAnswerAnalytics:async function(useBeacon=false){if(this.pendingAnswers.length===0)return;const answers=this.pendingAnswers;this.pendingAnswers=[];const body=JSON.stringify({answers:answers});if(useBeacon&&navigator.sendBeacon){this.sendAnswerBeacon(body);return;}
+let response;try{response=await fetch('/api/analytics/log-batch',{method:'POST',headers:{'Content-Type':'application/json',},body:body,keepalive:true});}catch(error){console.error('Error logging analytics:',error);if(navigator.sendBeacon){this.sendAnswerBeacon(body);}
+return;}
+if(!response.ok){console.error(`Analytics batch failed with status ${response.status}`);}},sendAnswerBeacon:function(body){navigator.sendBeacon('/api/analytics/log-batch',body);},showAnswerFeedback:function(isCorrect,correctAnswer,timeOut=false){$('.answer-btn').prop('disabled',true);if(timeOut){$('#questionText').append($('<div>').addClass('times-up-message mt-6 text-center').html(`
+                        <i class="bi bi-clock text-red-600 mb-3 text-4xl"></i>
+                        <div class="text-2xl text-red-600 font-bold">Time's up!</div>
+                    `));setTimeout(()=>{$('.answer-btn').each(function(){$(this).animate({backgroundColor:'rgba(128, 128, 128, 0.8)'},300);});setTimeout(()=>{$('.answer-btn').each(function(){if($(this).text()===correctAnswer){$(this).animate({backgroundColor:'rgba(40, 167, 69, 1)'},500).addClass('correct-answer');}});},600);},300);}else{$('.answer-btn').not('.selected').each(function(){$(this).animate({backgroundColor:'rgba(128, 128, 128, 0.8)'},300);});setTimeout(()=>{$('.answer-btn.selected').each(function(){const btn=$(this);if(btn.text()===correctAnswer){btn.animate({backgroundColor:'rgba(40, 167, 69, 1)'},500).addClass('correct-answer');}else{btn.animate({backgroundColor:'rgba(220, 53, 69, 1)'},500).addClass('wrong-answer');$('.answer-btn').each(function(){if($(this).text()===correctAnswer){$(this).delay(200).animate({backgroundColor:'rgba(40, 167, 69, 1)'},500).addClass('correct-answer');}});}});},600);}
+setTimeout(()=>{this.currentQuestion++;this.showQuestion();},2000);},endGame:function(){this.flushAnswerAnalytics();const finalMessage=this.getFinalMessage(this.correctAnswers);$('#finalScore').text(this.currentScore);$('#correctAnswers').text(this.correctAnswers);$('#bestStreak').text(this.bestStreak);const prizeEligible=this.correctAnswers>=3;const prizeMessage=prizeEligible
+?'<div class="text-green-600 font-bold mb-2"><i class="bi bi-trophy mr-2"></i>Congratulations! You won a prize!</div>'
+:'<div class="text-orange-600 font-bold mb-2"><i class="bi bi-info-circle mr-2"></i>Score 3+ to win a prize</div>';const oneTrieRule='<div class="text-blue-600 text-sm mt-4 p-3 bg-blue-50 rounded-lg border border-blue-200"><i class="bi bi-info-circle mr-2"></i><strong>Remember:</strong> One try per person. For another attempt, please line up again.</div>';$('.p-4.md\\:p-8 h2, .p-6 h2').html(`
+            <div class="mb-2">${finalMessage.title}</div>
+            <div class="text-lg text-gray-500 font-normal mb-4">${finalMessage.subtitle}</div>
+            ${prizeMessage}
+            ${oneTrieRule}
+        `);$('#questionDisplay').addClass('hidden');$('#scoreDisplay').addClass('hidden');$('#finalResults').removeClass('hidden');const fadeOut=setInterval(()=>{if(this.bgm.volume>0.1){this.bgm.volume-=0.1;}else{this.bgm.pause();this.bgm.volume=0.3;clearInterval(fadeOut);if(!this.isMuted){const soundFile=(this.correctAnswers>=3&&this.correctAnswers<=5)
+?'you-won-a-prize.mp3'
+:'you-won-nothing.mp3';console.log('Playing end game sound:',soundFile);const resultsSound=new Audio(this.soundUrl(soundFile));resultsSound.volume=1.0;resultsSound.play().catch(err=>{console.error('Error playing sound:',err);});}}},100);$('#playAgain').off('click').on('click',()=>{window.location.href='/';});},getFinalMessage:function(correctCount){const messages={0:[{title:'Game Over!',subtitle:'Better luck next time! Remember: 3+ correct wins a prize! 🎮'},{title:'Oops!',subtitle:'Everyone starts somewhere. Need 3+ correct for a prize! 🌟'},{title:'Not Quite There!',subtitle:'Practice makes perfect! Score 3+ to win! 💪'}],1:[{title:'Good Start!',subtitle:'You got 1 right! Need 3+ correct to win a prize! 🎯'},{title:'Getting There!',subtitle:'One correct answer! Score 3+ for a prize! 📈'},{title:'Keep Trying!',subtitle:'Nice effort! Need 3+ correct to win! 🔝'}],2:[{title:'Almost There!',subtitle:'So close! Just need 1 more correct for a prize! 🎲'},{title:'Great Effort!',subtitle:'Two correct! One more needed for a prize! 🎯'},{title:'Getting Better!',subtitle:'Nice progress! Score 3+ to win a prize! 📈'}],3:[{title:'Congratulations!',subtitle:'You Won a Prize! 3 correct answers! 🥇'},{title:'Well Done!',subtitle:'Prize Winner! Great job getting 3 right! 🌟'},{title:'Excellent!',subtitle:'You earned a prize with 3 correct! ⭐'}],4:[{title:'Outstanding!',subtitle:'You Won a Prize! 4 correct answers! 🥈'},{title:'Impressive!',subtitle:'Prize Winner! Amazing 4 out of 5! ✨'},{title:'Fantastic!',subtitle:'Excellent performance! You won a prize! 🌟'}],5:[{title:'Perfect Score!',subtitle:'You Won a Prize! All 5 correct! 🥇'},{title:'Spectacular!',subtitle:'Prize Winner! Perfect game! 🏆'},{title:'Amazing!',subtitle:'Flawless victory! You won the top prize! 👑'}]};const messageArray=messages[correctCount]||messages[0];const randomIndex=Math.floor(Math.random()*messageArray.length);return messageArray[randomIndex];},playSound:function(type){if(this.isMuted)return;const soundMap={'success':'success.mp3','error':'error.mp3','5-second-countdown':'5-second-countdown.mp3'};if(type==='5-second-countdown'){if(this.countdownTimeout){clearTimeout(this.countdownTimeout);}
+if(this.countdownSound){this.countdownSound.pause();this.countdownSound=null;}
+this.countdownSound=new Audio(this.soundUrl(soundMap[type]));this.countdownSound.play().catch(()=>{});this.countdownTimeout=setTimeout(()=>{if(this.countdownSound){this.countdownSound.pause();this.countdownSound=null;}},this.countdownDuration);}else{const audio=new Audio(this.soundUrl(soundMap[type]));audio.play().catch(()=>{});}},shuffleArray:function(array){const shuffled=[...array];for(let i=shuffled.length-1;i>0;i--){const j=Math.floor(Math.random()*(i+1));[shuffled[i],shuffled[j]]=[shuffled[j],shuffled[i]];}
+return shuffled;}};$(document).ready(()=>{GameUI.isMuted=localStorage.getItem('gameIsMuted')==='true';GameUI.initBgm();});window.addEventListener('pagehide',()=>{GameUI.flushAnswerAnalytics(true);});
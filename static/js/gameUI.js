@@ -10,8 +10,8 @@ const GameUI = {
     
     colors: ['#e21b3c', '#1368ce', '#d89e00', '#26890c'],
     
-    // Add new properties for audio
-    bgm: new Audio('/static/sounds/bgm.mp3'),
+    // Background music, created when a game starts so other pages never download it
+    bgm: null,
     
     // Add fade properties
     bgmTargetVolume: 0.3,
@@ -23,6 +23,9 @@ const GameUI = {
     // Add new property to track countdown sound
     countdownSound: null,
 
+    // Answers logged this round, sent in one batch when the round ends
+    pendingAnswers: [],
+
     // Add property to track countdown duration
     countdownDuration: 5000, // 5 seconds in milliseconds
     countdownTimeout: null,
@@ -38,10 +41,24 @@ const GameUI = {
         return timerMap[difficulty] || 45; // Default to medium (45 seconds)
     },
 
+    // Resolve a sound file to its (fingerprinted) URL from the page's asset manifest
+    soundUrl: function(file) {
+        return (window.SOUND_URLS && window.SOUND_URLS[file]) || `/static/sounds/${file}`;
+    },
+
+    // Load the background music on first use
+    loadBgm: function() {
+        if (!this.bgm) {
+            this.bgm = new Audio(this.soundUrl('bgm.mp3'));
+        }
+    },
+
     // Initialize BGM settings
     initBgm: function() {
-        this.bgm.loop = true;
-        this.bgm.volume = 0;  // Start at 0 volume
+        if (this.bgm) {
+            this.bgm.loop = true;
+            this.bgm.volume = 0;  // Start at 0 volume
+        }
 
         // Initialize mute button state
         const $muteBtn = $('#muteButton i');
@@ -62,13 +79,15 @@ const GameUI = {
         const $muteBtn = $('#muteButton i');
         
         if (this.isMuted) {
-            this.bgm.volume = 0;
+            if (this.bgm) this.bgm.volume = 0;
             $muteBtn.removeClass('bi-volume-up').addClass('bi-volume-mute');
         } else {
-            if (this.bgm.paused && this.currentQuestion < this.questions?.length) {
-                this.bgm.play();
+            if (this.bgm) {
+                if (this.bgm.paused && this.currentQuestion < this.questions?.length) {
+                    this.bgm.play();
+                }
+                this.bgm.volume = this.bgmTargetVolume;
             }
-            this.bgm.volume = this.bgmTargetVolume;
             $muteBtn.removeClass('bi-volume-mute').addClass('bi-volume-up');
         }
 
@@ -122,6 +141,7 @@ const GameUI = {
         }
         
         // Start background music with fade in
+        this.loadBgm();
         this.initBgm();
         this.fadeInBgm();
         
@@ -142,9 +162,14 @@ const GameUI = {
     },
 
     resetGame: function() {
+        // Send anything left over from an unfinished round
+        this.flushAnswerAnalytics();
+
         // Stop background music
-        this.bgm.pause();
-        this.bgm.currentTime = 0;
+        if (this.bgm) {
+            this.bgm.pause();
+            this.bgm.currentTime = 0;
+        }
         
         this.currentQuestion = 0;
         this.currentScore = 0;
@@ -337,7 +362,6 @@ const GameUI = {
         // Log analytics data
         this.logAnswerAnalytics({
             question_id: question.id,
-            question_text: question.question,
             is_correct: isCorrect,
             time_taken: this.getTimerDuration() - this.timeLeft,  // Use dynamic timer duration
             score: isCorrect ? (1000 + (this.timeLeft * 100)) : 0
@@ -347,18 +371,52 @@ const GameUI = {
         this.showAnswerFeedback(isCorrect, question.correct_answer, answer === null);
     },
 
-    logAnswerAnalytics: async function(data) {
+    // Queue an answer; the whole round is sent at once by flushAnswerAnalytics
+    logAnswerAnalytics: function(data) {
+        this.pendingAnswers.push(data);
+    },
+
+    flushAnswerAnalytics: async function(useBeacon = false) {
+        if (this.pendingAnswers.length === 0) return;
+
+        const answers = this.pendingAnswers;
+        this.pendingAnswers = [];
+        const body = JSON.stringify({ answers: answers });
+
+        // Page is going away: only a beacon is guaranteed to be delivered
+        if (useBeacon && navigator.sendBeacon) {
+            this.sendAnswerBeacon(body);
+            return;
+        }
+
+        let response;
         try {
-            await fetch('/api/analytics/log', {
+            response = await fetch('/api/analytics/log-batch', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify(data)
+                body: body,
+                keepalive: true
             });
         } catch (error) {
+            // Network failure: the request most likely never reached the server
             console.error('Error logging analytics:', error);
+            if (navigator.sendBeacon) {
+                this.sendAnswerBeacon(body);
+            }
+            return;
         }
+        if (!response.ok) {
+            // The server answered; it may have stored the round already, so don't resend
+            console.error(`Analytics batch failed with status ${response.status}`);
+        }
+    },
+
+    // A string body goes as text/plain, which browsers allow in a beacon; an
+    // application/json Blob is refused. The server parses the body regardless
+    sendAnswerBeacon: function(body) {
+        navigator.sendBeacon('/api/analytics/log-batch', body);
     },
 
     showAnswerFeedback: function(isCorrect, correctAnswer, timeOut = false) {
@@ -439,6 +497,8 @@ const GameUI = {
     },
 
     endGame: function() {
+        this.flushAnswerAnalytics();
+
         const finalMessage = this.getFinalMessage(this.correctAnswers);
         
         // Update final results display
@@ -482,7 +542,7 @@ const GameUI = {
                     
                     console.log('Playing end game sound:', soundFile); // Debug log
                     
-                    const resultsSound = new Audio(`/static/sounds/${soundFile}`);
+                    const resultsSound = new Audio(this.soundUrl(soundFile));
                     resultsSound.volume = 1.0; // Ensure full volume
                     resultsSound.play().catch(err => {
                         console.error('Error playing sound:', err);
@@ -558,7 +618,7 @@ const GameUI = {
             }
 
             // Create and play new countdown sound
-            this.countdownSound = new Audio(`/static/sounds/${soundMap[type]}`);
+            this.countdownSound = new Audio(this.soundUrl(soundMap[type]));
             this.countdownSound.play().catch(() => {});
 
             // Set timeout to cleanup after sound duration
@@ -569,7 +629,7 @@ const GameUI = {
                 }
             }, this.countdownDuration);
         } else {
-            const audio = new Audio(`/static/sounds/${soundMap[type]}`);
+            const audio = new Audio(this.soundUrl(soundMap[type]));
             audio.play().catch(() => {});
         }
     },
@@ -590,3 +650,8 @@ $(document).ready(() => {
     GameUI.isMuted = localStorage.getItem('gameIsMuted') === 'true';
     GameUI.initBgm();
 });
+
+// Deliver answers from a round the player abandons by leaving the page
+window.addEventListener('pagehide', () => {
+    GameUI.flushAnswerAnalytics(true);
+});
@@ -16,6 +16,53 @@ const QuizAPI = {
         }
     },
 
+    // Stream questions from /generate-stream, calling onQuestion for each one as it arrives
+    generateQuizStream: async function(quizConfig, onQuestion) {
+        const response = await fetch('/generate-stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(quizConfig)
+        });
+
+        if (!response.ok || !response.body) {
+            const error = new Error(`Stream request failed with status ${response.status}`);
+            error.streamUnavailable = true;  // The caller may retry on the blocking endpoint
+            throw error;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let count = 0;
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const event = JSON.parse(line);
+            if (event.type === 'question') {
+                const [question] = this.sanitizeQuestions([event.question]);
+                if (question) {
+                    count++;
+                    onQuestion(question);
+                }
+            } else if (event.type === 'error') {
+                throw new Error(event.error || 'Quiz generation failed');
+            }
+        };
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+
+        return count;
+    },
+
     saveQuestion: async function(question) {
         try {
             const response = await $.ajax({
@@ -25,15 +25,46 @@ const QuizLogic = {
                 topic: $('#topic').val(),
                 num_questions: $('#numQuestions').val(),
                 question_types: ['multiple_choice'],
-                difficulty: selectedDifficulty
+                difficulty: selectedDifficulty,
+                bypass_cache: $('#bypassCache').is(':checked')
             };
 
             QuizUI.showLoading();
 
             try {
-                const response = await QuizAPI.generateQuiz(quizConfig);
-                this.currentQuiz = QuizAPI.parseQuizData(response);
-                QuizUI.displayQuiz(this.currentQuiz);
+                // Show questions as they stream in, falling back to the
+                // blocking endpoint only if streaming itself is unavailable
+                this.currentQuiz = QuizUI.beginQuiz();
+                let streamed = 0;
+                let streamUnavailable = false;
+                try {
+                    await QuizAPI.generateQuizStream(quizConfig, (question) => {
+                        streamed++;
+                        QuizUI.appendQuestion(question);
+                        $('#quizContainer').removeClass('hidden');
+                    });
+                } catch (streamError) {
+                    if (streamError.streamUnavailable) {
+                        console.warn('Streaming unavailable, using the blocking endpoint:', streamError);
+                        streamUnavailable = true;
+                    } else if (streamed === 0) {
+                        // The server reported an error (e.g. the AI service is down); retrying would only repeat it
+                        throw streamError;
+                    } else {
+                        console.warn('Stream ended early:', streamError);
+                    }
+                }
+
+                if (streamUnavailable) {
+                    const response = await QuizAPI.generateQuiz(quizConfig);
+                    this.currentQuiz = QuizAPI.parseQuizData(response);
+                    QuizUI.displayQuiz(this.currentQuiz);
+                    this.currentQuiz = QuizUI.currentQuiz;
+                } else if (streamed > 0) {
+                    QuizUI.finishQuiz();
+                } else {
+                    throw new Error('No questions were generated');
+                }
                 $('#quizContainer').removeClass('hidden');
             } catch (error) {
                 console.error('Error:', error);
@@ -42,34 +42,50 @@ const QuizUI = {
 
     // Display quiz questions
     displayQuiz: function(quiz) {
-        const questionsContainer = $('#questions');
-        questionsContainer.empty();
+        this.beginQuiz();
+        quiz.questions.forEach(question => this.appendQuestion(question));
+        this.finishQuiz();
+    },
+
+    // Reset the question list before questions are added
+    beginQuiz: function() {
+        $('#questions').empty();
 
         // Store quiz data for save all functionality
-        this.currentQuiz = quiz;
+        this.currentQuiz = { questions: [] };
+        return this.currentQuiz;
+    },
 
-        quiz.questions.forEach((question, index) => {
-            const questionDiv = $('<div>').addClass('bg-white rounded-lg shadow-sm mb-6');
-            const questionBody = $('<div>').addClass('p-6');
-            
-            // Add question header with save button
-            const headerDiv = $('<div>').addClass('flex justify-between items-center mb-6');
-            headerDiv.append(
-                $('<h5>').addClass('text-lg font-bold').text(`Question ${index + 1}`),
-                $('<button>')
-                    .addClass('bg-blue-100 text-blue-600 px-4 py-2 rounded-lg shadow-sm hover:bg-blue-200 transition-colors cursor-pointer')
-                    .attr('data-question-index', index)
-                    .html('<i class="bi bi-save mr-2"></i>Save')
-                    .on('click', () => this.handleSaveQuestion(question))
-            );
-            questionBody.append(headerDiv);
-            
-            questionBody.append($('<p>').addClass('text-gray-800 mb-6').text(question.question));
-            this.displayMultipleChoice(question, index, questionBody);
+    // Render a single question at the end of the list
+    appendQuestion: function(question) {
+        const index = this.currentQuiz.questions.length;
+        this.currentQuiz.questions.push(question);
 
-            questionDiv.append(questionBody);
-            questionsContainer.append(questionDiv);
-        });
+        const questionDiv = $('<div>').addClass('bg-white rounded-lg shadow-sm mb-6');
+        const questionBody = $('<div>').addClass('p-6');
+        
+        // Add question header with save button
+        const headerDiv = $('<div>').addClass('flex justify-between items-center mb-6');
+        headerDiv.append(
+            $('<h5>').addClass('text-lg font-bold').text(`Question ${index + 1}`),
+            $('<button>')
+                .addClass('bg-blue-100 text-blue-600 px-4 py-2 rounded-lg shadow-sm hover:bg-blue-200 transition-colors cursor-pointer')
+                .attr('data-question-index', index)
+                .html('<i class="bi bi-save mr-2"></i>Save')
+                .on('click', () => this.handleSaveQuestion(question))
+        );
+        questionBody.append(headerDiv);
+        
+        questionBody.append($('<p>').addClass('text-gray-800 mb-6').text(question.question));
+        this.displayMultipleChoice(question, index, questionBody);
+
+        questionDiv.append(questionBody);
+        $('#questions').append(questionDiv);
+    },
+
+    // Add the submit and save all controls once every question is shown
+    finishQuiz: function() {
+        const questionsContainer = $('#questions');
 
         // Add submit button
         questionsContainer.append(`
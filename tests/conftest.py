@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests import the app's modules the way app.py does, from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Config reads these when first imported; the tests never open a connection
+os.environ.setdefault('FLASK_PORT', '5000')
+os.environ.setdefault('POSTGRES_URL_NON_POOLING', 'postgresql://localhost/triviabyte_test')
@@ -0,0 +1,82 @@
+import contextlib
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+from services.analytics_buffer import AnswerAggregator
+
+class FakeApp:
+    def app_context(self):
+        return contextlib.nullcontext()
+
+class FakeDatabase:
+    """Stands in for apply_answer_deltas: rejects some question ids, or is down"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.down = False
+        self.written = {}
+        self.calls = []
+
+    def apply(self, deltas):
+        self.calls.append(sorted(deltas))
+        if self.down:
+            raise OperationalError('INSERT', {}, Exception('connection refused'))
+        if self.rejected & set(deltas):
+            raise IntegrityError('INSERT', {}, Exception('violates foreign key constraint'))
+        for question_id, delta in deltas.items():
+            self.written[question_id] = self.written.get(question_id, 0) + delta['correct'] + delta['wrong']
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+@pytest.fixture
+def aggregator(database):
+    aggregator = AnswerAggregator(FakeApp(), flush_size=1000, flush_interval=60, max_pending=10)
+    aggregator._apply = database.apply
+    return aggregator
+
+def test_add_sums_answers_per_question(aggregator):
+    aggregator.add(1, 'Q1', True, 2.0, 10)
+    aggregator.add(1, 'Q1', False, '3.5', '0')
+    assert aggregator._pending[1] == {'question_text': 'Q1', 'correct': 1, 'wrong': 1, 'time_sum': 5.5, 'score': 10}
+    assert aggregator._pending_events == 2
+
+def test_invalid_answer_leaves_buffer_untouched(aggregator):
+    with pytest.raises(ValueError):
+        aggregator.add(1, 'Q1', True, 'slow', 10)
+    with pytest.raises(ValueError):
+        aggregator.add('abc', 'Q1', True, 1.0, 10)
+    assert aggregator._pending == {}
+    assert aggregator._pending_events == 0
+
+def test_rejected_question_is_dropped_and_the_rest_written(aggregator, database):
+    database.rejected.add(99)
+    for question_id in (1, 99, 2):
+        aggregator.add(question_id, None, True, 1.0, 5)
+
+    assert aggregator.flush() == 2
+    assert database.written == {1: 1, 2: 1}
+    assert database.calls == [[1, 2, 99], [1], [2], [99]]
+    assert aggregator._pending == {}
+
+    # Later flushes are no longer held back by the bad answer
+    aggregator.add(3, None, False, 1.0, 0)
+    assert aggregator.flush() == 1
+    assert database.written[3] == 1
+
+def test_unavailable_database_keeps_events_for_the_next_flush(aggregator, database):
+    aggregator.add(1, None, True, 1.0, 5)
+    aggregator.add(2, None, True, 1.0, 5)
+    database.down = True
+    assert aggregator.flush() == 0
+    assert aggregator._pending_events == 2
+
+    database.down = False
+    assert aggregator.flush() == 2
+    assert database.written == {1: 1, 2: 1}
+
+def test_pending_events_are_capped(aggregator):
+    for _ in range(15):
+        aggregator.add(1, None, True, 1.0, 1)
+    assert aggregator._pending_events == 10
+    assert aggregator._pending[1]['correct'] == 10
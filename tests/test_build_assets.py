@@ -0,0 +1,53 @@
+import pytest
+from build_assets import fingerprint, minify_css, minify_js
+
+def test_comments_and_indentation_are_removed():
+    source = "// header\nfunction add(a, b) {\n    /* sum */\n    return a + b;\n}\n"
+    assert minify_js(source) == "function add(a,b){return a+b;}\n"
+
+def test_division_is_not_read_as_a_regex():
+    assert minify_js("const ratio = total / count / 2;") == "const ratio=total/count/2;\n"
+    assert minify_js("const half = (a + b) / 2, third = items[0] / 3;") == "const half=(a+b)/2,third=items[0]/3;\n"
+
+def test_regex_literals_are_copied_verbatim():
+    source = "const clean = text.replace(/\\/\\* [a-z]+ \\*\\//g, ''); // strip\n"
+    assert minify_js(source) == "const clean=text.replace(/\\/\\* [a-z]+ \\*\\//g,'');\n"
+
+def test_regex_after_keyword_and_with_slash_in_class():
+    source = "function f(s) {\n    return /[/]  x/i.test(s);\n}\n"
+    assert minify_js(source) == "function f(s){return/[/]  x/i.test(s);}\n"
+
+def test_unterminated_regex_is_an_error():
+    with pytest.raises(ValueError):
+        minify_js("let r = /abc\n;")
+
+def test_strings_keep_comment_markers_and_spacing():
+    source = "const url = 'http://example.com/a  b'; const note = \"/* not a comment */\";"
+    assert minify_js(source) == "const url='http://example.com/a  b';const note=\"/* not a comment */\";\n"
+
+def test_template_literals_and_nested_expressions_are_preserved():
+    source = "const msg = `Score: ${ player.score }  // kept ${ `inner ${ {a: 1}.a }` } }`;"
+    assert minify_js(source) == "const msg=`Score: ${ player.score }  // kept ${ `inner ${ {a: 1}.a }` } }`;\n"
+
+def test_line_breaks_that_may_end_a_statement_are_kept():
+    # Without the newlines these would parse as a call and as "return;" respectively
+    source = "let a = b\n(function () {})()\nfunction g() {\n    return\n        value\n}\n"
+    assert minify_js(source) == "let a=b\n(function(){})()\nfunction g(){return\nvalue}\n"
+
+def test_increment_operators_do_not_merge():
+    assert minify_js("x = a + +b - -c;\ni++\n++j") == "x=a+ +b- -c;i++\n++j\n"
+
+def test_method_chains_join_across_lines():
+    assert minify_js("$('#a')\n    .addClass('x')\n    .show();") == "$('#a').addClass('x').show();\n"
+
+def test_minify_css_keeps_strings_and_drops_comments():
+    source = "/* theme */\n.a > .b {\n    content: \"a  b\";\n    margin: 0 auto;\n}\n"
+    assert minify_css(source) == '.a>.b{content: "a  b";margin: 0 auto}\n'
+
+def test_minify_css_keeps_descendant_pseudo_class_space():
+    assert minify_css(".menu :hover { color: red; }") == ".menu :hover{color: red}\n"
+
+def test_fingerprint_changes_with_content():
+    assert fingerprint('js/app.js', b'one') != fingerprint('js/app.js', b'two')
+    assert fingerprint('js/app.js', b'one').startswith('js/app.')
+    assert fingerprint('js/app.js', b'one').endswith('.js')
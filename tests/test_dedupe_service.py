@@ -0,0 +1,59 @@
+from services.dedupe_service import DuplicateIndex, QuestionBankIndex, normalize_question
+
+class FakeBankIndex(QuestionBankIndex):
+    """QuestionBankIndex reading from a list instead of the questions table"""
+
+    def __init__(self, table, **kwargs):
+        super().__init__(refresh_interval=60, threshold=0.7, **kwargs)
+        self.table = table
+
+    def _rows_after(self, question_id):
+        return sorted(row for row in self.table if row[0] > question_id)
+
+def test_normalize_question_drops_case_accents_and_punctuation():
+    assert normalize_question("  Qu'est-ce  que la CAFÉ? ") == 'qu est ce que la cafe'
+
+def test_exact_duplicate_ignores_case_and_punctuation():
+    index = DuplicateIndex(threshold=0.7)
+    index.add(7, "What is the capital of France?")
+    assert index.find_duplicate("what is the capital of france") == 7
+
+def test_rewording_is_a_near_duplicate():
+    index = DuplicateIndex(threshold=0.7)
+    index.add(1, "Which planet is known as the Red Planet?")
+    assert index.find_duplicate("Which planet is called the Red Planet?") == 1
+
+def test_unrelated_question_is_not_a_duplicate():
+    index = DuplicateIndex(threshold=0.7)
+    index.add(1, "Which planet is known as the Red Planet?")
+    assert index.find_duplicate("Who painted the Mona Lisa?") is None
+
+def test_empty_text_is_ignored():
+    index = DuplicateIndex(threshold=0.7)
+    index.add(1, "?!")
+    assert len(index) == 0
+    assert index.find_duplicate("") is None
+
+def test_refresh_loads_only_new_rows():
+    bank = FakeBankIndex([(1, "Who wrote Hamlet?"), (2, "What is the boiling point of water?")])
+    assert bank.refresh() == 2
+    bank.table.append((3, "How many legs does a spider have?"))
+    assert bank.refresh() == 1
+    assert len(bank) == 3
+    assert bank.max_id == 3
+
+def test_refresh_picks_up_late_committed_lower_id():
+    bank = FakeBankIndex([(1, "Who wrote Hamlet?"), (3, "How many legs does a spider have?")], refresh_overlap=10)
+    bank.refresh()
+    # Id 2 was handed out before 3 but its transaction committed after the last refresh
+    bank.table.append((2, "What is the boiling point of water?"))
+    assert bank.refresh() == 1
+    assert bank.find_duplicate("What is the boiling point of water?") == 2
+
+def test_record_and_refresh_do_not_index_a_question_twice():
+    bank = FakeBankIndex([(1, "Who wrote Hamlet?")])
+    bank.refresh()
+    bank.record(2, "How many legs does a spider have?")
+    bank.table.append((2, "How many legs does a spider have?"))
+    assert bank.refresh() == 0
+    assert len(bank) == 2
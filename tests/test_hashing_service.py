@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+from argon2 import PasswordHasher
+from services.hashing_service import HashingExecutor, HashingOverloaded
+from services.password_service import PasswordService
+
+class Tracker:
+    """A stand-in hash that records how much memory was admitted at once"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.peak_kib = 0
+        self.lock = threading.Lock()
+
+    def work(self, seconds):
+        with self.lock:
+            self.peak_kib = max(self.peak_kib, self.executor.in_use_kib)
+        time.sleep(seconds)
+        return True
+
+def run_concurrently(executor, tracker, costs, seconds=0.05):
+    errors = []
+
+    def call(cost):
+        try:
+            executor.run(tracker.work, seconds, memory_kib=cost)
+        except HashingOverloaded as e:
+            errors.append(e.reason)
+
+    threads = [threading.Thread(target=call, args=(cost,)) for cost in costs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+def test_admission_is_weighted_by_each_hash_cost():
+    executor = HashingExecutor(memory_budget_kib=100, memory_cost_kib=10, max_queue=20)
+    tracker = Tracker(executor)
+    # Five light hashes would fit together, but the legacy heavy ones must not share the budget
+    assert run_concurrently(executor, tracker, [60, 60, 10, 10, 10, 60]) == []
+    assert tracker.peak_kib <= 100
+    assert executor.in_use_kib == 0
+    assert executor.pending == 0
+
+def test_hash_larger_than_budget_runs_alone():
+    executor = HashingExecutor(memory_budget_kib=100, memory_cost_kib=10)
+    assert executor.run(lambda: 'done', memory_kib=500) == 'done'
+    assert executor.in_use_kib == 0
+
+def test_full_queue_is_rejected():
+    executor = HashingExecutor(memory_budget_kib=100, memory_cost_kib=100, max_queue=1)
+    tracker = Tracker(executor)
+    errors = run_concurrently(executor, tracker, [100, 100, 100], seconds=0.2)
+    assert errors == ['queue_full']
+
+def test_waiting_past_the_timeout_is_rejected():
+    executor = HashingExecutor(memory_budget_kib=100, memory_cost_kib=100, queue_timeout=0.05)
+    tracker = Tracker(executor)
+    errors = run_concurrently(executor, tracker, [100, 100], seconds=0.3)
+    assert errors == ['queue_timeout']
+
+def test_memory_cost_comes_from_the_stored_hash():
+    service = PasswordService(time_cost=1, memory_cost=8, parallelism=1)
+    legacy_hash = PasswordHasher(time_cost=1, memory_cost=64, parallelism=1).hash('secret')
+    assert service.memory_cost(legacy_hash) == 64
+    assert service.memory_cost('not a hash') == 8
+
+@pytest.mark.parametrize('memory_kib', [None, 0])
+def test_default_cost_is_the_configured_one(memory_kib):
+    executor = HashingExecutor(memory_budget_kib=100, memory_cost_kib=40)
+    seen = []
+    executor.run(lambda: seen.append(executor.in_use_kib), memory_kib=memory_kib)
+    assert seen == [40]
@@ -0,0 +1,48 @@
+import json
+from services.json_stream import QuestionStreamParser, extract_questions
+
+QUESTIONS = [
+    {"question": "Which {brace} is \"quoted\"?", "options": ["a", "b"], "correct_answer": "a"},
+    {"question": "Path C:\\temp\\ or [bracket]?", "options": ["c", "d"], "correct_answer": "d"},
+]
+
+def parse_in_chunks(text, size):
+    parser = QuestionStreamParser()
+    objects = []
+    for start in range(0, len(text), size):
+        objects += parser.feed(text[start:start + size])
+    return objects + parser.finish(), parser
+
+def test_objects_split_across_any_chunk_boundary():
+    text = json.dumps({"questions": QUESTIONS}, indent=2)
+    for size in (1, 2, 3, 7, 64, len(text)):
+        objects, parser = parse_in_chunks(text, size)
+        assert objects == QUESTIONS, size
+        assert parser.outcomes['direct'] == 2
+
+def test_markdown_fence_and_prose_are_skipped():
+    text = "Here you go:\n```json\n" + json.dumps({"questions": QUESTIONS}) + "\n```\nEnjoy!"
+    assert extract_questions(text) == QUESTIONS
+
+def test_trailing_and_missing_commas_are_repaired_per_object():
+    text = '{"questions": [\n{"question": "A?", "options": ["x", "y",],}\n{"question": "B?", "options": ["z"]}\n]}'
+    parser = QuestionStreamParser()
+    objects = parser.feed(text) + parser.finish()
+    assert [obj['question'] for obj in objects] == ['A?', 'B?']
+    assert parser.outcomes['repaired'] == 1
+    assert parser.repaired == 1
+
+def test_truncated_tail_is_closed_by_finish():
+    text = '{"questions": [{"question": "A?", "options": ["x"]}, {"question": "B?", "options": ["y", "z'
+    parser = QuestionStreamParser()
+    assert [obj['question'] for obj in parser.feed(text)] == ['A?']
+    assert parser.finish() == [{"question": "B?", "options": ["y", "z"]}]
+    assert parser.outcomes['truncated'] == 1
+
+def test_single_unwrapped_question_is_returned():
+    assert extract_questions('{"question": "Solo?", "options": ["a"]}') == [{"question": "Solo?", "options": ["a"]}]
+
+def test_undecodable_object_counts_as_failed():
+    parser = QuestionStreamParser()
+    assert parser.feed('{"questions": [{"question": "A?" "options" ["x"]}]}') == []
+    assert parser.outcomes['failed'] == 1